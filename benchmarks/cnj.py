@@ -0,0 +1,106 @@
+"""
+Mede a normalização de números CNJ: o re.sub + fatiamento que os scripts
+usavam, utils.cnj.parse número a número e utils.cnj.normalize_many em lote,
+sobre números formatados, só dígitos e com dígito verificador errado.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.cnj
+
+Variáveis: BENCH_CNJ_NUMBERS (padrão 1000000), BENCH_CNJ_INVALID (fração de
+números com dígito verificador errado, padrão 0.01), BENCH_REPETITIONS (padrão 3).
+"""
+import os
+import re
+import json
+import time
+import random
+import logging
+import statistics
+
+from utils.cnj import check_digits, parse, normalize_many, InvalidCnj
+
+
+def generate(count, invalid_fraction, seed=65):
+    """
+    `count` números (metade formatados, metade só dígitos) e quantos são inválidos.
+    """
+    rng = random.Random(seed)
+    numbers, invalid = [], 0
+    for position in range(count):
+        sequencial, ano = f"{rng.randrange(10 ** 7):07d}", str(rng.randint(2000, 2025))
+        segmento, tribunal, origem = str(rng.randint(1, 9)), f"{rng.randint(1, 27):02d}", f"{rng.randrange(10 ** 4):04d}"
+        digito = check_digits(sequencial, ano, segmento, tribunal, origem)
+        if rng.random() < invalid_fraction:
+            digito = f"{(int(digito) + 1) % 100:02d}"
+            invalid += 1
+        if position % 2:
+            numbers.append(f"{sequencial}{digito}{ano}{segmento}{tribunal}{origem}")
+        else:
+            numbers.append(f"{sequencial}-{digito}.{ano}.{segmento}.{tribunal}.{origem}")
+    return numbers, invalid
+
+
+def legacy(numbers):
+    # Como read_card fazia antes de utils.cnj: sem conferir o dígito verificador
+    result = []
+    for raw in numbers:
+        number = re.sub(r'\D', '', raw)
+        if len(number) >= 17:
+            number = f"{number[:7]}-{number[7:9]}.{number[9:13]}.{number[13]}.{number[14:16]}.{number[16:]}"
+        else:
+            number = raw
+        result.append(number)
+    return result
+
+
+def one_by_one(numbers):
+    result = []
+    for raw in numbers:
+        try:
+            result.append(parse(raw).formatted)
+        except InvalidCnj:
+            result.append(None)
+    return result
+
+
+METHODS = {
+    "legado": legacy,
+    "parse": one_by_one,
+    "lote": normalize_many,
+    "lote_digitos": lambda numbers: normalize_many(numbers, digits_only=True),
+}
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    count = int(os.getenv("BENCH_CNJ_NUMBERS", "1000000"))
+    invalid_fraction = float(os.getenv("BENCH_CNJ_INVALID", "0.01"))
+    repetitions = int(os.getenv("BENCH_REPETITIONS", "3"))
+    numbers, invalid = generate(count, invalid_fraction)
+    logging.info(f"{count} números gerados, {invalid} com dígito verificador errado.")
+
+    results = {}
+    for method, func in METHODS.items():
+        times = []
+        for repetition in range(1, repetitions + 1):
+            start = time.perf_counter()
+            output = func(numbers)
+            times.append(time.perf_counter() - start)
+        elapsed = statistics.median(times)
+        results[method] = {
+            "segundos": round(elapsed, 3),
+            "numeros_por_s": round(count / elapsed),
+            "rejeitados": sum(1 for number in output if number is None),
+        }
+
+    print(f"{'método':<14} {'tempo (s)':>10} {'números/s':>12} {'rejeitados':>11}")
+    for method, result in results.items():
+        print(f"{method:<14} {result['segundos']:>10.2f} {result['numeros_por_s']:>12,} {result['rejeitados']:>11}")
+
+    os.makedirs("./docs/benchmarks", exist_ok=True)
+    with open("./docs/benchmarks/cnj.json", "w", encoding="utf-8") as f:
+        json.dump({"numeros": count, "invalidos": invalid, "metodos": results}, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compara o Chrome padrão com o modo enxuto (utils.driver_factory): partida a frio,
+tempo de login e tempo por processo aberto a partir de uma etiqueta.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.driver_startup
+
+Variáveis: USER, PASSWORD, PROFILE, BENCH_TAG, BENCH_PROCESSES (padrão 5),
+BENCH_REPETITIONS (padrão 3).
+"""
+import os
+import json
+import time
+import logging
+import statistics
+
+from dotenv import load_dotenv
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from getDatePartiesByTag import PJEAutomationGetInfoTagParties
+from utils.waits import document_ready
+
+MODES = {
+    "padrao": {"lean": False, "headless": False},
+    "enxuto": {"lean": True},
+}
+
+
+def measure_once(mode_options, user, password, profile, tag, processes):
+    start = time.perf_counter()
+    bot = PJEAutomationGetInfoTagParties(**mode_options)
+    cold_start = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        bot.login(user, password)
+        bot.wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'dropdown-toggle')))
+        login_time = time.perf_counter() - start
+
+        bot.select_profile(profile)
+        per_process = []
+        if tag:
+            bot.search_on_tag(tag)
+            original_window = bot.driver.current_window_handle
+            bot.switch_to_ng_frame()
+            total = min(processes, len(bot.get_process_list()))
+            for index in range(1, total + 1):
+                start = time.perf_counter()
+                bot.switch_to_ng_frame()
+                element = bot.wait.until(EC.element_to_be_clickable(
+                    (By.XPATH, f"(//processo-datalist-card)[{index}]//a/div/span[2]")))
+                bot.click_on_process(element)
+                bot.wait.until(document_ready)
+                bot.collect_process_info()
+                bot.driver.close()
+                bot.driver.switch_to.window(original_window)
+                per_process.append(time.perf_counter() - start)
+        return cold_start, login_time, per_process
+    finally:
+        bot.close()
+
+
+def main():
+    load_dotenv()
+    user, password, profile = os.getenv("USER"), os.getenv("PASSWORD"), os.getenv("PROFILE")
+    tag = os.getenv("BENCH_TAG", "")
+    processes = int(os.getenv("BENCH_PROCESSES", "5"))
+    repetitions = int(os.getenv("BENCH_REPETITIONS", "3"))
+
+    results = {}
+    for mode, mode_options in MODES.items():
+        cold_starts, logins, per_process = [], [], []
+        for repetition in range(1, repetitions + 1):
+            logging.info(f"Modo {mode}: repetição {repetition} de {repetitions}")
+            cold_start, login_time, process_times = measure_once(mode_options, user, password, profile, tag, processes)
+            cold_starts.append(cold_start)
+            logins.append(login_time)
+            per_process.extend(process_times)
+        results[mode] = {
+            "partida_a_frio_s": statistics.median(cold_starts),
+            "login_s": statistics.median(logins),
+            "por_processo_s": statistics.median(per_process) if per_process else None,
+            "processos_medidos": len(per_process),
+        }
+
+    print(f"{'modo':<8} {'partida (s)':>12} {'login (s)':>10} {'processo (s)':>13}")
+    for mode, result in results.items():
+        per_process = "-" if result["por_processo_s"] is None else f"{result['por_processo_s']:.2f}"
+        print(f"{mode:<8} {result['partida_a_frio_s']:>12.2f} {result['login_s']:>10.2f} {per_process:>13}")
+
+    os.makedirs("./docs/benchmarks", exist_ok=True)
+    with open("./docs/benchmarks/driver_startup.json", "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Roda cada um dos cinco scripts de ponta a ponta contra o PJe simulado
+(mock_pje) e mede o tempo total e os processos por minuto.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.e2e
+    python -m benchmarks.e2e downloadProcessByTag getDatePartiesByTag
+
+Variáveis: BENCH_PROCESSOS (padrão 200), BENCH_POR_ETIQUETA (padrão 20),
+BENCH_MODELOS (padrão 40), BENCH_LATENCIA_MS (padrão 50), BENCH_JITTER_MS
+(padrão 0), BENCH_TIMEOUT (segundos por script, padrão 1800). Os demais
+ajustes do navegador (PJE_LEAN, PJE_SESSIONS, ...) são repassados aos scripts.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import tempfile
+import subprocess
+
+import requests
+
+from mock_pje.server import start_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Script -> contador do mock que representa "um processo tratado"
+SCRIPTS = {
+    "downloadProcessByTag": "documentos_solicitados",
+    "getDatePartiesByTag": "processos_abertos",
+    "infoProcessByGeneralSearch": "linhas_consulta",
+    "clearModelsDocumentPje": "modelos_excluidos",
+    "getOC": "processos_abertos",
+}
+
+
+def run_script(name, counter, mock_options, timeout):
+    server, base_url = start_server(**mock_options)
+    workdir = tempfile.mkdtemp(prefix=f"e2e_{name}_")
+    try:
+        shutil.copy(os.path.join(ROOT, "config.json"), workdir)
+        env = dict(os.environ)
+        env.update({
+            "PJE_BASE_URL": base_url,
+            "USER": "usuario.teste",
+            "PASSWORD": "senha",
+            "PROFILE": "PERFIL TESTE",
+            "PJE_LEAN": env.get("PJE_LEAN", "1"),
+            "PJE_SESSION_DIR": os.path.join(workdir, ".session"),
+            "PJE_JOURNAL": os.path.join(workdir, "journal.sqlite"),
+            "HOME": workdir,
+            "PYTHONPATH": ROOT,
+        })
+        logging.info(f"Executando {name} contra {base_url}")
+        start = time.perf_counter()
+        try:
+            result = subprocess.run([sys.executable, os.path.join(ROOT, f"{name}.py")], cwd=workdir, env=env,
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+            returncode = result.returncode
+            output = result.stdout.decode("utf-8", "replace")
+        except subprocess.TimeoutExpired as e:
+            returncode = None
+            output = (e.stdout or b"").decode("utf-8", "replace")
+        elapsed = time.perf_counter() - start
+        stats = requests.get(f"{base_url}/mock/stats", timeout=10).json()
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if returncode != 0:
+        logging.warning(f"{name} terminou com código {returncode}. Últimas linhas:\n" + "\n".join(output.splitlines()[-20:]))
+    processed = stats[counter]
+    return {
+        "codigo_saida": returncode,
+        "tempo_s": round(elapsed, 2),
+        "processos": processed,
+        "processos_por_minuto": round(processed / elapsed * 60, 2) if elapsed else None,
+        "requisicoes": stats["requisicoes"],
+        "mock": stats,
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    selected = sys.argv[1:] or list(SCRIPTS)
+    mock_options = {
+        "processos": int(os.getenv("BENCH_PROCESSOS", "200")),
+        "por_etiqueta": int(os.getenv("BENCH_POR_ETIQUETA", "20")),
+        "modelos": int(os.getenv("BENCH_MODELOS", "40")),
+        "latencia_ms": int(os.getenv("BENCH_LATENCIA_MS", "50")),
+        "jitter_ms": int(os.getenv("BENCH_JITTER_MS", "0")),
+    }
+    timeout = int(os.getenv("BENCH_TIMEOUT", "1800"))
+
+    results = {"mock": mock_options, "scripts": {}}
+    for name in selected:
+        results["scripts"][name] = run_script(name, SCRIPTS[name], dict(mock_options), timeout)
+
+    print(f"{'script':<28} {'saída':>6} {'tempo (s)':>10} {'processos':>10} {'proc/min':>9}")
+    for name, result in results["scripts"].items():
+        print(f"{name:<28} {str(result['codigo_saida']):>6} {result['tempo_s']:>10.2f} "
+              f"{result['processos']:>10} {str(result['processos_por_minuto']):>9}")
+
+    os.makedirs("./docs/benchmarks", exist_ok=True)
+    with open("./docs/benchmarks/e2e.json", "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 import re
 import json  # Importado para salvar erros em JSON
-import time
 import os
+import math
+import time
+from collections import Counter
+from datetime import datetime
 from functools import wraps
 from dotenv import load_dotenv
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,13 +15,52 @@ from selenium.common.exceptions import (
     TimeoutException,
     StaleElementReferenceException,
     ElementClickInterceptedException,
-    NoSuchElementException,
 )
 
+from utils.pje_automation import PJE_BASE_URL
+from utils.driver_factory import create_driver
+from utils.session_store import restore_or_login
+from utils.waits import WaitReport, richfaces_idle
+from utils.richfaces import datascroller_current_page, datascroller_go_to_page
+from utils.tracing import tracer, traced
+from utils.extraction import extract_table_rows
+from utils.session_pool import PjeSessionPool
+
 # Variáveis globais para driver e wait
 driver = None
 wait = None
-
+wait_report = WaitReport("clearModelsDocumentPje")
+
+# Colunas da tabela de modelos (modeloGrid)
+MODEL_COLUMNS = {"titulo": 0, "data": 1, "autor": 2}
+DATE_FORMAT = "%d/%m/%Y"
+DEFAULT_REPORT = "relatorio_exclusao_modelos.json"
+
+# Localiza a linha do modelo pelas colunas título, data e autor e clica no link
+# de exclusão da última célula, confirmando a pergunta do navegador sem alerta.
+DELETE_ROW_SCRIPT = """
+var table = document.getElementById('modeloGrid');
+var tbody = table ? table.querySelector('tbody') : null;
+if (!tbody) { return null; }
+var columns = arguments[0], expected = arguments[1];
+for (var i = 0; i < tbody.rows.length; i++) {
+    var row = tbody.rows[i];
+    var matches = row.cells.length > columns.length;
+    for (var j = 0; matches && j < columns.length; j++) {
+        matches = (row.cells[columns[j]].innerText || '').trim() === expected[j];
+    }
+    if (!matches) { continue; }
+    var link = row.cells[row.cells.length - 1].querySelector('a, input[type=image], input[type=submit], button');
+    if (!link) { return null; }
+    window.confirm = function() { return true; };
+    link.scrollIntoView(true);
+    link.click();
+    return row;
+}
+return null;
+"""
+
+@traced("switch_to_new_window")
 def switch_to_new_window(original_handles, timeout=20):
     """
     Alterna para a nova janela que foi aberta após a execução de uma ação.
@@ -77,21 +118,10 @@ def initialize_driver():
     Inicializa o driver do Chrome com as configurações desejadas, como pasta de download.
     """
     global driver, wait
-    chrome_options = webdriver.ChromeOptions()
     user_home = os.path.expanduser("~")
     download_directory = os.path.join(user_home, "Downloads", "processosBaixadosEtiqueta")
-    os.makedirs(download_directory, exist_ok=True)
     print(f"Diretório de download configurado para: {download_directory}")
-
-    prefs = {
-        "plugins.always_open_pdf_externally": True,
-        "download.default_directory": download_directory,
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "safebrowsing.enabled": True
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = create_driver(download_directory=download_directory)
     wait = WebDriverWait(driver, 50)
 
 def save_exception_screenshot(filename):
@@ -105,14 +135,74 @@ def save_exception_screenshot(filename):
     driver.save_screenshot(filepath)
     print(f"Screenshot salvo em: {filepath}")
 
+class ModelFilter:
+    """
+    Critérios de seleção dos modelos a excluir: o texto pesquisado no campo de
+    título do PJe e, sobre o resultado, expressão regular do título, intervalo
+    de datas (dd/mm/aaaa, inclusivo) e parte do nome do autor. Um título vazio
+    lista todos os modelos do perfil, por isso só é aceito com `allow_all`.
+    """
+
+    def __init__(self, title="Novo", title_regex=None, after=None, before=None, author=None, allow_all=False):
+        self.title = (title or "").strip()
+        if not self.title and not allow_all:
+            raise ValueError("Título de pesquisa vazio selecionaria todos os modelos; "
+                             "defina PJE_MODELS_TITLE ou confirme com PJE_MODELS_ALL=1.")
+        self.title_regex = re.compile(title_regex, re.IGNORECASE) if title_regex else None
+        self.after = datetime.strptime(after, DATE_FORMAT).date() if after else None
+        self.before = datetime.strptime(before, DATE_FORMAT).date() if before else None
+        self.author = (author or "").lower()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            title=os.getenv("PJE_MODELS_TITLE", "Novo"),
+            title_regex=os.getenv("PJE_MODELS_TITLE_REGEX"),
+            after=os.getenv("PJE_MODELS_AFTER"),
+            before=os.getenv("PJE_MODELS_BEFORE"),
+            author=os.getenv("PJE_MODELS_AUTHOR"),
+            allow_all=os.getenv("PJE_MODELS_ALL", "0") == "1",
+        )
+
+    def matches(self, model):
+        if self.title_regex and not self.title_regex.search(model["titulo"]):
+            return False
+        if self.author and self.author not in model["autor"].lower():
+            return False
+        if self.after or self.before:
+            try:
+                date = datetime.strptime(model["data"][:10], DATE_FORMAT).date()
+            except ValueError:
+                return False
+            if (self.after and date < self.after) or (self.before and date > self.before):
+                return False
+        return True
+
+    def describe(self):
+        parts = [f"título contendo '{self.title}'" if self.title else "todos os títulos"]
+        if self.title_regex:
+            parts.append(f"título casando /{self.title_regex.pattern}/")
+        if self.after:
+            parts.append(f"data >= {self.after.strftime(DATE_FORMAT)}")
+        if self.before:
+            parts.append(f"data <= {self.before.strftime(DATE_FORMAT)}")
+        if self.author:
+            parts.append(f"autor contendo '{self.author}'")
+        return ", ".join(parts)
+
+
+def model_key(model):
+    return model["titulo"], model["data"], model["autor"]
+
+@traced("acessar_pagina_modelo_documento")
 @retry()
-def acessar_pagina_modelo_documento():
+def acessar_pagina_modelo_documento(titulo="Novo"):
     """
-    Acessa a página de modelos de documentos, insere 'Novo' no campo de busca e clica no botão de pesquisa.
+    Acessa a página de modelos de documentos, insere `titulo` no campo de busca e clica no botão de pesquisa.
     """
     try:
         # Acessar a página do modelo de documento
-        driver.get("https://pje.tjba.jus.br/pje/ModeloDocumento/listView.seam")
+        driver.get(f"{PJE_BASE_URL}/ModeloDocumento/listView.seam")
         
         # Esperar o campo de entrada estar presente e interagível
         input_element = wait.until(
@@ -121,94 +211,252 @@ def acessar_pagina_modelo_documento():
             )
         )
 
-        # Clicar no campo e inserir 'Novo'
+        # Clicar no campo e inserir o título pesquisado
         input_element.click()
-        input_element.send_keys("Novo")
+        input_element.clear()
+        input_element.send_keys(titulo)
 
-        print("Texto 'Novo' inserido com sucesso no campo de pesquisa de modelo de documento.")
+        print(f"Texto '{titulo}' inserido com sucesso no campo de pesquisa de modelo de documento.")
 
         # Esperar o botão de pesquisa estar presente e interagível
         search_button = wait.until(
             EC.element_to_be_clickable((By.ID, "modeloSearchForm:searchButton"))
         )
+        table_body = driver.find_elements(By.CSS_SELECTOR, "#modeloGrid > tbody")
 
         # Clicar no botão de pesquisa
         search_button.click()
 
         print("Botão 'Pesquisar' clicado com sucesso.")
+        if table_body:
+            wait_report.settle(driver, "pesquisar_modelos", EC.staleness_of(table_body[0]), 6, min_delay=0.3)
+        wait.until(richfaces_idle)
 
     except Exception as e:
         save_exception_screenshot("acessar_pagina_modelo_documento_exception.png")
         print(f"Erro ao acessar a página de modelo de documento. Captura de tela salva. Erro: {e}")
         raise e
 
+def current_page():
+    return datascroller_current_page(driver)
 
-@retry()
-def excluir_todos_modelos():
+@traced("go_to_page")
+def go_to_page(page, timeout=30):
+    """
+    Vai para a página `page` da listagem de modelos (salto direto pelo
+    datascroller, ou pelos links dele se o salto falhar) e espera a tabela ser substituída.
+    """
+    datascroller_go_to_page(driver, page, (By.CSS_SELECTOR, "#modeloGrid > tbody"), ready=richfaces_idle, timeout=timeout)
+
+def read_models():
+    """
+    Modelos da página atual ({titulo, data, autor, pagina}), lidos com um único execute_script.
+    """
+    page = current_page()
+    models = []
+    for cells in extract_table_rows(driver, "modeloGrid") or []:
+        if len(cells) <= len(MODEL_COLUMNS):
+            continue
+        model = {name: cells[column]["text"] for name, column in MODEL_COLUMNS.items()}
+        model["pagina"] = page
+        models.append(model)
+    return models
+
+def get_total_pages():
     """
-    Exclui todos os modelos disponíveis na listagem, um por vez, até que a tabela fique vazia.
-    Utiliza JavaScript para clicar no botão de exclusão e aguarda corretamente antes de cada clique.
+    Total de páginas da listagem, pelo rodapé "N resultados encontrados" e o
+    número de linhas da página atual.
     """
+    rows = len(read_models())
+    if not rows:
+        return 0
+    footer = driver.find_elements(By.CSS_SELECTOR, "#modeloGrid tfoot")
+    match = re.search(r'(\d+)\s+resultados encontrados', footer[0].text) if footer else None
+    if not match:
+        return 1
+    return math.ceil(int(match.group(1)) / rows)
+
+@traced("listar_modelos")
+def list_models(model_filter):
+    """
+    Percorre todas as páginas do resultado da pesquisa e retorna (total listado,
+    modelos que atendem aos critérios de `model_filter`).
+    """
+    total_pages = get_total_pages()
+    print(f"Listagem de modelos com {total_pages} página(s).")
+    listed, matching = 0, []
+    for page in range(1, total_pages + 1):
+        go_to_page(page)
+        models = read_models()
+        listed += len(models)
+        matching.extend(model for model in models if model_filter.matches(model))
+    print(f"{listed} modelos listados, {len(matching)} atendem aos critérios ({model_filter.describe()}).")
+    return listed, matching
+
+@traced("excluir_modelo")
+def delete_model(model, timeout=30):
+    """
+    Exclui da página atual a linha do modelo e espera a tabela ser atualizada.
+    O sucesso é a própria linha clicada sair do documento, e não a contagem de
+    linhas iguais, que não cai quando um modelo idêntico sobe da página seguinte.
+    Retorna o resultado: "excluido", "nao_removido" ou "falha".
+    """
+    columns = list(MODEL_COLUMNS.values())
+    row = driver.execute_script(DELETE_ROW_SCRIPT, columns, list(model_key(model)))
+    if row is None:
+        tracer.set_outcome("not_found")
+        return "falha"
+    # Versões em que a confirmação ainda chega como alerta do navegador
+    alert = EC.alert_is_present()(driver)
+    if alert:
+        alert.accept()
+    try:
+        wait_report.until(driver, "remover_modelo", EC.staleness_of(row), timeout, legacy_delay=9)
+    except TimeoutException:
+        tracer.set_outcome("not_removed")
+        return "nao_removido"
     try:
+        wait_report.until(driver, "carregar_lista_modelos", richfaces_idle, timeout)
+    except TimeoutException:
+        tracer.set_outcome("TimeoutException")
+        return "falha"
+    return "excluido"
+
+def delete_listed_models(models, last_page=None, first_page=1):
+    """
+    Exclui `models` da listagem aberta, da última página com algum deles
+    (`last_page`) até `first_page`: uma exclusão só desloca as linhas das páginas
+    seguintes, já tratadas, então as páginas anteriores continuam válidas.
+    Retorna o resultado de cada modelo.
+    """
+    remaining = Counter(model_key(model) for model in models)
+    outcomes = []
+    last_page = last_page or max(model["pagina"] for model in models)
+    for page in range(last_page, first_page - 1, -1):
+        try:
+            go_to_page(page)
+        except (TimeoutException, RuntimeError) as e:
+            print(f"Página {page} da listagem não disponível: {e}")
+            continue
         while True:
-            # Esperar um tempo para garantir que a página carregou antes de tentar excluir
-            print("Aguardando 6 segundos antes de verificar a lista de modelos...")
-            time.sleep(6)
-
-            # Obter todos os modelos presentes
-            modelos_presentes = driver.find_elements(By.XPATH, "//tr[contains(@class, 'rich-table-row')]")
-            if not modelos_presentes:
-                print("Nenhum modelo restante para excluir.")
+            target = next((row for row in read_models() if remaining[model_key(row)] > 0), None)
+            if target is None:
                 break
+            remaining[model_key(target)] -= 1
+            start = time.perf_counter()
+            try:
+                outcome = delete_model(target)
+            except Exception as e:
+                print(f"Erro ao excluir o modelo '{target['titulo']}': {e}")
+                outcome = "falha"
+            elapsed = time.perf_counter() - start
+            print(f"Modelo '{target['titulo']}' ({target['data']}, {target['autor']}): {outcome} em {elapsed:.1f}s")
+            outcomes.append({**target, "resultado": outcome, "segundos": round(elapsed, 2)})
+    for (titulo, data, autor), count in remaining.items():
+        outcomes.extend({"titulo": titulo, "data": data, "autor": autor, "pagina": None,
+                         "resultado": "nao_encontrado", "segundos": 0} for _ in range(count))
+    return outcomes
+
+def _bind_session(session):
+    global driver, wait
+    driver, wait = session.driver, session.wait
 
-            # Selecionar o botão de exclusão usando JavaScript
-            script = 'return document.querySelector("#modeloGrid\\\\:0\\\\:j_id262\\\\:modeloGrid");'
-            botao_excluir = driver.execute_script(script)
-
-            if botao_excluir:
-                print("Botão de exclusão encontrado. Tentando clicar com JavaScript...")
-
-                # Clicar no botão de exclusão usando JavaScript
-                driver.execute_script("arguments[0].click();", botao_excluir)
-                print("Cliquei para excluir um modelo.")
-
-                # Confirmar a exclusão na janela de alerta (caso apareça)
-                try:
-                    WebDriverWait(driver, 5).until(EC.alert_is_present())
-                    alert = driver.switch_to.alert
-                    alert.accept()
-                    print("Confirmação de exclusão aceita.")
-                except TimeoutException:
-                    print("Nenhuma confirmação de alerta encontrada.")
-
-                # Esperar para garantir que a linha foi removida antes de continuar
-                print("Aguardando 3 segundos para garantir que o modelo foi removido...")
-                time.sleep(3)
-
-                # Atualizar a lista para verificar o próximo modelo
-                modelos_restantes = driver.find_elements(By.XPATH, "//tr[contains(@class, 'rich-table-row')]")
-                if not modelos_restantes:
-                    print("Todos os modelos foram excluídos.")
-                    break
-
-                print("Modelo excluído com sucesso. Verificando se há mais modelos...")
-
-            else:
-                print("Botão de exclusão não encontrado, encerrando a exclusão.")
-                break
+def _delete_page_range(session, task):
+    """
+    Trabalhador do pool: repete a pesquisa e exclui os modelos da sua faixa de páginas.
+    """
+    titulo, first_page, last_page, models = task
+    _bind_session(session)
+    acessar_pagina_modelo_documento(titulo)
+    return delete_listed_models(models, last_page, first_page)
 
-    except NoSuchElementException:
-        print("Nenhum modelo encontrado para exclusão.")
+def delete_models_parallel(models, sessions, user, password, profile, titulo):
+    """
+    Divide a exclusão entre `sessions` navegadores pela mesma listagem: cada
+    sessão pesquisa `titulo` e exclui os modelos de uma faixa contígua de
+    páginas, da última para a primeira. As exclusões de uma faixa puxam as
+    primeiras linhas da faixa seguinte para a anterior, fora do alcance das
+    duas; esses modelos (e os de sessões que falharem) voltam como não
+    encontrados e são excluídos ao final nesta sessão, sobre uma nova listagem.
+    """
+    pages = sorted({model["pagina"] for model in models})
+    size = math.ceil(len(pages) / sessions)
+    tasks = []
+    for start in range(0, len(pages), size):
+        first_page, last_page = pages[start], pages[min(start + size, len(pages)) - 1]
+        tasks.append((titulo, first_page, last_page,
+                      [model for model in models if first_page <= model["pagina"] <= last_page]))
+    print(f"Excluindo {len(models)} modelos de {len(pages)} páginas em {len(tasks)} faixas com {sessions} sessões.")
+    outcomes, leftover = [], []
+    with PjeSessionPool(sessions, user, password, profile) as pool:
+        for task, result in zip(tasks, pool.imap(_delete_page_range, tasks, chunk_size=1)):
+            if result is None:
+                leftover.extend(task[3])
+                continue
+            for outcome in result:
+                (leftover if outcome["resultado"] == "nao_encontrado" else outcomes).append(outcome)
+    if leftover:
+        print(f"{len(leftover)} modelos não encontrados nas faixas; excluindo nesta sessão.")
+        acessar_pagina_modelo_documento(titulo)
+        outcomes.extend(delete_listed_models(leftover, get_total_pages()))
+    return outcomes
+
+def write_model_report(model_filter, listed, outcomes, elapsed, filename=None):
+    """
+    Grava o resultado de cada modelo e a vazão da limpeza em JSON e imprime o resumo.
+    """
+    filename = filename or os.getenv("PJE_MODELS_REPORT", DEFAULT_REPORT)
+    counts = Counter(outcome["resultado"] for outcome in outcomes)
+    deleted = counts.get("excluido", 0)
+    summary = {
+        "criterios": model_filter.describe(),
+        "listados": listed,
+        "selecionados": len(outcomes),
+        "resultados": dict(counts),
+        "segundos": round(elapsed, 1),
+        "modelos_por_minuto": round(deleted / elapsed * 60, 1) if elapsed else 0,
+    }
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"resumo": summary, "modelos": outcomes}, f, ensure_ascii=False, indent=4)
+    print(f"Limpeza de modelos: {deleted} de {len(outcomes)} excluídos em {elapsed:.1f}s "
+          f"({summary['modelos_por_minuto']} modelos/min). Resultados: {dict(counts)}. Relatório: {filename}")
+    return summary
+
+@traced("excluir_todos_modelos")
+def excluir_todos_modelos(model_filter=None, dry_run=False, sessions=1, user=None, password=None, profile=None):
+    """
+    Lista todos os modelos da pesquisa (todas as páginas), seleciona os que
+    atendem a `model_filter` e os exclui, na sessão atual ou dividindo entre
+    `sessions` navegadores. Com `dry_run`, apenas lista. Grava o relatório com
+    o resultado de cada modelo e retorna o resumo.
+    """
+    model_filter = model_filter or ModelFilter()
+    start = time.perf_counter()
+    try:
+        acessar_pagina_modelo_documento(model_filter.title)
+        listed, models = list_models(model_filter)
+        if not models:
+            print("Nenhum modelo restante para excluir.")
+            outcomes = []
+        elif dry_run:
+            outcomes = [{**model, "resultado": "simulado", "segundos": 0} for model in models]
+        elif sessions > 1:
+            outcomes = delete_models_parallel(models, sessions, user, password, profile, model_filter.title)
+        else:
+            outcomes = delete_listed_models(models)
     except Exception as e:
         save_exception_screenshot("excluir_todos_modelos_exception.png")
         print(f"Erro ao excluir modelos. Captura de tela salva. Erro: {e}")
         raise e
+    return write_model_report(model_filter, listed, outcomes, time.perf_counter() - start)
+
 
    
 
+@traced("login")
 @retry()
 def login(user, password):
-    login_url = 'https://pje.tjba.jus.br/pje/login.seam'
+    login_url = f'{PJE_BASE_URL}/login.seam'
     driver.get(login_url)
     wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ssoFrame')))
     username_input = wait.until(EC.presence_of_element_located((By.ID, 'username')))
@@ -226,6 +474,7 @@ def skip_token():
     )
     proceed_button.click()
 
+@traced("select_profile")
 @retry()
 def select_profile(profile):
     dropdown = wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'dropdown-toggle')))
@@ -283,16 +532,18 @@ def preencher_formulario(numProcesso=None, Comp=None, Etiqueta=None):
     pesquisar_xpath = "//button[text()='Pesquisar']"
     click_element(pesquisar_xpath)
     print("Formulário preenchido e pesquisa iniciada com sucesso!")
-    time.sleep(10)
+    wait_report.settle(driver, "preencher_formulario",
+                       EC.presence_of_element_located((By.XPATH, "//processo-datalist-card")), 10)
 
 def input_tag(search_text):
     search_input = wait.until(EC.element_to_be_clickable((By.ID, "itPesquisarEtiquetas")))
     search_input.clear()
     search_input.send_keys(search_text)
     click_element("/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[1]/div[2]/div[1]/span/button[1]")
-    time.sleep(1)
+    tag_xpath = "/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[2]/ul/p-datalist/div/div/ul/li/div/li/div[2]/span/span"
+    wait_report.settle(driver, "input_tag", EC.element_to_be_clickable((By.XPATH, tag_xpath)), 1)
     print(f"Pesquisa realizada com o texto: {search_text}")
-    click_element("/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[2]/ul/p-datalist/div/div/ul/li/div/li/div[2]/span/span")
+    click_element(tag_xpath)
 
 def nav_tag():
     xpath = "/html/body/app-root/selector/div/div/div[1]/side-bar/nav/ul/li[5]/a"
@@ -327,6 +578,7 @@ def click_on_process(process_element):
         print(f"Erro ao clicar no processo. Erro: {e}")
         raise e
 
+@traced("click_element")
 @retry()
 def click_element(xpath):
     """
@@ -347,6 +599,7 @@ def click_element(xpath):
         print(f"Erro ao clicar no elemento. Captura de tela salva. Erro: {e}")
         raise e
 
+@traced("select_tipo_documento")
 @retry()
 def select_tipo_documento(tipoDocumento):
     """
@@ -368,12 +621,14 @@ def main():
     initialize_driver()
     try:
         user, password = os.getenv("USER"), os.getenv("PASSWORD")
-        login(user, password)
-        select_profile("V DOS FEITOS DE REL DE CONS CIV E COMERCIAIS DE RIO REAL / Direção de Secretaria / Diretor de Secretaria")
-        acessar_pagina_modelo_documento()
-        excluir_todos_modelos()
-        time.sleep(10)
+        profile = "V DOS FEITOS DE REL DE CONS CIV E COMERCIAIS DE RIO REAL / Direção de Secretaria / Diretor de Secretaria"
+        restore_or_login(driver, user, password, profile, f"{PJE_BASE_URL}/", login, select_profile)
+        excluir_todos_modelos(ModelFilter.from_env(), dry_run=os.getenv("PJE_MODELS_DRY_RUN", "0") == "1",
+                              sessions=int(os.getenv("PJE_SESSIONS", "1")), user=user, password=password, profile=profile)
+        wait_report.settle(driver, "finalizar_exclusao", richfaces_idle, 10)
+        print(wait_report.summary())
     finally:
+        tracer.finish("clearModelsDocumentPje")
         driver.quit()
 
 if __name__ == "__main__":
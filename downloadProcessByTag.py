@@ -1,11 +1,9 @@
-import re
 import json
-import time
 import os
-from functools import wraps
+import threading
+from functools import wraps, partial
 from dotenv import load_dotenv
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,12 +12,44 @@ from selenium.common.exceptions import (
     StaleElementReferenceException,
     ElementClickInterceptedException,
     NoSuchElementException,
+    NoSuchWindowException,
 )
 
+from utils.pje_automation import PjeConsultaAutomator, PJE_BASE_URL
+from utils.session_store import restore_or_login
+from utils.driver_factory import create_driver
+from utils.session_pool import PjeSessionPool
+from utils.journal import RunJournal, CARD_READ, DOCUMENT_REQUESTED, FILE_DOWNLOADED, journal_reset_requested
+from utils.waits import (WaitReport, richfaces_idle, list_downloads, download_started, downloads_complete,
+                         PARTIAL_DOWNLOAD_SUFFIXES)
+from utils.tracing import tracer, traced
+from utils.download_area import process_key, scan_download_area, click_download
+from utils.download_manager import DownloadManager, resolve_download_url
+from utils.tab_pool import TabPool, capture_click_url, tab_reuse_enabled
+from utils.pipeline import Stage, StagedPipeline
+from utils.tag_jobs import load_tag_jobs, BatchDedup
+from utils.document_store import DocumentStore, document_store_enabled
+from utils.text_index import TextIndex, text_index_enabled
+from utils.cnj import format_cnj, InvalidCnj
+
 # Variáveis globais para driver e wait
 driver = None
 wait = None
+# Janela principal da sessão, registrada ao criar (ou associar) o driver
+main_window = None
+wait_report = WaitReport("downloadProcessByTag")
+journal = None
+tabs = None
+# Lote de etiquetas: processos já tratados em outra etiqueta do lote
+batch = None
+current_tag = None
+# Acervo de documentos endereçado pelo conteúdo
+store = None
+error_file = "processos_com_erro.json"
+
+DOWNLOAD_DIRECTORY = os.path.join(os.path.expanduser("~"), "Downloads", "processosBaixadosEtiqueta")
 
+@traced("switch_to_new_window")
 def switch_to_new_window(original_handles, timeout=20):
     """
     Alterna para a nova janela que foi aberta após a execução de uma ação.
@@ -76,23 +106,32 @@ def initialize_driver():
     """
     Inicializa o driver do Chrome com as configurações desejadas, como pasta de download.
     """
-    global driver, wait
-    chrome_options = webdriver.ChromeOptions()
-    user_home = os.path.expanduser("~")
-    download_directory = os.path.join(user_home, "Downloads", "processosBaixadosEtiqueta")
-    os.makedirs(download_directory, exist_ok=True)
-    print(f"Diretório de download configurado para: {download_directory}")
-
-    prefs = {
-        "plugins.always_open_pdf_externally": True,
-        "download.default_directory": download_directory,
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "safebrowsing.enabled": True
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-    driver = webdriver.Chrome(options=chrome_options)
+    global driver, wait, main_window
+    print(f"Diretório de download configurado para: {DOWNLOAD_DIRECTORY}")
+    driver = create_driver(download_directory=DOWNLOAD_DIRECTORY)
     wait = WebDriverWait(driver, 50)
+    main_window = driver.current_window_handle
+
+def open_tab_pool():
+    """
+    Cria as abas de trabalho reaproveitadas (a partir da janela atual) se o modo estiver ativo.
+    """
+    global tabs
+    if tabs is None and tab_reuse_enabled():
+        tabs = TabPool(driver, size=1)
+
+def open_document_store():
+    global store
+    if store is None and document_store_enabled():
+        store = DocumentStore()
+
+def open_journal(etiqueta, reset=False):
+    """
+    Abre o diário da execução da etiqueta, usado para retomar de onde a última
+    execução (interrompida) parou. Com `reset`, a execução pendente é descartada.
+    """
+    global journal
+    journal = RunJournal(f"downloadProcessByTag:{etiqueta}", reset=reset)
 
 def save_exception_screenshot(filename):
     """
@@ -105,9 +144,10 @@ def save_exception_screenshot(filename):
     driver.save_screenshot(filepath)
     print(f"Screenshot salvo em: {filepath}")
 
+@traced("login")
 @retry()
 def login(user, password):
-    login_url = 'https://pje.tjba.jus.br/pje/login.seam'
+    login_url = f'{PJE_BASE_URL}/login.seam'
     driver.get(login_url)
     wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ssoFrame')))
     username_input = wait.until(EC.presence_of_element_located((By.ID, 'username')))
@@ -125,6 +165,7 @@ def skip_token():
     )
     proceed_button.click()
 
+@traced("select_profile")
 @retry()
 def select_profile(profile):
     dropdown = wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'dropdown-toggle')))
@@ -182,17 +223,20 @@ def preencher_formulario(numProcesso=None, Comp=None, Etiqueta=None):
     pesquisar_xpath = "//button[text()='Pesquisar']"
     click_element(pesquisar_xpath)
     print("Formulário preenchido e pesquisa iniciada com sucesso!")
-    time.sleep(10)
+    wait_report.settle(driver, "preencher_formulario",
+                       EC.presence_of_element_located((By.XPATH, "//processo-datalist-card")), 10)
 
 def input_tag(search_text):
     search_input = wait.until(EC.element_to_be_clickable((By.ID, "itPesquisarEtiquetas")))
     search_input.clear()
     search_input.send_keys(search_text)
     click_element("/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[1]/div[2]/div[1]/span/button[1]")
-    time.sleep(1)
+    tag_xpath = "/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[2]/ul/p-datalist/div/div/ul/li/div/li/div[2]/span/span"
+    wait_report.settle(driver, "input_tag", EC.element_to_be_clickable((By.XPATH, tag_xpath)), 1)
     print(f"Pesquisa realizada com o texto: {search_text}")
-    click_element("/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[2]/ul/p-datalist/div/div/ul/li/div/li/div[2]/span/span")
+    click_element(tag_xpath)
 
+@traced("search_on_tag")
 @retry()
 def search_on_tag(search):
     wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
@@ -219,6 +263,7 @@ def get_process_list():
         print(f"Erro ao obter a lista de processos. Erro: {e}")
         raise e
 
+@traced("click_on_process")
 def click_on_process(process_element):
     """
     Clica no elemento do processo e alterna para a nova janela.
@@ -234,6 +279,36 @@ def click_on_process(process_element):
         print(f"Erro ao clicar no processo. Erro: {e}")
         raise e
 
+@traced("open_process")
+def open_process(process_element):
+    """
+    Abre o processo do card na aba de trabalho, quando o modo de reaproveitamento
+    de abas está ativo e a URL do processo pôde ser capturada, ou numa nova
+    janela. Retorna True se a aba de trabalho foi usada.
+    """
+    if tabs:
+        url = capture_click_url(driver, process_element)
+        if url:
+            tabs.open(url)
+            print(f"Processo aberto na aba de trabalho: {url}")
+            return True
+        print("URL do processo não capturada; abrindo em nova janela.")
+    click_on_process(process_element)
+    return False
+
+def leave_process(in_tab, original_window):
+    """
+    Sai do processo: volta da aba de trabalho ou fecha a janela aberta para ele.
+    """
+    if in_tab:
+        tabs.release()
+    else:
+        driver.close()
+        print("Janela atual fechada com sucesso.")
+        driver.switch_to.window(original_window)
+    print("Retornado para a janela original.")
+
+@traced("click_element")
 @retry()
 def click_element(xpath):
     """
@@ -254,6 +329,7 @@ def click_element(xpath):
         print(f"Erro ao clicar no elemento. Captura de tela salva. Erro: {e}")
         raise e
 
+@traced("select_tipo_documento")
 @retry()
 def select_tipo_documento(tipoDocumento):
     """
@@ -269,6 +345,106 @@ def select_tipo_documento(tipoDocumento):
         print(f"Erro ao selecionar o tipo de documento. Captura de tela salva. Erro: {e}")
         raise e
 
+def read_card(index):
+    """
+    Localiza o card de índice `index` (dentro do ngFrame) e lê o número do
+    processo. Retorna (elemento, número); levanta InvalidCnj se o número lido
+    não for um CNJ válido, antes de qualquer janela ser aberta.
+    """
+    process_xpath = f"(//processo-datalist-card)[{index}]//a/div/span[2]"
+    print(f"XPath gerado: {process_xpath}")
+    process_element = wait.until(EC.element_to_be_clickable((By.XPATH, process_xpath)))
+    process_number = format_cnj(process_element.text.strip())
+    print(f"Número do processo: {process_number}")
+    return process_element, process_number
+
+def request_document(typeDocument):
+    """
+    Solicita o documento do tipo `typeDocument` no processo aberto na janela atual.
+    """
+    driver.switch_to.default_content()
+    print("Saiu do frame 'ngFrame'.")
+    click_element("//*[@id='navbar:ajaxPanelAlerts']/ul[2]/li[5]/a")
+    select_tipo_documento(typeDocument)
+    click_element("/html/body/div/div[1]/div/form/span/ul[2]/li[5]/div/div[5]/input")
+    wait_report.settle(driver, "solicitar_documento", richfaces_idle, 5, min_delay=0.5)
+
+@traced("download_process_at")
+def download_process_at(index, typeDocument, original_window):
+    """
+    Solicita o download do documento do card de índice `index` da etiqueta aberta.
+    Retorna o número do processo (None se o card não pôde ser lido) e se a
+    solicitação foi concluída sem erro.
+    """
+    process_number = None
+    in_tab = False
+    try:
+        process_element, process_number = read_card(index)
+        tracer.set_process(process_number)
+        if journal:
+            journal.mark(process_number, CARD_READ)
+            if journal.is_done(process_number, DOCUMENT_REQUESTED):
+                print(f"Documento do processo {process_number} já solicitado em execução anterior, pulando.")
+                tracer.set_outcome("skipped")
+                if batch:
+                    batch.record(process_number, variant=typeDocument)
+                return process_number, True
+        if batch and batch.seen(process_number, typeDocument):
+            print(f"Documento do processo {process_number} já solicitado para outra etiqueta do lote, pulando.")
+            tracer.set_outcome("deduplicated")
+            return process_number, True
+        if store and store.has(process_number, typeDocument):
+            print(f"Documento '{typeDocument}' do processo {process_number} já está no acervo, pulando.")
+            tracer.set_outcome("stored")
+            return process_number, True
+
+        in_tab = open_process(process_element)
+        request_document(typeDocument)
+        if journal:
+            journal.mark(process_number, DOCUMENT_REQUESTED, {"tipoDocumento": typeDocument})
+        if batch:
+            batch.record(process_number, variant=typeDocument)
+
+        leave_process(in_tab, original_window)
+        wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
+        print("Alternado para o frame 'ngFrame'.")
+        return process_number, True
+    except InvalidCnj as e:
+        print(f"Card {index} ignorado: {e}")
+        tracer.set_outcome("invalid_cnj")
+        return None, False
+    except Exception as e:
+        print(f"Erro no processo {process_number or index}: {e}")
+        tracer.set_outcome(type(e).__name__)
+        try:
+            if in_tab:
+                tabs.discard()
+            else:
+                # Fecha só a janela aberta para o processo, nunca a principal
+                try:
+                    stray = driver.current_window_handle != original_window
+                except NoSuchWindowException:
+                    stray = False
+                if stray:
+                    driver.close()
+                    print("Janela atual fechada após erro.")
+                driver.switch_to.window(original_window)
+            driver.switch_to.default_content()
+            wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
+        except Exception as inner_e:
+            print(f"Erro ao fechar janela após erro no processo {process_number or index}: {inner_e}")
+        return process_number, False
+
+def save_error_processes(error_processes):
+    if error_processes:
+        with open(error_file, "w", encoding="utf-8") as f:
+            json.dump(error_processes, f, ensure_ascii=False, indent=4)
+        print(f"Processos com erro foram salvos em '{error_file}'.")
+
+def download_pipeline_enabled():
+    # Desligado por padrão: sem estágio concorrente, o pipeline só serve para métricas
+    return os.getenv("PJE_DOWNLOAD_PIPELINE", "0") == "1"
+
 def downloadProcessOnTagSearch(typeDocument):
     """
     Processa o download dos processos encontrados via pesquisa por tag.
@@ -283,125 +459,414 @@ def downloadProcessOnTagSearch(typeDocument):
     wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
     print("Dentro do frame 'ngFrame'.")
 
+    if tabs is None:
+        open_tab_pool()
     total_processes = len(get_process_list())
+    if download_pipeline_enabled():
+        return download_pipeline(total_processes, typeDocument, original_window)
     for index in range(1, total_processes + 1):
-        try:
-            print(f"\nIniciando o download para o processo {index} de {total_processes}")
-            process_xpath = f"(//processo-datalist-card)[{index}]//a/div/span[2]"
-            print(f"XPath gerado: {process_xpath}")
-            process_element = wait.until(EC.element_to_be_clickable((By.XPATH, process_xpath)))
-            raw_process_number = process_element.text.strip()
-            process_number = re.sub(r'\D', '', raw_process_number)
-            if len(process_number) >= 17:
-                process_number = f"{process_number[:7]}-{process_number[7:9]}.{process_number[9:13]}.{process_number[13]}.{process_number[14:16]}.{process_number[16:]}"
-            else:
-                process_number = raw_process_number
-            print(f"Número do processo: {process_number}")
+        print(f"\nIniciando o download para o processo {index} de {total_processes}")
+        process_number, ok = download_process_at(index, typeDocument, original_window)
+        if process_number:
             process_numbers.append(process_number)
-            
-            click_on_process(process_element)
-            driver.switch_to.default_content()
-            print("Saiu do frame 'ngFrame'.")
-            
-            click_element("//*[@id='navbar:ajaxPanelAlerts']/ul[2]/li[5]/a")
-            # Tenta selecionar o tipo de documento "Sentença"
-            select_tipo_documento(typeDocument)
-            click_element("/html/body/div/div[1]/div/form/span/ul[2]/li[5]/div/div[5]/input")
-            time.sleep(5)
-            
-            driver.close()
-            print("Janela atual fechada com sucesso.")
-            driver.switch_to.window(original_window)
-            print("Retornado para a janela original.")
-            wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
-            print("Alternado para o frame 'ngFrame'.")
-        except Exception as e:
-            print(f"Erro no processo {process_number}: {e}")
-            error_processes.append(process_number)
-            try:
-                if len(driver.window_handles) > 1:
-                    driver.close()
-                    print("Janela atual fechada após erro.")
-                    driver.switch_to.window(original_window)
-                    wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
-            except Exception as inner_e:
-                print(f"Erro ao fechar janela após erro no processo {process_number}: {inner_e}")
+        if not ok:
+            error_processes.append(process_number or f"índice {index}")
+
+    save_error_processes(error_processes)
+    print("Processamento concluído.")
+    if tabs:
+        print(tabs.summary())
+    return process_numbers
+
+def list_download_cards(total_processes, typeDocument):
+    """
+    Fonte do pipeline: lê o número de cada card e captura a URL do processo sem
+    abrir janela. Processos já solicitados em execução anterior seguem marcados
+    para serem pulados.
+    """
+    for index in range(1, total_processes + 1):
+        item = {"indice": index, "processo": None, "url": None, "tipoDocumento": typeDocument,
+                "ok": False, "pular": False, "registrado": False}
+        driver.switch_to.default_content()
+        wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
+        try:
+            process_element, item["processo"] = read_card(index)
+        except (TimeoutException, InvalidCnj) as e:
+            print(f"Card {index} não pôde ser lido: {e}")
+            yield item
             continue
+        if journal:
+            journal.mark(item["processo"], CARD_READ)
+            if journal.is_done(item["processo"], DOCUMENT_REQUESTED):
+                print(f"Documento do processo {item['processo']} já solicitado em execução anterior, pulando.")
+                item["ok"] = item["pular"] = True
+                yield item
+                continue
+        if batch and batch.seen(item["processo"], item["tipoDocumento"]):
+            print(f"Documento do processo {item['processo']} já solicitado para outra etiqueta do lote, pulando.")
+            item["ok"] = item["pular"] = True
+            yield item
+            continue
+        if store and store.has(item["processo"], item["tipoDocumento"]):
+            print(f"Documento '{typeDocument}' do processo {item['processo']} já está no acervo, pulando.")
+            item["ok"] = item["pular"] = True
+            yield item
+            continue
+        if tabs:
+            item["url"] = capture_click_url(driver, process_element)
+        yield item
 
-    if error_processes:
-        with open("processos_com_erro.json", "w", encoding="utf-8") as f:
-            json.dump(error_processes, f, ensure_ascii=False, indent=4)
-        print("Processos com erro foram salvos em 'processos_com_erro.json'.")
+def request_stage(typeDocument, original_window, item):
+    """
+    Estágio de solicitação (navegador): abre o processo na aba de trabalho e
+    solicita o documento. Sem URL capturada, usa o fluxo completo do card.
+    """
+    if item["pular"] or item["processo"] is None:
+        return item
+    with tracer.span("pipeline_request", item["processo"]):
+        if not item["url"]:
+            _, item["ok"] = download_process_at(item["indice"], typeDocument, original_window)
+            item["registrado"] = True
+            return item
+        try:
+            tabs.open(item["url"])
+            request_document(typeDocument)
+            item["ok"] = True
+            tabs.release()
+        except Exception as e:
+            print(f"Erro no processo {item['processo']}: {e}")
+            tracer.set_outcome(type(e).__name__)
+            tabs.discard()
+    return item
+
+def record_stage(typeDocument, process_numbers, error_processes, item):
+    """
+    Estágio de registro: grava a solicitação no diário e acumula os resultados.
+    """
+    if item["processo"]:
+        process_numbers.append(item["processo"])
+    if not item["ok"]:
+        error_processes.append(item["processo"] or f"índice {item['indice']}")
+    elif not (item["pular"] or item["registrado"]):
+        if journal:
+            journal.mark(item["processo"], DOCUMENT_REQUESTED, {"tipoDocumento": typeDocument})
+        if batch:
+            batch.record(item["processo"], variant=typeDocument)
+
+def download_pipeline(total_processes, typeDocument, original_window):
+    """
+    Solicita os documentos da etiqueta como um pipeline de estágios ligados por
+    filas limitadas: a leitura dos cards, a solicitação (ambas no navegador,
+    revezando o mesmo driver) e o registro no diário, com métricas por estágio.
+    Como os dois estágios de navegador disputam o mesmo driver, não há ganho de
+    tempo sobre o laço; serve para medir os estágios (PJE_DOWNLOAD_PIPELINE=1).
+    """
+    driver_lock = threading.RLock()
+    process_numbers, error_processes = [], []
+    pipeline = StagedPipeline("downloadProcessByTag", [
+        Stage("solicitar", partial(request_stage, typeDocument, original_window), resource=driver_lock),
+        Stage("registrar", partial(record_stage, typeDocument, process_numbers, error_processes)),
+    ])
+    pipeline.run(list_download_cards(total_processes, typeDocument), source_resource=driver_lock)
+    pipeline.write_metrics()
+    driver.switch_to.window(original_window)
+    save_error_processes(error_processes)
     print("Processamento concluído.")
+    if tabs:
+        print(tabs.summary())
     return process_numbers
 
-def download_requested_processes(process_numbers, etiqueta):
+def _new_download_session():
+    return PjeConsultaAutomator(wait_timeout=50, download_directory=DOWNLOAD_DIRECTORY)
+
+def _bind_session(session):
+    """
+    Associa a sessão do processo trabalhador às variáveis globais do módulo.
+    """
+    global driver, wait, main_window
+    driver, wait = session.driver, session.wait
+    main_window = driver.current_window_handle
+    open_document_store()
+
+def open_tag(tag):
+    """
+    Abre a etiqueta `tag` (e o diário dela), voltando antes à página inicial se
+    outra etiqueta já estiver aberta nesta sessão.
+    """
+    global current_tag
+    if current_tag is not None:
+        driver.switch_to.window(main_window)
+        driver.get(f"{PJE_BASE_URL}/")
+    if journal is None or journal.run != f"downloadProcessByTag:{tag}":
+        open_journal(tag)
+    search_on_tag(tag)
+    current_tag = tag
+
+def _use_tag(tag, seen):
+    """
+    Garante que a sessão do trabalhador está na etiqueta `tag`; `seen` são os
+    processos já tratados pelo lote em etiquetas anteriores.
+    """
+    global batch
+    if current_tag != tag:
+        open_tag(tag)
+        open_tab_pool()
+        batch = BatchDedup(seen) if seen else None
+
+def _count_processes(session, tag, seen=frozenset()):
+    _use_tag(tag, seen)
+    driver.switch_to.default_content()
+    wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
+    return len(get_process_list())
+
+def _download_process_at(session, index, typeDocument, tag, seen=frozenset()):
+    _use_tag(tag, seen)
+    return download_process_at(index, typeDocument, main_window)
+
+def download_process_on_tag_search_parallel(tag, typeDocument, sessions, user, password, profile, pool=None):
+    """
+    Versão paralela de downloadProcessOnTagSearch: divide os cards da etiqueta entre
+    `sessions` navegadores autenticados e junta os resultados na ordem dos cards.
+    Com `pool`, reaproveita as sessões já autenticadas (lote de etiquetas).
+    """
+    if pool is None:
+        with PjeSessionPool(sessions, user, password, profile, factory=_new_download_session, setup=_bind_session) as pool:
+            return download_process_on_tag_search_parallel(tag, typeDocument, sessions, user, password, profile, pool)
+    seen = batch.keys() if batch else frozenset()
+    total_processes = pool.run(partial(_count_processes, tag=tag, seen=seen))
+    print(f"Número de processos a distribuir entre as sessões: {total_processes}")
+    results = pool.map(partial(_download_process_at, typeDocument=typeDocument, tag=tag, seen=seen),
+                       range(1, total_processes + 1))
+
+    process_numbers, error_processes = [], []
+    for index, result in enumerate(results, start=1):
+        if result is None:
+            error_processes.append(f"índice {index}")
+            continue
+        process_number, ok = result
+        if process_number:
+            process_numbers.append(process_number)
+        if not ok:
+            error_processes.append(process_number or f"índice {index}")
+        elif batch:
+            batch.record(process_number, variant=typeDocument)
+
+    save_error_processes(error_processes)
+    print("Processamento paralelo concluído.")
+    return process_numbers
+
+def wait_clicked_download(process_number, files_before, timeout=300):
+    """
+    Com o acervo ativo, espera terminar o download iniciado pelo clique antes do
+    próximo, para que os arquivos novos na pasta sejam todos deste processo.
+    Retorna os nomes dos arquivos concluídos, ou None se o download não terminou.
+    """
+    try:
+        wait_report.until(driver, "concluir_download", downloads_complete(DOWNLOAD_DIRECTORY), timeout, legacy_delay=10)
+    except TimeoutException:
+        print(f"O download do processo {process_number} não terminou em {timeout}s; ele não será guardado no acervo.")
+        return None
+    return {name for name in list_downloads(DOWNLOAD_DIRECTORY) - files_before
+            if not name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)}
+
+def store_downloaded_files(pending, etiqueta, doc_type):
+    """
+    Move para o acervo os arquivos baixados pelo clique. `pending` mapeia o
+    número do processo para os nomes dos arquivos concluídos após o clique dele.
+    """
+    for process_number, names in pending.items():
+        for name in names:
+            path = os.path.join(DOWNLOAD_DIRECTORY, name)
+            if os.path.isfile(path):
+                print(f"Processo {process_number}: {name} -> {store.add(path, process_number, doc_type, etiqueta)}")
+            else:
+                print(f"Arquivo do processo {process_number} não encontrado na pasta de download: {name}")
+
+@traced("download_requested_processes")
+def download_requested_processes(process_numbers, etiqueta, max_pages=None, output=None, doc_type=None):
     """
     Acessa a página de requisição de downloads e baixa os processos listados,
-    registrando em um arquivo JSON os processos baixados e os não encontrados.
+    registrando em um arquivo JSON os processos baixados, os não encontrados, os
+    que foram clicados sem o download começar em PJE_DOWNLOAD_START_TIMEOUT
+    segundos (DownloadsNaoIniciados) e os que aparecem mais de uma vez na Área
+    de Download. Cada página é lida com uma única extração e cruzada com os
+    processos solicitados por número. A leitura
+    para quando todos foram encontrados, então as duplicatas só são completas
+    com PJE_DOWNLOAD_AREA_FULL_SCAN=1 (todas as páginas).
+
+    Com PJE_DOWNLOAD_MANAGER=1 (padrão), os arquivos cujo link pode ser lido da
+    tabela são baixados por HTTP pelo DownloadManager (PJE_DOWNLOAD_WORKERS
+    transferências simultâneas); os demais continuam sendo baixados pelo clique.
+    Em um lote de etiquetas, os processos já baixados para outra etiqueta entram
+    como baixados sem novo download. Com o acervo ativo, os arquivos baixados
+    são guardados nele (`doc_type` é o tipo do documento solicitado), cada
+    download pelo clique termina antes do próximo clique, e os processos cujo
+    documento já está no acervo não são procurados.
     """
     resultados = {
         "nomeEtiqueta": etiqueta,
         "ProcessosBaixados": [],
-        "ProcessosNãoEncontrados": []
+        "ProcessosNãoEncontrados": [],
+        "DownloadsNaoIniciados": [],
+        "ProcessosDuplicados": {},
     }
-    
+    requested = {process_key(number): number for number in process_numbers}
+    downloaded = set()
+    use_manager = os.getenv("PJE_DOWNLOAD_MANAGER", "1") != "0"
+    start_timeout = float(os.getenv("PJE_DOWNLOAD_START_TIMEOUT", "30"))
+    links = {}
+    if journal:
+        for process_number in process_numbers:
+            if journal.is_done(process_number, FILE_DOWNLOADED):
+                downloaded.add(process_key(process_number))
+                resultados["ProcessosBaixados"].append(process_number)
+        print(f"Processos já baixados em execução anterior: {len(downloaded)}")
+    if batch:
+        for process_number in process_numbers:
+            if process_key(process_number) not in downloaded and batch.seen(process_number, "arquivo"):
+                downloaded.add(process_key(process_number))
+                resultados["ProcessosBaixados"].append(process_number)
+    if store:
+        for process_number in process_numbers:
+            if process_key(process_number) not in downloaded and store.has(process_number, doc_type):
+                store.link_tag(process_number, doc_type, etiqueta)
+                downloaded.add(process_key(process_number))
+                resultados["ProcessosBaixados"].append(process_number)
+    pending_files = {}
+
+    def download_page(page, index):
+        base_url = driver.execute_script("return document.baseURI;")
+        for key, entries in index.entries.items():
+            entry = entries[0]
+            if key not in requested or key in downloaded or requested[key] in links or entry["pagina"] != page:
+                continue
+            process_number = requested[key]
+            url = resolve_download_url(entry["acao"], base_url) if use_manager else None
+            if url:
+                links[process_number] = url
+                continue
+            print(f"Processo {process_number} encontrado na página {page}. Iniciando download...")
+            files_before = list_downloads(DOWNLOAD_DIRECTORY)
+            with tracer.span("baixar_arquivo", process_number):
+                if not click_download(driver, entry["linha"]):
+                    print(f"Botão de download do processo {process_number} não encontrado.")
+                    continue
+                started = wait_report.settle(driver, "iniciar_download", download_started(DOWNLOAD_DIRECTORY, files_before),
+                                             start_timeout)
+            if not started:
+                # O processo foi encontrado e clicado: só o início do download não foi confirmado
+                print(f"O download do processo {process_number} não começou em {start_timeout:.0f}s; "
+                      f"registrado em DownloadsNaoIniciados.")
+                resultados["DownloadsNaoIniciados"].append(process_number)
+                continue
+            if store:
+                names = wait_clicked_download(process_number, files_before)
+                if names:
+                    pending_files[process_number] = names
+            downloaded.add(key)
+            resultados["ProcessosBaixados"].append(process_number)
+            if journal:
+                journal.mark(process_number, FILE_DOWNLOADED)
+
+    pending = [number for key, number in requested.items() if key not in downloaded]
     try:
-        driver.get('https://pje.tjba.jus.br/pje/AreaDeDownload/listView.seam')
+        driver.get(f'{PJE_BASE_URL}/AreaDeDownload/listView.seam')
         wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
         print("Dentro do iframe 'ngFrame'.")
         wait.until(EC.presence_of_element_located((By.TAG_NAME, 'table')))
         print("Tabela carregada.")
-        rows = wait.until(EC.presence_of_all_elements_located((By.XPATH, "//table//tbody//tr")))
-        print(f"Número total de processos na lista de downloads: {len(rows)}")
-        downloaded_process_numbers = set()
-        
-        for row in rows:
-            process_number_td = row.find_element(By.XPATH, "./td[1]")
-            process_number = process_number_td.text.strip()
-            print(f"Verificando o processo: {process_number}")
-            
-            if process_number in process_numbers and process_number not in downloaded_process_numbers:
-                print(f"Processo {process_number} encontrado e ainda não baixado. Iniciando download...")
-                download_button = row.find_element(By.XPATH, "./td[last()]//button")
-                driver.execute_script("arguments[0].scrollIntoView(true);", download_button)
-                download_button.click()
-                downloaded_process_numbers.add(process_number)
-                resultados["ProcessosBaixados"].append(process_number)
-                time.sleep(5)
-            
-        # Identificar processos que não foram encontrados na lista de downloads
-        processos_nao_encontrados = [proc for proc in process_numbers if proc not in downloaded_process_numbers]
-        resultados["ProcessosNãoEncontrados"].extend(processos_nao_encontrados)
-        
+        if pending:
+            index = scan_download_area(driver, pending, max_pages=max_pages, on_page=download_page,
+                                       full_scan=os.getenv("PJE_DOWNLOAD_AREA_FULL_SCAN", "0") == "1")
+            _, missing, duplicates = index.match(pending)
+            resultados["ProcessosNãoEncontrados"].extend(number for number in missing if process_key(number) not in downloaded)
+            resultados["ProcessosDuplicados"] = duplicates
+            if links:
+                print(f"Baixando {len(links)} arquivos por HTTP...")
+                manager = DownloadManager.from_driver(driver, DOWNLOAD_DIRECTORY, journal=journal,
+                                                      workers=int(os.getenv("PJE_DOWNLOAD_WORKERS", "4")),
+                                                      store=store, doc_type=doc_type, tag=etiqueta)
+                for result in manager.download(links):
+                    if result["status"] == "erro":
+                        resultados["ProcessosNãoEncontrados"].append(result["processo"])
+                    else:
+                        downloaded.add(process_key(result["processo"]))
+                        resultados["ProcessosBaixados"].append(result["processo"])
+            print(f"Área de Download: {index.rows} entradas em {index.pages} página(s); "
+                  f"{len(resultados['ProcessosBaixados'])} baixados, {len(resultados['ProcessosNãoEncontrados'])} não encontrados, "
+                  f"{len(resultados['DownloadsNaoIniciados'])} sem início de download, "
+                  f"{len(duplicates)} com mais de uma entrada.")
         driver.switch_to.default_content()
         print("Voltando para o conteúdo principal.")
-        
     except Exception as e:
         save_exception_screenshot("download_requested_processes_exception.png")
         print(f"Erro em 'download_requested_processes'. Captura de tela salva. Erro: {e}")
-    
+        not_started = set(resultados["DownloadsNaoIniciados"])
+        resultados["ProcessosNãoEncontrados"] = [number for key, number in requested.items()
+                                                 if key not in downloaded and number not in not_started]
+
+    if store and pending_files:
+        store_downloaded_files(pending_files, etiqueta, doc_type)
+    if batch:
+        for process_number in resultados["ProcessosBaixados"]:
+            batch.record(process_number, variant="arquivo")
+
     # Salvar os resultados no JSON
-    json_filename = f"processos_download_{etiqueta}.json"
+    json_filename = output or f"processos_download_{etiqueta}.json"
     with open(json_filename, "w", encoding="utf-8") as f:
         json.dump(resultados, f, ensure_ascii=False, indent=4)
     print(f"Resultados salvos em {json_filename}.")
-    
+
     return resultados
 
 def main():
     load_dotenv()
     initialize_driver()
+    global batch, error_file
     try:
         user, password = os.getenv("USER"), os.getenv("PASSWORD")
-        login(user, password)
         profile = os.getenv("PROFILE")
-        select_profile(profile)
-        search_on_tag("OFICIO CDEP")
-        process_numbers = downloadProcessOnTagSearch("Ofício")
-        download_requested_processes(process_numbers)
-        time.sleep(10)
+        jobs = load_tag_jobs("downloadProcessByTag", [{"etiqueta": "OFICIO CDEP", "tipoDocumento": "Ofício"}])
+        sessions = int(os.getenv("PJE_SESSIONS", "1"))
+        batch = BatchDedup() if len(jobs) > 1 else None
+        open_document_store()
+        restore_or_login(driver, user, password, profile, f"{PJE_BASE_URL}/", login, select_profile)
+        pool = None
+        if sessions > 1:
+            pool = PjeSessionPool(sessions, user, password, profile, factory=_new_download_session, setup=_bind_session)
+        try:
+            for job in jobs:
+                etiqueta, tipo_documento = job["etiqueta"], job["tipoDocumento"]
+                print(f"\nEtiqueta '{etiqueta}' (documento: {tipo_documento})")
+                if len(jobs) > 1:
+                    error_file = f"processos_com_erro_{etiqueta}.json"
+                open_journal(etiqueta, reset=journal_reset_requested())
+                if pool:
+                    process_numbers = download_process_on_tag_search_parallel(
+                        etiqueta, tipo_documento, sessions, user, password, profile, pool=pool)
+                else:
+                    open_tag(etiqueta)
+                    process_numbers = downloadProcessOnTagSearch(tipo_documento)
+                download_requested_processes(process_numbers, etiqueta, output=job.get("saida"), doc_type=tipo_documento)
+                journal.complete()
+        finally:
+            if pool:
+                pool.close()
+        if batch:
+            print(batch.summary())
+        if store:
+            print(store.summary())
+        try:
+            wait_report.until(driver, "concluir_downloads", downloads_complete(DOWNLOAD_DIRECTORY), 300, legacy_delay=10)
+        except TimeoutException:
+            print("Ainda há downloads em andamento após 300 segundos.")
+        if store and text_index_enabled():
+            index = TextIndex()
+            index.add_store(store)
+            print(f"Índice de texto do acervo: {index.stats()}")
+        print(wait_report.summary())
     finally:
+        tracer.finish("downloadProcessByTag")
         driver.quit()
 
 if __name__ == "__main__":
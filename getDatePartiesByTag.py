@@ -1,23 +1,33 @@
-from selenium import webdriver
 from selenium.common.exceptions import (
     StaleElementReferenceException,
     ElementClickInterceptedException,
-    TimeoutException,
-    NoSuchElementException
+    TimeoutException
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from openpyxl import Workbook
-from openpyxl.styles import Font
-from functools import wraps
-import time
+from functools import wraps, partial
 from dotenv import load_dotenv
 import os
+import time
 import logging
-import re
+import threading
+
+from utils.pje_automation import PjeConsultaAutomator, PJE_BASE_URL
+from utils.session_pool import PjeSessionPool
+from utils.journal import RunJournal, CARD_READ, PARTIES_COLLECTED, journal_reset_requested
+from utils.waits import WaitReport, new_window_opened
+from utils.tracing import tracer, traced
+from utils.party_cache import PartyCache, party_key
+from utils.tab_pool import TabPool, capture_click_url, tab_reuse_enabled
+from utils.pipeline import Stage, StagedPipeline, pipeline_enabled
+from utils.tag_jobs import load_tag_jobs, BatchDedup
+from utils.extraction import extract_fields
+from utils.cnj import format_cnj, InvalidCnj
+from utils.export import StreamingExporter, exporter_outputs
+from utils.http_session import PjeHttpClient, PjeSessionExpired, extract_fields_from_html, extract_party_links, link_url
 
-from utils.pje_automation import PjeConsultaAutomator
+PARTY_HEADERS = ['Número do Processo', 'Polo', 'Nome da Parte', 'CPF', 'Nome Civil', 'Data de Nascimento', 'Genitor', 'Genitora', 'Classe', 'Assunto', 'Área']
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,10 +57,103 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             return wrapper
         return decorator
 
-    def __init__(self):
-        super().__init__()
+    PARTY_FIELDS = {
+        'CPF': '//*[@id="pessoaFisicaViewView:j_id58"]/div/div[2]',
+        'Nome Civil': '//*[@id="pessoaFisicaViewView:j_id80"]/div/div[2]',
+        'Data de Nascimento': '//*[@id="pessoaFisicaViewView:j_id157"]/div/div[2]',
+        'Genitor': '//*[@id="pessoaFisicaViewView:j_id168"]/div/div[2]',
+        'Genitora': '//*[@id="pessoaFisicaViewView:j_id179"]/div/div[2]',
+    }
+    PROCESS_FIELDS = {
+        'Classe': '//*[@id="classeProcesso"]',
+        'Assunto': '//*[@id="assuntoProcesso"]',
+        'Área': '//*[@id="areaProcesso"]',
+    }
+
+    def __init__(self, **driver_options):
+        super().__init__(**driver_options)
+        # Janela principal, registrada antes de qualquer outra ser aberta
+        self.main_window = self.driver.current_window_handle
         self.process_data_list = []
+        self.http = None
+        # Clientes HTTP por thread do pipeline: a sessão do requests não é compartilhada
+        self.http_local = threading.local()
+        self.use_http = os.getenv("PJE_HTTP_FASTPATH", "1") != "0"
+        self.wait_report = WaitReport("getDatePartiesByTag")
+        self.journal = None
+        self.party_cache = PartyCache() if os.getenv("PJE_PARTY_CACHE_ENABLED", "1") != "0" else None
+        self.tabs = None
+        self.tag = None
+        self.batch = None
+        self.last_process_number = None
+
+    # Abas de trabalho: uma para o processo e outra para a parte
+    PROCESS_TAB, PARTY_TAB = 0, 1
+
+    def open_tab_pool(self):
+        """
+        Cria as abas de trabalho reaproveitadas a partir da janela atual, se o modo estiver ativo.
+        """
+        if self.tabs is None and tab_reuse_enabled():
+            self.tabs = TabPool(self.driver, size=2)
+        return self.tabs
+
+    def cached_party(self, party_url):
+        """
+        Dados da parte no cache (None se ausentes ou com o cache desativado).
+        """
+        if not self.party_cache:
+            return None
+        data = self.party_cache.get(party_key(party_url))
+        if data is not None:
+            logging.info(f"Dados da parte obtidos do cache: {party_url}")
+        return data
+
+    def cache_party(self, party_url, data, scrape_seconds):
+        if self.party_cache:
+            self.party_cache.put(party_key(party_url), data, scrape_seconds)
+
+    def get_http_client(self):
+        """
+        Exporta os cookies da sessão autenticada para um cliente HTTP (criado uma única vez).
+        """
+        if self.http is None:
+            self.http = PjeHttpClient(self.driver)
+        return self.http
 
+    def worker_http_client(self, driver_lock):
+        """
+        Cliente HTTP próprio da thread atual do pipeline, criado com os cookies do
+        navegador (lidos com o lock do driver) no primeiro uso.
+        """
+        if getattr(self.http_local, "client", None) is None:
+            with driver_lock:
+                self.http_local.client = PjeHttpClient(self.driver)
+        return self.http_local.client
+
+    def open_tag(self, tag, reset_journal=False):
+        """
+        Abre a etiqueta `tag` e o diário dela, voltando antes à página inicial se
+        outra etiqueta já estiver aberta nesta sessão. Com `reset_journal`, a
+        execução pendente da etiqueta é descartada.
+        """
+        if self.tag is not None:
+            self.driver.switch_to.window(self.main_window)
+            self.driver.get(f"{PJE_BASE_URL}/")
+        self.journal = RunJournal(f"getDatePartiesByTag:{tag}", reset=reset_journal)
+        self.search_on_tag(tag)
+        self.tag = tag
+
+    def batch_records(self, process_number):
+        """
+        Registros do processo já coletados para outra etiqueta do lote, ou None.
+        """
+        if not (self.batch and self.batch.seen(process_number)):
+            return None
+        logging.info(f"Partes do processo {process_number} já coletadas para outra etiqueta do lote, reaproveitando.")
+        return [dict(record) for record in self.batch.result(process_number) or []]
+
+    @traced("search_on_tag")
     @retry()
     def search_on_tag(self, search):
         self.switch_to_ng_frame()
@@ -73,7 +176,7 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
         current_handles = set(self.driver.window_handles)
         self.click_element("/html/body/app-root/selector/div/div/div[2]/right-panel/div/etiquetas/div[1]/div/div[1]/div[2]/div[1]/span/button[1]")
         logging.info("Botão de pesquisa de etiquetas clicado.")
-        time.sleep(2)
+        self.wait_report.settle(self.driver, "input_tag", new_window_opened(current_handles), 2)
         new_handles = set(self.driver.window_handles)
         if len(new_handles) > len(current_handles):
             data_window = (new_handles - current_handles).pop()
@@ -99,6 +202,7 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             logging.error(f"Ocorreu uma exceção ao obter a lista de processos. Captura de tela salva como 'get_process_list_exception.png'. Erro: {e}")
             raise e
 
+    @traced("click_on_process")
     def click_on_process(self, process_element):
         try:
             original_handles = set(self.driver.window_handles)
@@ -113,6 +217,22 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             logging.error(f"Ocorreu uma exceção ao clicar no processo. Captura de tela salva como 'click_on_process_exception.png'. Erro: {e}")
             raise e
 
+    @traced("open_process")
+    def open_process(self, process_element):
+        """
+        Abre o processo do card na aba de trabalho quando a URL dele pôde ser
+        capturada, ou numa nova janela. Retorna (handle, aba de trabalho usada).
+        """
+        if self.tabs:
+            url = capture_click_url(self.driver, process_element)
+            if url:
+                handle = self.tabs.open(url, self.PROCESS_TAB)
+                logging.info(f"Processo aberto na aba de trabalho: {url}")
+                return handle, True
+            logging.info("URL do processo não capturada; abrindo em nova janela.")
+        return self.click_on_process(process_element), False
+
+    @traced("switch_to_new_window")
     def switch_to_new_window(self, original_handles, timeout=20):
         try:
             WebDriverWait(self.driver, timeout).until(
@@ -131,6 +251,7 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             logging.error("TimeoutException: Não foi possível encontrar a nova janela. Captura de tela salva como 'switch_to_new_window_timeout.png'")
             raise e
 
+    @traced("click_element")
     @retry()
     def click_element(self, xpath):
         try:
@@ -148,25 +269,13 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             logging.error(f"Ocorreu uma exceção ao clicar no elemento. Captura de tela salva como 'click_element_exception.png'. Erro: {e}")
             raise e
 
+    @traced("collect_data_parties")
     def collect_data_parties(self):
         try:
             logging.info("Iniciando coleta de dados das partes.")
-            data = {}
-            fields = {
-                'CPF': '//*[@id="pessoaFisicaViewView:j_id58"]/div/div[2]',
-                'Nome Civil': '//*[@id="pessoaFisicaViewView:j_id80"]/div/div[2]',
-                'Data de Nascimento': '//*[@id="pessoaFisicaViewView:j_id157"]/div/div[2]',
-                'Genitor': '//*[@id="pessoaFisicaViewView:j_id168"]/div/div[2]',
-                'Genitora': '//*[@id="pessoaFisicaViewView:j_id179"]/div/div[2]',
-            }
-            for field_name, xpath in fields.items():
-                try:
-                    element = self.driver.find_element(By.XPATH, xpath)
-                    data[field_name] = element.text.strip()
-                    logging.info(f"{field_name}: {data[field_name]}")
-                except NoSuchElementException:
-                    logging.warning(f"{field_name} não encontrado.")
-                    data[field_name] = ''
+            data, missing = extract_fields(self.driver, self.PARTY_FIELDS)
+            for field_name in missing:
+                logging.warning(f"{field_name} não encontrado.")
             logging.info(f"Dados coletados: {data}")
             return data
         except Exception as e:
@@ -174,29 +283,21 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             self.driver.save_screenshot("collectDataParties_exception.png")
             raise e
 
+    @traced("collect_process_info")
     def collect_process_info(self):
         try:
             logging.info("Coletando informações adicionais do processo.")
-            process_info = {}
-            fields = {
-                'Classe': '//*[@id="classeProcesso"]',
-                'Assunto': '//*[@id="assuntoProcesso"]',
-                'Área': '//*[@id="areaProcesso"]',
-            }
-            for field_name, xpath in fields.items():
-                try:
-                    element = self.driver.find_element(By.XPATH, xpath)
-                    process_info[field_name] = element.text.strip()
-                    logging.info(f"{field_name}: {process_info[field_name]}")
-                except NoSuchElementException:
-                    logging.warning(f"{field_name} não encontrado.")
-                    process_info[field_name] = ''
+            process_info, missing = extract_fields(self.driver, self.PROCESS_FIELDS)
+            for field_name in missing:
+                logging.warning(f"{field_name} não encontrado.")
+            logging.info(f"Informações do processo: {process_info}")
             return process_info
         except Exception as e:
             logging.error(f"Ocorreu uma exceção ao coletar informações do processo: {e}")
             self.driver.save_screenshot("collectProcessInfo_exception.png")
             raise e
 
+    @traced("get_data_parties")
     def get_data_parties(self, process_window_handle, process_number, process_info):
         try:
             self.driver.switch_to.window(process_window_handle)
@@ -213,31 +314,75 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
                 party_links = polo_div.find_elements(By.CSS_SELECTOR, 'tbody tr td a')
                 party_link = party_links[index]
                 party_name = party_link.text.strip()
-                handles_before_click = set(self.driver.window_handles)
-                self.driver.execute_script("arguments[0].click();", party_link)
-                logging.info("Link da parte clicado")
-                WebDriverWait(self.driver, 10).until(EC.new_window_is_opened(handles_before_click))
-                handles_after_click = set(self.driver.window_handles)
-                new_handles = handles_after_click - handles_before_click
-                party_window_handle = new_handles.pop()
-                self.driver.switch_to.window(party_window_handle)
-                logging.info("Aba de dados da parte aberta")
-                data = self.collect_data_parties()
+                party_url = link_url({'href': party_link.get_attribute('href') or '',
+                                      'onclick': party_link.get_attribute('onclick') or ''}, self.driver.current_url)
+                data = self.cached_party(party_url)
+                if data is None and self.tabs:
+                    scrape_start = time.perf_counter()
+                    target_url = party_url or capture_click_url(self.driver, party_link)
+                    if target_url:
+                        self.tabs.open(target_url, self.PARTY_TAB)
+                        logging.info("Dados da parte abertos na aba de trabalho")
+                        data = self.collect_data_parties()
+                        self.cache_party(party_url, data, time.perf_counter() - scrape_start)
+                        self.driver.switch_to.window(process_window_handle)
+                if data is None:
+                    scrape_start = time.perf_counter()
+                    handles_before_click = set(self.driver.window_handles)
+                    self.driver.execute_script("arguments[0].click();", party_link)
+                    logging.info("Link da parte clicado")
+                    WebDriverWait(self.driver, 10).until(EC.new_window_is_opened(handles_before_click))
+                    handles_after_click = set(self.driver.window_handles)
+                    new_handles = handles_after_click - handles_before_click
+                    party_window_handle = new_handles.pop()
+                    self.driver.switch_to.window(party_window_handle)
+                    logging.info("Aba de dados da parte aberta")
+                    data = self.collect_data_parties()
+                    self.cache_party(party_url, data, time.perf_counter() - scrape_start)
+                    self.driver.close()
+                    logging.info("Aba de dados da parte fechada")
+                    self.driver.switch_to.window(process_window_handle)
+                    logging.info("Retornando para a janela do processo")
                 data['Número do Processo'] = process_number
                 data['Polo'] = 'Passivo'
                 data['Nome da Parte'] = party_name
                 data.update(process_info)
                 self.process_data_list.append(data)
-                self.driver.close()
-                logging.info("Aba de dados da parte fechada")
-                self.driver.switch_to.window(process_window_handle)
-                logging.info("Retornando para a janela do processo")
-                time.sleep(0.5)
         except Exception as e:
             logging.error(f"Falha em coletar dados das partes. Erro: {e}")
             self.driver.save_screenshot("getDataParties_exception.png")
             raise e
 
+    @traced("collect_parties_http")
+    def collect_parties_http(self, process_url, process_number, http=None):
+        """
+        Coleta as informações do processo e os dados das partes do polo passivo via HTTP,
+        sem abrir janelas. Retorna None quando a página não traz os links das partes,
+        para que o navegador seja usado. `http` é o cliente a usar (padrão: o da sessão).
+        """
+        http = http or self.get_http_client()
+        tree = http.fetch(process_url)
+        process_info = extract_fields_from_html(tree, self.PROCESS_FIELDS)
+        parties = extract_party_links(tree, process_url)
+        if not parties or any(url is None for _, url in parties):
+            logging.info("Links das partes não disponíveis no HTML do processo.")
+            return None
+        logging.info(f"Encontrado {len(parties)} partes no polo passivo (HTTP)")
+        records = []
+        for party_name, party_url in parties:
+            data = self.cached_party(party_url)
+            if data is None:
+                scrape_start = time.perf_counter()
+                data = extract_fields_from_html(http.fetch(party_url), self.PARTY_FIELDS)
+                self.cache_party(party_url, data, time.perf_counter() - scrape_start)
+                logging.info(f"Dados coletados: {data}")
+            data['Número do Processo'] = process_number
+            data['Polo'] = 'Passivo'
+            data['Nome da Parte'] = party_name
+            data.update(process_info)
+            records.append(data)
+        return records
+
     def switch_to_ng_frame(self):
         try:
             self.driver.switch_to.default_content()
@@ -248,119 +393,376 @@ class PJEAutomationGetInfoTagParties(PjeConsultaAutomator):
             self.driver.save_screenshot("switch_to_ngFrame_timeout.png")
             raise
 
-    def info_parties_process_on_tag_search(self):
+    def read_card(self, index):
+        """
+        Localiza o card de índice `index` (o driver já deve estar no ngFrame) e lê
+        o número do processo. Retorna (elemento, número); levanta TimeoutException
+        se o card não for encontrado e InvalidCnj se o número lido não for um CNJ
+        válido.
+        """
+        process_xpath = f"(//processo-datalist-card)[{index}]//a/div/span[2]"
+        logging.info(f"XPath gerado: {process_xpath}")
+        try:
+            process_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, process_xpath)))
+        except TimeoutException:
+            logging.error(f"Timeout ao localizar o elemento do processo no índice {index} com XPath: {process_xpath}")
+            self.driver.save_screenshot(f"process_element_{index}_timeout.png")
+            raise
+        try:
+            process_number = format_cnj(process_element.text.strip())
+        except InvalidCnj as e:
+            logging.error(f"Card {index} ignorado: {e}")
+            raise
+        logging.info(f"Número do Processo: {process_number}")
+        return process_element, process_number
+
+    @traced("collect_parties_at")
+    def collect_parties_at(self, index, original_window):
+        """
+        Processa o card de índice `index` da etiqueta aberta e retorna os registros
+        das partes coletados para esse processo.
+        """
+        start = len(self.process_data_list)
+        self.last_process_number = None
+        self.switch_to_ng_frame()
+        try:
+            process_element, process_number = self.read_card(index)
+        except TimeoutException:
+            tracer.set_outcome("TimeoutException")
+            return []
+        except InvalidCnj:
+            tracer.set_outcome("invalid_cnj")
+            return []
+        print(process_number)
+        tracer.set_process(process_number)
+        self.last_process_number = process_number
+        if self.journal:
+            self.journal.mark(process_number, CARD_READ)
+            if self.journal.is_done(process_number, PARTIES_COLLECTED):
+                logging.info(f"Partes do processo {process_number} já coletadas em execução anterior, pulando.")
+                records = self.journal.payload(process_number, PARTIES_COLLECTED) or []
+                self.process_data_list.extend(records)
+                if self.batch:
+                    self.batch.record(process_number, records)
+                tracer.set_outcome("skipped")
+                return records
+        records = self.batch_records(process_number)
+        if records is not None:
+            self.process_data_list.extend(records)
+            if self.journal and records:
+                self.journal.mark(process_number, PARTIES_COLLECTED, records)
+            tracer.set_outcome("deduplicated")
+            return records
+        try:
+            process_window_handle, in_tab = self.open_process(process_element)
+        except Exception as e:
+            logging.error(f"Falha ao clicar no processo no índice {index}: {e}")
+            self.driver.save_screenshot(f"click_process_{index}_exception.png")
+            tracer.set_outcome(type(e).__name__)
+            return []
+        records = None
+        if self.use_http:
+            try:
+                self.wait.until(lambda d: d.current_url != "about:blank")
+                records = self.collect_parties_http(self.driver.current_url, process_number)
+            except PjeSessionExpired as e:
+                logging.warning(f"{e}. Os cookies serão exportados novamente no próximo processo.")
+                self.http = None
+            except Exception as e:
+                logging.warning(f"Falha no acesso HTTP ao processo {process_number}, usando o navegador: {e}")
+        collected = True
+        if records is not None:
+            self.process_data_list.extend(records)
+        else:
+            process_info = self.collect_process_info()
+            try:
+                self.get_data_parties(process_window_handle=process_window_handle, process_number=process_number, process_info=process_info)
+            except Exception as e:
+                collected = False
+                tracer.set_outcome(type(e).__name__)
+                logging.error(f"Falha ao coletar dados para o processo {process_number}: {e}")
+                self.driver.save_screenshot(f"getDataParties_{process_number}_exception.png")
+        if self.journal and collected:
+            self.journal.mark(process_number, PARTIES_COLLECTED, self.process_data_list[start:])
+        if self.batch and collected:
+            self.batch.record(process_number, self.process_data_list[start:])
+        if not in_tab:
+            try:
+                self.driver.close()
+                logging.info("Aba do processo fechada com sucesso.")
+            except Exception as e:
+                logging.error(f"Falha ao fechar a aba do processo {process_number}: {e}")
+        try:
+            self.driver.switch_to.window(original_window)
+            logging.info("Retornado para a janela original.")
+        except Exception as e:
+            logging.error(f"Falha ao retornar para a janela original: {e}")
+        return self.process_data_list[start:]
+
+    def info_parties_process_on_tag_search(self, exporter=None):
+        """
+        Coleta as partes de todos os processos da etiqueta aberta. Com `exporter`,
+        os registros são gravados à medida que cada processo termina e não ficam
+        acumulados em memória.
+        """
         try:
             original_window = self.driver.current_window_handle
+            self.open_tab_pool()
             self.switch_to_ng_frame()
             process_list = self.get_process_list()
             total_processes = len(process_list)
             logging.info(f"Total de processos a serem processados: {total_processes}")
+            if pipeline_enabled():
+                return self.info_parties_pipeline(total_processes, original_window, exporter)
             for index in range(1, total_processes + 1):
                 logging.info(f"Iniciando o processamento do processo {index} de {total_processes}")
-                self.switch_to_ng_frame()
-                process_xpath = f"(//processo-datalist-card)[{index}]//a/div/span[2]"
-                logging.info(f"XPath gerado: {process_xpath}")
-                try:
-                    process_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, process_xpath)))
-                except TimeoutException:
-                    logging.error(f"Timeout ao localizar o elemento do processo no índice {index} com XPath: {process_xpath}")
-                    self.driver.save_screenshot(f"process_element_{index}_timeout.png")
-                    continue
-                raw_process_number = process_element.text.strip()
-                process_number = re.sub(r'\D', '', raw_process_number)
-                if len(process_number) >= 17:
-                    process_number = f"{process_number[:7]}-{process_number[7:9]}.{process_number[9:13]}.{process_number[13]}.{process_number[14:16]}.{process_number[16:]}"
-                else:
-                    process_number = raw_process_number
-                logging.info(f"Número do Processo: {process_number}")
-                print(process_number)
-                try:
-                    process_window_handle = self.click_on_process(process_element)
-                except Exception as e:
-                    logging.error(f"Falha ao clicar no processo no índice {index}: {e}")
-                    self.driver.save_screenshot(f"click_process_{index}_exception.png")
-                    continue
-                process_info = self.collect_process_info()
-                try:
-                    self.get_data_parties(process_window_handle=process_window_handle, process_number=process_number, process_info=process_info)
-                except Exception as e:
-                    logging.error(f"Falha ao coletar dados para o processo {process_number}: {e}")
-                    self.driver.save_screenshot(f"getDataParties_{process_number}_exception.png")
-                try:
-                    self.driver.close()
-                    logging.info("Aba do processo fechada com sucesso.")
-                except Exception as e:
-                    logging.error(f"Falha ao fechar a aba do processo {process_number}: {e}")
-                try:
-                    self.driver.switch_to.window(original_window)
-                    logging.info("Retornado para a janela original.")
-                except Exception as e:
-                    logging.error(f"Falha ao retornar para a janela original: {e}")
-                time.sleep(1)
+                records = self.collect_parties_at(index, original_window)
+                if exporter:
+                    exporter.write_many(records)
+                    self.process_data_list.clear()
             logging.info("Processamento concluído.")
+            if self.tabs:
+                logging.info(self.tabs.summary())
             return self.process_data_list
         except Exception as e:
             self.driver.save_screenshot("InfoPartiesProcessOnTagSearch_exception.png")
             logging.error(f"Ocorreu uma exceção em 'InfoPartiesProcessOnTagSearch'. Captura de tela salva como 'InfoPartiesProcessOnTagSearch_exception.png'. Erro: {e}")
             raise e
 
+    def list_cards(self, total_processes):
+        """
+        Fonte do pipeline: lê o número de cada card e captura a URL do processo sem
+        abrir janela. Processos já coletados em execução anterior seguem com os
+        registros do diário.
+        """
+        for index in range(1, total_processes + 1):
+            self.switch_to_ng_frame()
+            try:
+                process_element, process_number = self.read_card(index)
+            except (TimeoutException, InvalidCnj):
+                continue
+            item = {"indice": index, "processo": process_number, "url": None, "registros": None, "gravar": True}
+            if self.journal:
+                self.journal.mark(process_number, CARD_READ)
+                if self.journal.is_done(process_number, PARTIES_COLLECTED):
+                    logging.info(f"Partes do processo {process_number} já coletadas em execução anterior, pulando.")
+                    item["registros"] = self.journal.payload(process_number, PARTIES_COLLECTED) or []
+                    item["gravar"] = False
+                    if self.batch:
+                        self.batch.record(process_number, item["registros"])
+                    yield item
+                    continue
+            records = self.batch_records(process_number)
+            if records is not None:
+                item["registros"], item["gravar"] = records, bool(records)
+                yield item
+                continue
+            if self.tabs or self.use_http:
+                item["url"] = capture_click_url(self.driver, process_element)
+            yield item
+
+    def collect_parties_browser(self, item, original_window):
+        """
+        Coleta as partes do processo do item pelo navegador (chamado com o lock do
+        driver). Retorna (registros, coletado).
+        """
+        start = len(self.process_data_list)
+        if not (item["url"] and self.tabs):
+            # Sem URL capturada: fluxo completo a partir do card, que registra o diário
+            self.collect_parties_at(item["indice"], original_window)
+            item["gravar"] = False
+            records = self.process_data_list[start:]
+            del self.process_data_list[start:]
+            return records, True
+        handle = self.tabs.open(item["url"], self.PROCESS_TAB)
+        collected = True
+        try:
+            process_info = self.collect_process_info()
+            self.get_data_parties(process_window_handle=handle, process_number=item["processo"], process_info=process_info)
+        except Exception as e:
+            collected = False
+            logging.error(f"Falha ao coletar dados para o processo {item['processo']}: {e}")
+        finally:
+            self.tabs.release()
+        records = self.process_data_list[start:]
+        del self.process_data_list[start:]
+        return records, collected
+
+    def detail_stage(self, driver_lock, original_window, item):
+        """
+        Estágio de detalhamento: coleta via HTTP (vários processos ao mesmo tempo)
+        e, se a página não trouxer os links das partes, pelo navegador.
+        """
+        if item["registros"] is not None:
+            return item
+        with tracer.span("pipeline_detail", item["processo"]):
+            records = None
+            if item["url"] and self.use_http:
+                http = self.worker_http_client(driver_lock)
+                try:
+                    records = self.collect_parties_http(item["url"], item["processo"], http)
+                except PjeSessionExpired as e:
+                    logging.warning(f"{e}. Os cookies serão exportados novamente.")
+                    with driver_lock:
+                        http.refresh_cookies(self.driver)
+                except Exception as e:
+                    logging.warning(f"Falha no acesso HTTP ao processo {item['processo']}, usando o navegador: {e}")
+            collected = True
+            if records is None:
+                with driver_lock:
+                    records, collected = self.collect_parties_browser(item, original_window)
+            item["registros"] = records
+            item["gravar"] = item["gravar"] and collected
+            if self.batch and collected:
+                self.batch.record(item["processo"], records)
+            return item
+
+    def write_stage(self, exporter, collected, item):
+        """
+        Estágio de gravação: registra o processo no diário e grava os registros.
+        """
+        if self.journal and item["gravar"]:
+            self.journal.mark(item["processo"], PARTIES_COLLECTED, item["registros"])
+        if exporter:
+            exporter.write_many(item["registros"])
+        else:
+            collected.extend(item["registros"])
+
+    def info_parties_pipeline(self, total_processes, original_window, exporter=None):
+        """
+        Coleta as partes da etiqueta como um pipeline de estágios ligados por filas
+        limitadas: a leitura dos cards (navegador) continua enquanto o
+        detalhamento (HTTP, com PJE_PIPELINE_WORKERS processos simultâneos, cada
+        thread com o seu cliente HTTP) e a gravação consomem. Os registros são gravados na ordem em que terminam.
+        """
+        driver_lock = threading.RLock()
+        collected = []
+        workers = int(os.getenv("PJE_PIPELINE_WORKERS", "4"))
+        pipeline = StagedPipeline("getDatePartiesByTag", [
+            Stage("detalhar", partial(self.detail_stage, driver_lock, original_window), concurrency=workers),
+            Stage("gravar", partial(self.write_stage, exporter, collected)),
+        ])
+        pipeline.run(self.list_cards(total_processes), source_resource=driver_lock)
+        pipeline.write_metrics()
+        self.driver.switch_to.window(original_window)
+        self.process_data_list.extend(collected)
+        logging.info("Processamento concluído.")
+        if self.tabs:
+            logging.info(self.tabs.summary())
+        return self.process_data_list
+
+def _use_tag(session, tag, seen):
+    """
+    Garante que a sessão do trabalhador está na etiqueta `tag`; `seen` são os
+    processos já coletados pelo lote em etiquetas anteriores.
+    """
+    if session.tag != tag:
+        session.open_tag(tag)
+        session.open_tab_pool()
+        session.batch = BatchDedup(seen) if seen else None
+
+def _count_processes(session, tag, seen=frozenset()):
+    _use_tag(session, tag, seen)
+    session.switch_to_ng_frame()
+    return len(session.get_process_list())
+
+def _collect_parties_at(session, index, tag, seen=frozenset()):
+    _use_tag(session, tag, seen)
+    records = session.collect_parties_at(index, session.main_window)
+    # Os registros voltam ao processo principal; o trabalhador não os acumula
+    session.process_data_list.clear()
+    return session.last_process_number, records
+
+def info_parties_process_on_tag_search_parallel(tag, sessions, user, password, profile, exporter=None,
+                                                pool=None, batch=None):
+    """
+    Divide os cards da etiqueta entre `sessions` navegadores autenticados e
+    junta os dados das partes na ordem original dos processos. Com `exporter`,
+    os registros são gravados conforme os lotes terminam. Com `pool`, reaproveita
+    as sessões já autenticadas; com `batch`, os processos já coletados para outra
+    etiqueta não são abertos de novo.
+    """
+    if pool is None:
+        with PjeSessionPool(sessions, user, password, profile, factory=PJEAutomationGetInfoTagParties) as pool:
+            return info_parties_process_on_tag_search_parallel(tag, sessions, user, password, profile, exporter, pool, batch)
+    seen = batch.keys() if batch else frozenset()
+    total_processes = pool.run(partial(_count_processes, tag=tag, seen=seen))
+    logging.info(f"Total de processos a serem processados: {total_processes}")
+    process_data_list = []
+    for result in pool.imap(partial(_collect_parties_at, tag=tag, seen=seen), range(1, total_processes + 1)):
+        if not result:
+            continue
+        process_number, records = result
+        if batch and process_number:
+            if batch.seen(process_number) and not records:
+                records = [dict(record) for record in batch.result(process_number) or []]
+            else:
+                batch.record(process_number, records)
+        if not records:
+            continue
+        if exporter:
+            exporter.write_many(records)
+        else:
+            process_data_list.extend(records)
+    logging.info("Processamento paralelo concluído.")
+    return process_data_list
+
 def save_data_to_excel(data_list, filename="dados_partes.xlsx"):
     try:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Dados das Partes"
-        headers = ['Número do Processo', 'Polo', 'Nome da Parte', 'CPF', 'Nome Civil', 'Data de Nascimento', 'Genitor', 'Genitora', 'Classe', 'Assunto', 'Área']
-        ws.append(headers)
-        bold_font = Font(bold=True)
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.font = bold_font
-        for data in data_list:
-            ws.append([
-                data.get('Número do Processo', ''),
-                data.get('Polo', ''),
-                data.get('Nome da Parte', ''),
-                data.get('CPF', ''),
-                data.get('Nome Civil', ''),
-                data.get('Data de Nascimento', ''),
-                data.get('Genitor', ''),
-                data.get('Genitora', ''),
-                data.get('Classe', ''),
-                data.get('Assunto', ''),
-                data.get('Área', '')
-            ])
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        wb.save(filename)
+        with StreamingExporter(PARTY_HEADERS, {"xlsx": filename}, sheet_title="Dados das Partes") as exporter:
+            exporter.write_many(data_list)
         logging.info(f"Dados salvos com sucesso no arquivo '{filename}'.")
     except Exception as e:
         logging.error(f"Ocorreu uma exceção ao salvar os dados no Excel. Erro: {e}")
         raise e
 
+def job_outputs(job, jobs):
+    """
+    Saídas do job: o nome informado ou, em um lote, um nome por etiqueta.
+    """
+    name = job.get("saida") or ("dados_partes" if len(jobs) == 1 else f"dados_partes_{job['etiqueta']}")
+    return exporter_outputs(name)
+
 def main():
     load_dotenv()
-    automation = PJEAutomationGetInfoTagParties()
+    user, password = os.getenv("USER"), os.getenv("PASSWORD")
+    profile = "VARA CRIMINAL DE RIO REAL / Direção de Secretaria / Diretor de Secretaria"
+    jobs = load_tag_jobs("getDatePartiesByTag", [{"etiqueta": "Possivel OBT", "saida": "dados_partes"}])
+    batch = BatchDedup() if len(jobs) > 1 else None
+    sessions = int(os.getenv("PJE_SESSIONS", "1"))
     try:
-        user, password = os.getenv("USER"), os.getenv("PASSWORD")
-        automation.login(user, password)
-        profile = os.getenv("PROFILE")
-        automation.select_profile("VARA CRIMINAL DE RIO REAL / Direção de Secretaria / Diretor de Secretaria")
-        automation.search_on_tag("Possivel OBT")
-        process_data_list = automation.info_parties_process_on_tag_search()
-        save_data_to_excel(process_data_list)
-        time.sleep(5)
+        if sessions > 1:
+            with PjeSessionPool(sessions, user, password, profile, factory=PJEAutomationGetInfoTagParties) as pool:
+                for job in jobs:
+                    journal = RunJournal(f"getDatePartiesByTag:{job['etiqueta']}", reset=journal_reset_requested())
+                    with StreamingExporter(PARTY_HEADERS, job_outputs(job, jobs), sheet_title="Dados das Partes") as exporter:
+                        info_parties_process_on_tag_search_parallel(job["etiqueta"], sessions, user, password, profile,
+                                                                    exporter=exporter, pool=pool, batch=batch)
+                    journal.complete()
+                    journal.close()
+            if batch:
+                logging.info(batch.summary())
+            return
+        automation = PJEAutomationGetInfoTagParties()
+        automation.batch = batch
+        try:
+            automation.ensure_session(user, password, profile)
+            for job in jobs:
+                logging.info(f"Etiqueta '{job['etiqueta']}'")
+                with StreamingExporter(PARTY_HEADERS, job_outputs(job, jobs), sheet_title="Dados das Partes") as exporter:
+                    automation.open_tag(job["etiqueta"], reset_journal=journal_reset_requested())
+                    automation.info_parties_process_on_tag_search(exporter=exporter)
+                automation.journal.complete()
+            logging.info(automation.wait_report.summary())
+            if automation.party_cache:
+                logging.info(automation.party_cache.summary())
+            if batch:
+                logging.info(batch.summary())
+        finally:
+            automation.driver.quit()
+            logging.info("Driver encerrado.")
     finally:
-        automation.driver.quit()
-        logging.info("Driver encerrado.")
+        tracer.finish("getDatePartiesByTag")
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,4 @@
 import os
-import time
 import logging
 from urllib.parse import urlparse, parse_qs
 from selenium import webdriver
@@ -8,16 +7,22 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from dotenv import load_dotenv
 
-from utils.pje_automation import PjeConsultaAutomator
+from utils.pje_automation import PjeConsultaAutomator, PJE_BASE_URL
+from utils.session_store import restore_or_login
+from utils.driver_factory import create_driver
+from utils.waits import WaitReport
+from utils.tracing import tracer, traced
 class PjeTJBA:
     def __init__(self, driver: webdriver.Chrome):
         self.driver = driver
         self.wait = WebDriverWait(self.driver, 30)
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.wait_report = WaitReport("getOC")
 
+    @traced("login")
     def login(self, user, password):
         try:
-            login_url = 'https://pje.tjba.jus.br/pje/login.seam'
+            login_url = f'{PJE_BASE_URL}/login.seam'
             self.driver.get(login_url)
             self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ssoFrame')))
             self.wait.until(EC.presence_of_element_located((By.ID, 'username'))).send_keys(user)
@@ -29,6 +34,7 @@ class PjeTJBA:
             self.logger.exception("Erro no login")
             raise
             
+    @traced("abrir_primeiro_processo")
     def abrir_primeiro_processo(self):
         try:
             self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, "ngFrame")))
@@ -54,6 +60,7 @@ class PjeTJBA:
         finally:
             self.driver.switch_to.default_content()
 
+    @traced("abrir_autos_do_processo")
     def abrir_autos_do_processo(self):
         try:
             self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, "ngFrame")))
@@ -79,12 +86,14 @@ class PjeTJBA:
             self.driver.switch_to.default_content()
 
 
+    @traced("capturar_url_com_oc")
     def capturar_url_com_oc(self):
         try:
-            time.sleep(3)
+            self.wait_report.settle(self.driver, "nova_aba_autos", lambda d: len(d.window_handles) > 1, 3)
             abas = self.driver.window_handles
             if len(abas) > 1:
                 self.driver.switch_to.window(abas[-1])
+                self.wait.until(lambda d: d.current_url != "about:blank")
             url_atual = self.driver.current_url
             self.logger.info("URL capturada na nova aba: %s", url_atual)
             return url_atual
@@ -105,21 +114,20 @@ class PjeTJBA:
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
-    options = webdriver.ChromeOptions()
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(options=options)
+    driver = create_driver(extra_arguments=('--start-maximized',))
     load_dotenv()
     user, password = os.getenv("USER"), os.getenv("PASSWORD")
-    bot = PjeConsultaAutomator()
     try:
         pje = PjeTJBA(driver)
-        pje.login(user, password)
+        restore_or_login(driver, user, password, None, f"{PJE_BASE_URL}/", pje.login)
         pje.abrir_primeiro_processo()
         pje.abrir_autos_do_processo()
         url = pje.capturar_url_com_oc()
         oc = pje.extrair_oc_ou_ca(url)
-        bot.update_config({"LoginInfo": {"oc": oc}})
+        PjeConsultaAutomator.update_config({"LoginInfo": {"oc": oc}})
         print("Token OC capturado:", oc)
+        logging.info(pje.wait_report.summary())
     finally:
+        tracer.finish("getOC")
         #input("Pressione Enter para fechar o navegador...")
         driver.quit()
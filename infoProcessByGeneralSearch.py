@@ -1,25 +1,45 @@
 import os
+import sys
 import json
 import math
 import re
-import time
 import logging
+from datetime import datetime, timedelta
+from concurrent.futures import wait as wait_futures, FIRST_COMPLETED
+from functools import partial
 from dotenv import load_dotenv
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
-from openpyxl import Workbook
-from openpyxl.styles import Font
+from utils.pje_automation import PjeConsultaAutomator, PJE_BASE_URL
+from utils.session_pool import PjeSessionPool
+from utils.waits import WaitReport
+from utils.richfaces import datascroller_current_page, datascroller_go_to_page
+from utils.extraction import extract_table_rows
+from utils.export import StreamingExporter
+from utils.tracing import tracer, traced
 
-from utils.pje_automation import PjeConsultaAutomator
+PROCESS_HEADERS = ['Número do Processo', 'Órgão Julgador', 'Autuado em', 'Classe Judicial',
+                   'Polo Ativo', 'Polo Passivo', 'Última Movimentação']
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 driver = None
 wait = None
+wait_report = WaitReport("infoProcessByGeneralSearch")
+
+DATE_FORMAT = "%d/%m/%Y"
+
+# Contêiner do datascroller da tabela de processos
+PAGINATION_SCOPE = "table[id*='processosTable']"
 
+# Controle de linhas por página, quando a tabela oferece um
+PAGE_SIZE_SELECT_XPATH = ("//form[@id='fPP']//select[contains(@id, 'linhas') or contains(@id, 'rows') "
+                          "or contains(@id, 'pageSize')]")
+
+@traced("search_process")
 def search_process(optionSearch):
     wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ngFrame')))
     icon_search_button = wait.until(
@@ -77,145 +97,357 @@ def search_process(optionSearch):
     )
     ElementonomeDaParte.send_keys(optionSearch.get('nomeParte'))
 
+    select_largest_page_size()
+
     btnProcurarProcesso = wait.until(
         EC.presence_of_element_located((By.ID, 'fPP:searchProcessos'))
     )
     btnProcurarProcesso.click()
 
-def get_total_pages():
+def select_largest_page_size():
+    """
+    Escolhe o maior número de linhas por página oferecido pela tabela, se houver
+    esse controle, para reduzir as idas e voltas da paginação.
+    """
+    selects = driver.find_elements(By.XPATH, PAGE_SIZE_SELECT_XPATH)
+    if not selects:
+        logging.warning("Controle de linhas por página não encontrado no formulário de pesquisa "
+                        f"({PAGE_SIZE_SELECT_XPATH}); a paginação usará o tamanho padrão da tabela.")
+        return None
+    select = Select(selects[0])
+    values = [option.get_attribute('value') for option in select.options]
+    sizes = [int(size) for size in values if size and size.isdigit()]
+    if not sizes:
+        logging.warning(f"Controle de linhas por página sem opções numéricas ({values}); "
+                        f"a paginação usará o tamanho padrão da tabela.")
+        return None
+    select.select_by_value(str(max(sizes)))
+    logging.info(f"Linhas por página: {max(sizes)}")
+    return max(sizes)
+
+def current_page():
+    return datascroller_current_page(driver, PAGINATION_SCOPE)
+
+@traced("go_to_page")
+def go_to_page(page, timeout=30):
+    """
+    Vai para a página `page` do resultado (salto direto pelo datascroller, ou
+    pelos links dele se o salto falhar) e espera a tabela ser substituída.
+    """
+    datascroller_go_to_page(driver, page, (By.ID, 'fPP:processosTable:tb'), scope=PAGINATION_SCOPE,
+                            ready=EC.invisibility_of_element((By.ID, 'j_id136:modalStatusCDiv')), timeout=timeout)
+
+def read_total_results():
+    """
+    Lê o total de resultados do rodapé da tabela; None se não for possível.
+    """
     try:
-        total_results_element = wait.until(
+        wait.until(
             EC.visibility_of_element_located(
                 (By.XPATH, "//table[contains(@id, 'processosTable')]//tfoot//span[contains(text(), 'resultados encontrados')]")
             )
         )
+        total_results_text = driver.find_element(By.XPATH, "//table[contains(@id, 'processosTable')]//tfoot").text
+        logging.info(f"Texto do rodapé da tabela: {total_results_text}")
+        match = re.search(r'(\d+)\s+resultados encontrados', total_results_text)
+        if match:
+            return int(match.group(1))
+        logging.warning("Não foi possível extrair o número total de resultados.")
+    except Exception as e:
+        logging.error(f"Erro ao obter o número total de resultados: {e}")
+    return None
+
+def get_total_results():
+    """
+    Lê o total de resultados do rodapé da tabela (0 se não for possível).
+    """
+    return read_total_results() or 0
+
+def rows_on_page():
+    return len(driver.find_elements(By.XPATH, "//tbody[@id='fPP:processosTable:tb']/tr"))
+
+def get_total_pages(page_size=None):
+    """
+    Total de páginas do resultado. Sem `page_size`, usa o número de linhas da
+    primeira página (a tabela pode ter mais de 20 linhas por página).
+    """
+    total_results = get_total_results()
+    page_size = page_size or max(rows_on_page(), 1)
+    return math.ceil(total_results / page_size)
+
+def build_process_record(numero_do_processo, cell_texts):
+    return {
+        "Número do Processo": numero_do_processo,
+        "Órgão Julgador": cell_texts[2],
+        "Autuado em": cell_texts[4],
+        "Classe Judicial": cell_texts[5],
+        "Polo Ativo": cell_texts[6],
+        "Polo Passivo": cell_texts[7],
+        "Última Movimentação": cell_texts[9]
+    }
+
+@traced("collect_page")
+def extract_page_records(table_body):
+    """
+    Lê a página atual da tabela célula a célula (uma chamada ao WebDriver por célula).
+    """
+    records = []
+    rows = table_body.find_elements(By.XPATH, "./tr")
+    logging.info(f"Número de processos encontrados na página: {len(rows)}")
+
+    for row in rows:
         try:
-            total_results_text = driver.find_element(By.XPATH, "//table[contains(@id, 'processosTable')]//tfoot").text
-            logging.info(f"Texto do rodapé da tabela: {total_results_text}")
-            match = re.search(r'(\d+)\s+resultados encontrados', total_results_text)
-            if match:
-                total_results_number = int(match.group(1))
-                total_pages = math.ceil(total_results_number / 20)
-                return total_pages
-            else:
-                logging.warning("Não foi possível extrair o número total de resultados.")
-                return 0
+            cells = row.find_elements(By.TAG_NAME, "td")
+            if len(cells) < 10:
+                logging.warning("Número insuficiente de colunas na linha, pulando.")
+                continue
+
+            try:
+                a_tag = cells[0].find_element(By.TAG_NAME, "a")
+                numero_do_processo = a_tag.get_attribute('title').strip()
+            except Exception:
+                numero_do_processo = cells[0].text.strip()
+
+            cell_texts = {i: cells[i].text.strip() for i in (2, 4, 5, 6, 7, 9)}
+            records.append(build_process_record(numero_do_processo, cell_texts))
+            logging.info(f"Processo coletado: {numero_do_processo}")
         except Exception as e:
-            logging.error(f"Erro ao obter o número total de páginas: {e}")
-            return 0
-    except Exception as e:
-        logging.error(f"Erro ao obter o número total de páginas: {e}")
-        return 0
+            logging.error(f"Erro ao extrair dados da linha: {e}")
+            continue
+    return records
+
+@traced("collect_page_bulk")
+def extract_page_records_bulk():
+    """
+    Lê a página atual da tabela inteira em uma única chamada ao WebDriver.
+    Retorna None se a tabela não estiver disponível.
+    """
+    rows = extract_table_rows(driver, 'fPP:processosTable:tb')
+    if rows is None:
+        return None
+    logging.info(f"Número de processos encontrados na página: {len(rows)}")
+    records = []
+    for cells in rows:
+        if len(cells) < 10:
+            logging.warning("Número insuficiente de colunas na linha, pulando.")
+            continue
+        title = cells[0]['title']
+        numero_do_processo = title.strip() if title is not None else cells[0]['text']
+        records.append(build_process_record(numero_do_processo, [cell['text'] for cell in cells]))
+        logging.info(f"Processo coletado: {numero_do_processo}")
+    return records
+
+def _bind_session(session):
+    global driver, wait
+    driver, wait = session.driver, session.wait
 
-def collect_process_date():
-    WebDriverWait(driver, 50).until(
+def read_current_page(bulk=True):
+    table_body = WebDriverWait(driver, 50).until(
         EC.presence_of_element_located((By.ID, 'fPP:processosTable:tb'))
     )
-    process_data_list = []
-    total_pages = get_total_pages()
-    logging.info(f"Total de páginas para processar: {total_pages}")
-
-    for page_num in range(1, total_pages + 1):
-        logging.info(f"Processando página {page_num} de {total_pages}")
-        table_body = WebDriverWait(driver, 50).until(
-            EC.presence_of_element_located((By.ID, 'fPP:processosTable:tb'))
-        )
-
-        rows = table_body.find_elements(By.XPATH, "./tr")
-        logging.info(f"Número de processos encontrados na página: {len(rows)}")
-
-        for row in rows:
-            try:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) < 10:
-                    logging.warning("Número insuficiente de colunas na linha, pulando.")
-                    continue
-
-                try:
-                    a_tag = cells[0].find_element(By.TAG_NAME, "a")
-                    numero_do_processo = a_tag.get_attribute('title').strip()
-                except Exception:
-                    numero_do_processo = cells[0].text.strip()
-
-                orgao_julgador = cells[2].text.strip()
-                autuado_em = cells[4].text.strip()
-                classe_judicial = cells[5].text.strip()
-                polo_ativo = cells[6].text.strip()
-                polo_passivo = cells[7].text.strip()
-                ultima_movimentacao = cells[9].text.strip()
-                
-                process_data_list.append({
-                    "Número do Processo": numero_do_processo,
-                    "Órgão Julgador": orgao_julgador,
-                    "Autuado em": autuado_em,
-                    "Classe Judicial": classe_judicial,
-                    "Polo Ativo": polo_ativo,
-                    "Polo Passivo": polo_passivo,
-                    "Última Movimentação": ultima_movimentacao
-                })
-
-                logging.info(f"Processo coletado: {numero_do_processo}")
-            except Exception as e:
-                logging.error(f"Erro ao extrair dados da linha: {e}")
-                continue
-
-        if page_num < total_pages:
+    page_records = extract_page_records_bulk() if bulk else None
+    if page_records is None:
+        page_records = extract_page_records(table_body)
+    return page_records
+
+def collect_pages(pages, bulk=True, exporter=None, retries=2):
+    """
+    Lê as páginas `pages` indo direto a cada uma. Uma página que falha é tentada
+    de novo até `retries` vezes sem interromper as demais. Retorna (registros,
+    páginas que falharam); com `exporter` os registros são gravados e não retornados.
+    """
+    process_data_list, failed_pages = [], []
+    for page_num in pages:
+        for attempt in range(1, retries + 2):
             try:
-                wait.until(EC.invisibility_of_element((By.ID, 'j_id136:modalStatusCDiv')))
-                next_page_button = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//td[contains(@onclick, 'next')]"))
-                )
-                next_page_button.click()
-                wait.until(EC.staleness_of(table_body))
-            except Exception as e:
-                logging.error(f"Erro ao navegar para a próxima página: {e}")
+                with tracer.span("collect_page_at"):
+                    go_to_page(page_num)
+                    page_records = read_current_page(bulk)
                 break
+            except Exception as e:
+                logging.warning(f"Falha na página {page_num} (tentativa {attempt}): {e}")
         else:
-            logging.info("Última página alcançada.")
-            time.sleep(2)
-
+            logging.error(f"Página {page_num} não pôde ser lida.")
+            failed_pages.append(page_num)
+            continue
+        logging.info(f"Página {page_num} lida: {len(page_records)} processos.")
+        if exporter:
+            exporter.write_many(page_records)
+        else:
+            process_data_list.extend(page_records)
+    return process_data_list, failed_pages
+
+def collect_process_date(bulk=True, exporter=None):
+    """
+    Percorre todas as páginas do resultado da pesquisa. Com `exporter`, cada página
+    é gravada assim que lida e a lista retornada fica vazia.
+    """
+    WebDriverWait(driver, 50).until(
+        EC.presence_of_element_located((By.ID, 'fPP:processosTable:tb'))
+    )
+    total_pages = get_total_pages()
+    logging.info(f"Total de páginas para processar: {total_pages}")
+    process_data_list, failed_pages = collect_pages(range(1, total_pages + 1), bulk, exporter)
+    if failed_pages:
+        logging.error(f"Páginas não lidas: {failed_pages}")
     return process_data_list
 
+def _open_search(session, option_search):
+    _bind_session(session)
+    search_process(option_search)
+    wait_report.settle(driver, "search_process",
+                       EC.presence_of_element_located((By.ID, 'fPP:processosTable:tb')), 20)
+
+def _count_pages(session):
+    _bind_session(session)
+    return get_total_pages()
+
+def _collect_page(session, task):
+    page_num, bulk = task
+    _bind_session(session)
+    records, failed_pages = collect_pages([page_num], bulk)
+    if failed_pages:
+        raise RuntimeError(f"Página {page_num} não pôde ser lida.")
+    return records
+
+def collect_process_date_parallel(option_search, sessions, user, password, profile, exporter, bulk=True):
+    """
+    Faz a mesma pesquisa em `sessions` navegadores e divide as páginas do
+    resultado entre eles; cada sessão vai direto às páginas que recebe.
+    """
+    setup = partial(_open_search, option_search=option_search)
+    with PjeSessionPool(sessions, user, password, profile, setup=setup) as pool:
+        total_pages = pool.run(_count_pages)
+        logging.info(f"Total de páginas para processar: {total_pages} em {sessions} sessões")
+        failed_pages = []
+        tasks = [(page_num, bulk) for page_num in range(1, total_pages + 1)]
+        for (page_num, _), records in zip(tasks, pool.imap(_collect_page, tasks)):
+            if records is None:
+                failed_pages.append(page_num)
+                continue
+            exporter.write_many(records)
+    if failed_pages:
+        logging.error(f"Páginas não lidas: {failed_pages}")
+    return failed_pages
+
+def split_date_range(start, end, days):
+    """
+    Divide o intervalo [start, end] em janelas consecutivas de até `days` dias.
+    """
+    windows = []
+    current = start
+    while current <= end:
+        window_end = min(current + timedelta(days=days - 1), end)
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+    return windows
+
+@traced("search_window")
+def _search_window(session, task):
+    """
+    Executa a pesquisa de uma janela de datas em uma sessão do pool. Se o total
+    passar do limite e a janela ainda puder ser dividida, devolve só o total
+    (records=None) para que ela seja subdividida. Um total ilegível só conta
+    como janela vazia quando a tabela carregou sem linhas; nos demais casos a
+    janela falha, para ser repetida em vez de sair vazia do resultado.
+    """
+    option_search, cap, bulk = task
+    _bind_session(session)
+    driver.switch_to.default_content()
+    driver.get(f"{PJE_BASE_URL}/")
+    search_process(option_search)
+    wait_report.settle(driver, "search_process",
+                       EC.presence_of_element_located((By.ID, 'fPP:processosTable:tb')), 20)
+    total = read_total_results()
+    if total is None:
+        if not driver.find_elements(By.ID, 'fPP:processosTable:tb') or rows_on_page():
+            raise RuntimeError(f"Total de resultados ilegível na janela "
+                               f"{option_search['dataAutuacaoDe']} a {option_search['dataAutuacaoAte']}.")
+        total = 0
+    logging.info(f"Janela {option_search['dataAutuacaoDe']} a {option_search['dataAutuacaoAte']}: {total} resultados.")
+    if total > cap and option_search['dataAutuacaoDe'] != option_search['dataAutuacaoAte']:
+        return {"total": total, "records": None}
+    if total > cap:
+        logging.warning(f"A janela de um dia {option_search['dataAutuacaoDe']} tem {total} resultados, acima do limite {cap}.")
+    return {"total": total, "records": collect_process_date(bulk=bulk)}
+
+def load_failed_windows(filename):
+    """
+    Janelas gravadas por `save_failed_windows`, para repetir só elas.
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        return [tuple(datetime.strptime(day, DATE_FORMAT).date() for day in window) for window in json.load(f)]
+
+def save_failed_windows(failures, filename):
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(failures, f, ensure_ascii=False, indent=4)
+    logging.error(f"{len(failures)} janelas falharam e foram gravadas em '{filename}'; "
+                  f"repita só elas com PJE_SHARD_RETRY={filename}.")
+
+def collect_sharded(option_search, sessions, user, password, profile, exporter, cap=None, window_days=None, bulk=True,
+                    windows=None):
+    """
+    Pesquisa o intervalo dataAutuacaoDe..dataAutuacaoAte em janelas de datas
+    distribuídas entre `sessions` navegadores (ou apenas as `windows`
+    informadas). Janelas com mais de `cap` resultados são divididas ao meio e
+    pesquisadas de novo; os processos são gravados no `exporter` sem repetição.
+    Retorna as estatísticas da execução; `falhas` lista as janelas que falharam
+    duas vezes e cujos processos faltam no resultado.
+    """
+    if not option_search.get('dataAutuacaoDe') or not option_search.get('dataAutuacaoAte'):
+        raise ValueError("A pesquisa fracionada exige dataAutuacaoDe e dataAutuacaoAte no config.json.")
+    cap = cap or int(os.getenv("PJE_SHARD_CAP", "1000"))
+    window_days = window_days or int(os.getenv("PJE_SHARD_DAYS", "31"))
+    start = datetime.strptime(option_search['dataAutuacaoDe'], DATE_FORMAT).date()
+    end = datetime.strptime(option_search['dataAutuacaoAte'], DATE_FORMAT).date()
+
+    def task(window):
+        window_search = dict(option_search, dataAutuacaoDe=window[0].strftime(DATE_FORMAT),
+                             dataAutuacaoAte=window[1].strftime(DATE_FORMAT))
+        return window_search, cap, bulk
+
+    seen = set()
+    stats = {"janelas": 0, "divididas": 0, "falhas": [], "linhas": 0, "duplicados": 0}
+    windows = windows or split_date_range(start, end, window_days)
+    logging.info(f"Pesquisa fracionada em {len(windows)} janelas de até {window_days} dias (limite {cap} resultados).")
+    with PjeSessionPool(sessions, user, password, profile) as pool:
+        pending = {pool.submit(_search_window, task(window)): (window, 1) for window in windows}
+        while pending:
+            done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                window, attempt = pending.pop(future)
+                result = future.result()
+                if result is None:
+                    if attempt < 2:
+                        pending[pool.submit(_search_window, task(window))] = (window, attempt + 1)
+                    else:
+                        stats["falhas"].append([day.strftime(DATE_FORMAT) for day in window])
+                    continue
+                if result["records"] is None:
+                    middle = window[0] + (window[1] - window[0]) // 2
+                    stats["divididas"] += 1
+                    for half in ((window[0], middle), (middle + timedelta(days=1), window[1])):
+                        pending[pool.submit(_search_window, task(half))] = (half, 1)
+                    continue
+                stats["janelas"] += 1
+                stats["linhas"] += len(result["records"])
+                new_records = []
+                for record in result["records"]:
+                    if record["Número do Processo"] in seen:
+                        stats["duplicados"] += 1
+                        continue
+                    seen.add(record["Número do Processo"])
+                    new_records.append(record)
+                exporter.write_many(new_records)
+    stats["processos"] = len(seen)
+    logging.info(f"Pesquisa fracionada concluída: {stats}")
+    return stats
 
 def save_data_to_excel(data_list, filename="./docs/Pesqisa_Geral_Dados.xlsx"):
     try:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Dados dos Processos"
-
-        headers = ['Número do Processo', 'Órgão Julgador', 'Autuado em', 'Classe Judicial',
-                   'Polo Ativo', 'Polo Passivo', 'Última Movimentação']
-        ws.append(headers)
-
-        bold_font = Font(bold=True)
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.font = bold_font
-
-        for data in data_list:
-            ws.append([
-                data.get('Número do Processo', ''),
-                data.get('Órgão Julgador', ''),
-                data.get('Autuado em', ''),
-                data.get('Classe Judicial', ''),
-                data.get('Polo Ativo', ''),
-                data.get('Polo Passivo', ''),
-                data.get('Última Movimentação', '')
-            ])
-
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except Exception:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-        wb.save(filename)
+        with StreamingExporter(PROCESS_HEADERS, {"xlsx": filename}, sheet_title="Dados dos Processos") as exporter:
+            exporter.write_many(data_list)
         logging.info(f"Dados salvos com sucesso no xlsx '{filename}'.")
     except Exception as e:
         logging.error(f"Ocorreu uma exceção ao salvar os dados no Excel. Erro: {e}")
@@ -227,30 +459,68 @@ def main():
     load_dotenv()
     user, password = os.getenv("USER"), os.getenv("PASSWORD")
     profile = os.getenv("PROFILE")
+    bulk = os.getenv("PJE_BULK_EXTRACTION", "1") != "0"
+
+    config = PjeConsultaAutomator.loadConfig()
+    optionSearch = config["optionSearch"]
+
+    outputs = {
+        "xlsx": "./docs/Pesqisa_Geral_Dados.xlsx",
+        "json": "./docs/PesquisaGeral.json",
+        "jsonl": "./docs/PesquisaGeral.jsonl",
+        "csv": "./docs/PesquisaGeral.csv",
+    }
+    sessions = int(os.getenv("PJE_SESSIONS", "1"))
+    if os.getenv("PJE_SHARD_SEARCH", "0") != "0":
+        retry_file = os.getenv("PJE_SHARD_RETRY")
+        windows = None
+        if retry_file:
+            # A repetição grava em arquivos próprios para não sobrescrever a exportação original
+            windows = load_failed_windows(retry_file)
+            outputs = {fmt: "{0}_repeticao{1}".format(*os.path.splitext(path)) for fmt, path in outputs.items()}
+        try:
+            with StreamingExporter(PROCESS_HEADERS, outputs, sheet_title="Dados dos Processos") as exporter:
+                stats = collect_sharded(optionSearch, sessions, user, password, profile, exporter, bulk=bulk,
+                                        windows=windows)
+        finally:
+            tracer.finish("infoProcessByGeneralSearch")
+        logging.info(f"{exporter.count} processos distintos gravados.")
+        if stats["falhas"]:
+            # Exportação incompleta: a execução termina com erro
+            save_failed_windows(stats["falhas"], os.getenv("PJE_SHARD_FAILED_FILE", "./docs/janelas_com_falha.json"))
+            sys.exit(1)
+        return
+    if sessions > 1:
+        try:
+            with StreamingExporter(PROCESS_HEADERS, outputs, sheet_title="Dados dos Processos") as exporter:
+                collect_process_date_parallel(optionSearch, sessions, user, password, profile, exporter, bulk=bulk)
+        finally:
+            tracer.finish("infoProcessByGeneralSearch")
+        logging.info(f"{exporter.count} processos gravados.")
+        return
 
     bot = PjeConsultaAutomator()
     driver = bot.driver
     wait = bot.wait
-    config = bot.loadConfig()
-    optionSearch = config["optionSearch"]
-
-    bot.login(user, password)
-    # bot.skip_token()
-    bot.select_profile(profile)
+    try:
+        with StreamingExporter(PROCESS_HEADERS, outputs, sheet_title="Dados dos Processos") as exporter:
+            # bot.skip_token()
+            bot.ensure_session(user, password, profile)
 
-    search_process(optionSearch)
-    time.sleep(20)
+            search_process(optionSearch)
+            wait_report.settle(driver, "search_process",
+                               EC.presence_of_element_located((By.ID, 'fPP:processosTable:tb')), 20)
 
-    process_data = collect_process_date()
-    bot.close()
+            collect_process_date(bulk=bulk, exporter=exporter)
+    finally:
+        bot.close()
+        tracer.finish("infoProcessByGeneralSearch")
 
-    logging.info(f"Dados dos processos coletados com sucesso")
-    logging.info(f"Salvando dados json...")
-    if process_data:
-        bot.save_to_json(process_data,filename="PesquisaGeral")
-        save_data_to_excel(process_data)
+    if exporter.count:
+        logging.info(f"Dados dos processos coletados com sucesso")
     else:
         logging.info("Nenhum processo encontrado para salvar.")
+    logging.info(wait_report.summary())
 
 if __name__ == "__main__":
     main()
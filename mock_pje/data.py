@@ -0,0 +1,142 @@
+import random
+import zlib
+from datetime import date, timedelta
+
+CLASSES = ["Procedimento Comum Cível", "Ação Penal - Procedimento Ordinário", "Execução Fiscal", "Interdição/Curatela", "Inquérito Policial"]
+ASSUNTOS = ["Tutela e Curatela", "Furto", "Roubo", "Alimentos", "Dívida Ativa", "Plano de Saúde"]
+AREAS = ["Cível", "Criminal", "Fazenda Pública"]
+MOVIMENTOS = ["Conclusão", "Distribuição", "Decurso de Prazo", "Expedição de documento", "Juntada de Petição"]
+NOMES = ["MARIA", "JOSE", "ANA", "JOAO", "ANTONIO", "FRANCISCA", "CARLOS", "PAULO", "LUCAS", "JULIANA"]
+SOBRENOMES = ["SILVA", "SANTOS", "OLIVEIRA", "SOUZA", "LIMA", "PEREIRA", "COSTA", "RODRIGUES", "ALMEIDA", "NASCIMENTO"]
+PALAVRAS = ["intime-se", "cumpra-se", "sentenca", "oficio", "mandado", "audiencia", "prazo", "citacao", "penhora",
+            "alvara", "curatela", "alimentos", "recurso", "apelacao", "arquivamento", "diligencia", "prisao", "fianca"]
+
+
+def cnj_number(sequencial, ano, segmento=8, tribunal=5, origem=216):
+    """
+    Monta um número CNJ válido (NNNNNNN-DD.AAAA.J.TR.OOOO) calculando os dígitos verificadores.
+    """
+    base = f"{sequencial:07d}{ano:04d}{segmento}{tribunal:02d}{origem:04d}"
+    digitos = 98 - (int(base + "00") % 97)
+    return f"{sequencial:07d}-{digitos:02d}.{ano:04d}.{segmento}.{tribunal:02d}.{origem:04d}"
+
+
+def random_name(rng):
+    return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+
+
+class MockData:
+    """
+    Massa de dados sintética e determinística do PJe simulado.
+    """
+
+    def __init__(self, processos=200, partes_por_processo=2, por_etiqueta=50, modelos=100,
+                 downloads_antigos=50, seed=42):
+        rng = random.Random(seed)
+        self.por_etiqueta = por_etiqueta
+
+        total_partes = max(1, processos * partes_por_processo // 3)
+        self.partes = []
+        for index in range(total_partes):
+            self.partes.append({
+                "id": index + 1,
+                "nome": random_name(rng),
+                "cpf": f"{rng.randint(0, 999):03d}.{rng.randint(0, 999):03d}.{rng.randint(0, 999):03d}-{rng.randint(0, 99):02d}",
+                "nascimento": (date(1950, 1, 1) + timedelta(days=rng.randint(0, 20000))).strftime("%d/%m/%Y"),
+                "genitor": random_name(rng),
+                "genitora": random_name(rng),
+            })
+
+        inicio = date(2018, 1, 1)
+        self.processos = []
+        for index in range(processos):
+            autuado_em = inicio + timedelta(days=rng.randint(0, 6 * 365))
+            partes = rng.sample(self.partes, min(partes_por_processo, len(self.partes)))
+            self.processos.append({
+                "id": index + 1,
+                "numero": cnj_number(index + 1, autuado_em.year),
+                "classe": rng.choice(CLASSES),
+                "assunto": rng.choice(ASSUNTOS),
+                "area": rng.choice(AREAS),
+                "orgao": "VARA DOS FEITOS DE RIO REAL",
+                "autuado_em": autuado_em,
+                "polo_ativo": random_name(rng),
+                "partes": [parte["id"] for parte in partes],
+                "ultima_movimentacao": f"{rng.choice(MOVIMENTOS)} ({(autuado_em + timedelta(days=rng.randint(1, 300))).strftime('%d/%m/%Y')})",
+                "texto": " ".join(rng.choice(PALAVRAS) for _ in range(60)),
+            })
+        self.processos_por_id = {processo["id"]: processo for processo in self.processos}
+        self.partes_por_id = {parte["id"]: parte for parte in self.partes}
+
+        self.modelos = []
+        for index in range(modelos):
+            titulo = f"Novo modelo {index + 1}" if index % 3 else f"Modelo padrão {index + 1}"
+            self.modelos.append({
+                "id": index + 1,
+                "titulo": titulo,
+                "data": (inicio + timedelta(days=rng.randint(0, 6 * 365))).strftime("%d/%m/%Y"),
+                "autor": random_name(rng),
+            })
+        self.proximo_modelo = modelos + 1
+
+        self.area_download = []
+        for _ in range(downloads_antigos):
+            processo = rng.choice(self.processos) if self.processos else None
+            if processo:
+                self.add_download(processo["id"], rng.choice(["Ofício", "Sentença"]), antigo=True)
+
+    def add_download(self, processo_id, tipo, antigo=False):
+        entrada = {
+            "id": len(self.area_download) + 1,
+            "processo_id": processo_id,
+            "numero": self.processos_por_id[processo_id]["numero"],
+            "tipo": tipo,
+            "data": "01/01/2024" if antigo else date.today().strftime("%d/%m/%Y"),
+        }
+        self.area_download.insert(0, entrada)
+        return entrada
+
+    def processos_da_etiqueta(self, etiqueta):
+        """
+        Cada etiqueta recebe uma janela fixa de processos; etiquetas diferentes se sobrepõem.
+        """
+        if not self.processos:
+            return []
+        inicio = zlib.crc32(etiqueta.encode("utf-8")) % len(self.processos)
+        total = min(self.por_etiqueta, len(self.processos))
+        return [self.processos[(inicio + offset) % len(self.processos)] for offset in range(total)]
+
+
+def build_pdf(texto, tamanho_minimo=0):
+    """
+    Gera um PDF simples (uma página, Helvetica) contendo `texto`.
+    """
+    linhas = [texto[i:i + 90] for i in range(0, len(texto), 90)] or [""]
+    comandos = ["BT", "/F1 10 Tf", "50 760 Td", "12 TL"]
+    for linha in linhas:
+        linha = linha.encode("latin-1", "replace").decode("latin-1")
+        linha = linha.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        comandos.append(f"({linha}) Tj T*")
+    comandos.append("ET")
+    conteudo = "\n".join(comandos).encode("latin-1")
+
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(conteudo)).encode() + b" >>\nstream\n" + conteudo + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for numero, objeto in enumerate(objetos, 1):
+        offsets.append(len(pdf))
+        pdf += f"{numero} 0 obj\n".encode() + objeto + b"\nendobj\n"
+    if len(pdf) < tamanho_minimo:
+        pdf += b"%" + b"0" * (tamanho_minimo - len(pdf)) + b"\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
@@ -0,0 +1,189 @@
+"""
+DataJud (Elasticsearch) simulado para testar utils.datajud sem a API pública.
+
+Atende `POST /<índice>/_search` com `size`, `sort` (lista de campos),
+`search_after` e as consultas `match_all` e `terms`, que são as usadas pelo
+DataJudClient. Os processos gerados compartilham poucos valores de
+@timestamp, de modo que a paginação só é correta com desempate na ordenação.
+
+Uso (na raiz do projeto):
+    python -m mock_pje.datajud --porta 8766 --processos 5000
+    python -m mock_pje.datajud --verificar
+
+Com --verificar, sobe o servidor, busca todos os processos com o DataJudClient
+e confere que cada um veio exatamente uma vez (código de saída 1 se não).
+"""
+import sys
+import json
+import random
+import asyncio
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from mock_pje.data import cnj_number
+
+GRAUS = ["G1", "G2", "JE"]
+
+
+def build_documents(processos=1000, timestamps=5, seed=42):
+    """
+    Processos sintéticos no formato do DataJud; alguns números aparecem em mais
+    de um grau e todos dividem `timestamps` valores de @timestamp.
+    """
+    rng = random.Random(seed)
+    documents = []
+    for index in range(processos):
+        numero = cnj_number(index + 1, rng.randint(2015, 2024)).replace("-", "").replace(".", "")
+        for grau in rng.sample(GRAUS, rng.choice([1, 1, 1, 2])):
+            documents.append({
+                "id": f"TJBA_{grau}_{numero}",
+                "tribunal": "TJBA",
+                "grau": grau,
+                "numeroProcesso": numero,
+                "@timestamp": f"2024-01-0{rng.randrange(timestamps) + 1}T00:00:00.000Z",
+            })
+    return documents
+
+
+def _sort_spec(sort):
+    spec = []
+    for item in sort or []:
+        if isinstance(item, str):
+            spec.append((item, "asc"))
+            continue
+        field, options = next(iter(item.items()))
+        spec.append((field, options.get("order", "asc") if isinstance(options, dict) else options))
+    return spec
+
+
+def _matches(document, query):
+    if not query or "match_all" in query:
+        return True
+    if "terms" in query:
+        field, values = next(iter(query["terms"].items()))
+        return document.get(field) in set(values)
+    raise ValueError(f"Consulta não suportada pelo simulador: {query!r}")
+
+
+def search(documents, body):
+    """
+    Executa a busca como o Elasticsearch: filtra, ordena pelos campos de
+    `sort`, aplica `search_after` e devolve `size` hits com os valores de ordenação.
+    """
+    spec = _sort_spec(body.get("sort"))
+    hits = [document for document in documents if _matches(document, body.get("query"))]
+    for field, order in reversed(spec):
+        hits.sort(key=lambda document: document.get(field), reverse=order == "desc")
+    after = body.get("search_after")
+    if after is not None:
+        def is_after(document):
+            for (field, order), value in zip(spec, after):
+                current = document.get(field)
+                if current != value:
+                    return current > value if order == "asc" else current < value
+            return False
+        hits = [document for document in hits if is_after(document)]
+    size = body.get("size", 10)
+    return {
+        "hits": {
+            "total": {"value": len(hits), "relation": "eq"},
+            "hits": [
+                {"_id": document["id"], "_source": document, "sort": [document.get(field) for field, _ in spec]}
+                for document in hits[:size]
+            ],
+        }
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    documents = []
+    requests = 0
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+    def do_POST(self):
+        if not self.path.endswith("/_search"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        type(self).requests += 1
+        try:
+            payload = json.dumps(search(self.documents, body)).encode()
+            status = 200
+        except ValueError as e:
+            payload = json.dumps({"error": str(e)}).encode()
+            status = 400
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_server(port=0, host="127.0.0.1", **options):
+    """
+    Sobe o DataJud simulado em uma thread e retorna (servidor, url_base, documentos).
+    """
+    documents = build_documents(**options)
+    handler = type("DataJudHandler", (Handler,), {"documents": documents, "requests": 0})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    logging.info(f"DataJud simulado com {len(documents)} documentos disponível em {base_url}")
+    return server, base_url, documents
+
+
+def verify(processos=1000, page_size=37, concurrency=4):
+    """
+    Confere a paginação do DataJudClient contra o simulador: todos os
+    processos de uma busca `match_all` e de `fetch_processes` devem vir uma única vez.
+    """
+    from utils.datajud import DataJudClient
+
+    server, base_url, documents = start_server(processos=processos)
+    expected = sorted(document["id"] for document in documents)
+
+    async def collect():
+        async with DataJudClient(base_url=base_url, index="api_publica_tjba", api_key="",
+                                 page_size=page_size, concurrency=concurrency) as client:
+            all_hits = [hit["_id"] async for hit in client.search({"match_all": {}})]
+            numeros = sorted({document["numeroProcesso"] for document in documents})
+            by_number = [hit["_id"] async for hit in client.fetch_processes(numeros, batch_size=50)]
+        return all_hits, by_number
+
+    try:
+        all_hits, by_number = asyncio.run(collect())
+    finally:
+        server.shutdown()
+    ok = True
+    for label, hits in (("match_all", all_hits), ("fetch_processes", by_number)):
+        duplicates = len(hits) - len(set(hits))
+        missing = len(set(expected) - set(hits))
+        print(f"{label}: {len(hits)} hits de {len(expected)} documentos, {duplicates} repetidos, {missing} ausentes")
+        ok = ok and sorted(hits) == expected
+    return ok
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="DataJud (Elasticsearch) simulado.")
+    parser.add_argument("--porta", type=int, default=8766)
+    parser.add_argument("--processos", type=int, default=1000)
+    parser.add_argument("--verificar", action="store_true", help="Confere a paginação do DataJudClient e sai")
+    args = parser.parse_args()
+    if args.verificar:
+        sys.exit(0 if verify(args.processos) else 1)
+    server, base_url, _ = start_server(port=args.porta, processos=args.processos)
+    print(f"DATAJUD_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
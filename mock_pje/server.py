@@ -0,0 +1,649 @@
+"""
+PJe simulado para testes e benchmarks sem acesso a pje.tjba.jus.br.
+
+Reproduz as estruturas das quais os scripts dependem: login via ssoFrame, painel
+com ngFrame e etiquetas (processo-datalist-card), consulta processual paginada
+(fPP:processosTable), detalhes do processo, pessoaFisicaViewView, Área de
+Download e ModeloDocumento.
+
+Uso (na raiz do projeto):
+    python -m mock_pje.server --porta 8765 --processos 1000 --latencia 50
+
+Depois aponte os scripts para ele com PJE_BASE_URL=http://127.0.0.1:8765/pje.
+"""
+import re
+import json
+import html
+import time
+import random
+import secrets
+import logging
+import argparse
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+from mock_pje.data import MockData, build_pdf
+
+PERFIS_PADRAO = [
+    "PERFIL TESTE",
+    "VARA CRIMINAL DE RIO REAL / Direção de Secretaria / Diretor de Secretaria",
+    "V DOS FEITOS DE REL DE CONS CIV E COMERCIAIS DE RIO REAL / Direção de Secretaria / Diretor de Secretaria",
+]
+
+PJE_JS = r"""
+function mostrarModal() { var m = document.getElementById('j_id136:modalStatusCDiv'); if (m) m.style.display = 'block'; }
+function esconderModal() { var m = document.getElementById('j_id136:modalStatusCDiv'); if (m) m.style.display = 'none'; }
+var Event = {
+    fire: function (element, name, options) {
+        var atual = parseInt(document.body.getAttribute('data-pagina') || '1', 10);
+        var total = parseInt(document.body.getAttribute('data-paginas') || '1', 10);
+        var pagina = options.page;
+        if (pagina === 'next') { pagina = atual + 1; }
+        else if (pagina === 'previous') { pagina = atual - 1; }
+        else if (pagina === 'first') { pagina = 1; }
+        else if (pagina === 'last') { pagina = total; }
+        pagina = Math.max(1, Math.min(total, parseInt(pagina, 10)));
+        window.irParaPagina(pagina);
+    }
+};
+"""
+
+
+def e(value):
+    return html.escape(str(value), quote=True)
+
+
+def page(body, title="PJe", head="", attrs=""):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{e(title)}</title>"
+            f"<script src='/pje/mock/pje.js'></script>{head}</head><body {attrs}>{body}</body></html>")
+
+
+def datascroller(pagina, paginas):
+    if pagina > 1:
+        celulas = ["<td class='rich-datascr-button' onclick=\"Event.fire(this, 'rich:datascroller:onscroll', {'page': 'previous'});\">«</td>"]
+    else:
+        celulas = ["<td class='rich-datascr-button-dsbld rich-datascr-button'>«</td>"]
+    for numero in range(max(1, pagina - 4), min(paginas, pagina + 4) + 1):
+        if numero == pagina:
+            celulas.append(f"<td class='rich-datascr-act'>{numero}</td>")
+        else:
+            celulas.append(f"<td class='rich-datascr-inact' onclick=\"Event.fire(this, 'rich:datascroller:onscroll', {{'page': '{numero}'}});\">{numero}</td>")
+    if pagina < paginas:
+        celulas.append("<td class='rich-datascr-button' onclick=\"Event.fire(this, 'rich:datascroller:onscroll', {'page': 'next'});\">»</td>")
+    else:
+        celulas.append("<td class='rich-datascr-button-dsbld rich-datascr-button'>»</td>")
+    return f"<table class='rich-datascr'><tr>{''.join(celulas)}</tr></table>"
+
+
+def paginate(items, pagina, por_pagina):
+    paginas = max(1, -(-len(items) // por_pagina))
+    pagina = max(1, min(paginas, pagina))
+    inicio = (pagina - 1) * por_pagina
+    return items[inicio:inicio + por_pagina], pagina, paginas
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value.strip(), "%d/%m/%Y").date()
+    except (ValueError, AttributeError):
+        return None
+
+
+class MockPje:
+    """
+    Estado do site simulado: massa de dados, sessões autenticadas e contadores.
+    """
+
+    def __init__(self, data, latencia_ms=0, jitter_ms=0, linhas_por_pagina=20, linhas_area_download=50,
+                 modelos_por_pagina=20, tamanho_pdf=0, perfis=None):
+        self.data = data
+        self.latencia = latencia_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.linhas_por_pagina = linhas_por_pagina
+        self.linhas_area_download = linhas_area_download
+        self.modelos_por_pagina = modelos_por_pagina
+        self.tamanho_pdf = tamanho_pdf
+        self.perfis = perfis or PERFIS_PADRAO
+        self.sessoes = set()
+        self.lock = threading.Lock()
+        self.stats = {
+            "requisicoes": 0, "logins": 0, "processos_abertos": 0, "partes_abertas": 0,
+            "documentos_solicitados": 0, "arquivos_baixados": 0, "linhas_consulta": 0,
+            "paginas_consulta": 0, "modelos_excluidos": 0,
+        }
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def delay(self):
+        if self.latencia or self.jitter:
+            time.sleep(self.latencia + random.uniform(0, self.jitter))
+
+
+class Handler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logging.debug("mock_pje: " + format, *args)
+
+    # Respostas
+    def send(self, status=200, body=b"", content_type="text/html; charset=utf-8", headers=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def redirect(self, location, headers=None):
+        self.send(302, b"", headers={"Location": location, **(headers or {})})
+
+    def send_json(self, data):
+        self.send(body=json.dumps(data, ensure_ascii=False), content_type="application/json; charset=utf-8")
+
+    # Requisição
+    @property
+    def authenticated(self):
+        cookie = self.headers.get("Cookie", "")
+        match = re.search(r"JSESSIONID=([^;]+)", cookie)
+        return bool(match and match.group(1) in self.mock.sessoes)
+
+    def read_form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        return {key: values[0] for key, values in parse_qs(raw).items()}
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def route(self, method):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path
+        if method == "POST":
+            params.update(self.read_form())
+        if path == "/pje/mock/pje.js":
+            return self.send(body=PJE_JS, content_type="application/javascript")
+        if path == "/pje/mock/stats":
+            return self.send_json(self.mock.stats)
+
+        self.mock.count("requisicoes")
+        self.mock.delay()
+
+        public = {
+            "/pje/login.seam": self.login_page,
+            "/pje/sso/login": self.sso_page,
+            "/pje/sso/authenticate": self.sso_authenticate,
+        }
+        if path in public:
+            return public[path](params)
+        if path in ("/pje", "/pje/"):
+            return self.redirect("/pje/painel.seam" if self.authenticated else "/pje/login.seam")
+        if not self.authenticated:
+            return self.redirect("/pje/login.seam")
+
+        routes = {
+            "/pje/painel.seam": self.painel,
+            "/pje/ng/painel": self.ng_painel,
+            "/pje/ng/etiquetas": self.ng_etiquetas,
+            "/pje/ng/lista-processos-tarefa": self.ng_lista_tarefa,
+            "/pje/Processo/ConsultaProcesso/listView.seam": self.consulta,
+            "/pje/Processo/ConsultaProcesso/resultados": self.consulta_resultados,
+            "/pje/Processo/ConsultaProcesso/Detalhe/listAutosDigitais.seam": self.detalhe_processo,
+            "/pje/pessoaFisicaViewView.seam": self.pessoa_fisica,
+            "/pje/mock/solicitar": self.solicitar_documento,
+            "/pje/AreaDeDownload/listView.seam": self.area_download,
+            "/pje/ng/area-download": self.ng_area_download,
+            "/pje/mock/arquivo": self.arquivo,
+            "/pje/ModeloDocumento/listView.seam": self.modelos,
+            "/pje/mock/excluir-modelo": self.excluir_modelo,
+        }
+        handler = routes.get(path)
+        if handler is None:
+            return self.send(404, "Página não encontrada")
+        return handler(params)
+
+    # Login
+    def login_page(self, params):
+        if self.authenticated:
+            return self.redirect("/pje/painel.seam")
+        return self.send(body=page("<iframe id='ssoFrame' src='/pje/sso/login' width='500' height='400'></iframe>", "Login"))
+
+    def sso_page(self, params):
+        form = (
+            "<form method='post' action='/pje/sso/authenticate'>"
+            "<input id='username' name='username' type='text'>"
+            "<input id='password' name='password' type='password'>"
+            "<input id='kc-login' name='login' type='submit' value='Entrar'>"
+            "</form>"
+        )
+        return self.send(body=page(form, "SSO"))
+
+    def sso_authenticate(self, params):
+        token = secrets.token_hex(16)
+        self.mock.sessoes.add(token)
+        self.mock.count("logins")
+        body = page("<script>window.top.location.href = '/pje/painel.seam';</script>", "Autenticando")
+        return self.send(body=body, headers={"Set-Cookie": f"JSESSIONID={token}; Path=/"})
+
+    # Painel
+    def painel(self, params):
+        perfil = params.get("perfil", "")
+        itens = "".join(f"<li><a href='/pje/painel.seam?perfil={quote(p)}'>{e(p)}</a></li>" for p in self.mock.perfis)
+        body = (
+            "<div class='navbar'>"
+            "<a href='#' class='dropdown-toggle' onclick=\"document.getElementById('menuPerfis').style.display='block'; return false;\">"
+            f"{e(perfil or 'Perfil')}</a>"
+            f"<ul id='menuPerfis' class='dropdown-menu' style='display:none'>{itens}</ul>"
+            "</div>"
+            "<iframe id='ngFrame' class='ng-frame' src='/pje/ng/painel' width='1200' height='900'></iframe>"
+        )
+        return self.send(body=page(body, "Painel"))
+
+    def ng_painel(self, params):
+        etiqueta = params.get("etiqueta")
+        cards = ""
+        if etiqueta:
+            for processo in self.mock.data.processos_da_etiqueta(etiqueta):
+                cards += (
+                    "<processo-datalist-card><div>"
+                    f"<a href='/pje/Processo/ConsultaProcesso/Detalhe/listAutosDigitais.seam?id={processo['id']}' target='_blank'>"
+                    f"<div><span class='classe'>{e(processo['classe'])}</span><span>{e(processo['numero'])}</span></div>"
+                    "</a></div></processo-datalist-card>"
+                )
+        script = r"""
+<script>
+function abrirConsulta() {
+    if (!document.getElementById('frameConsultaProcessual')) {
+        var frame = document.createElement('iframe');
+        frame.id = 'frameConsultaProcessual';
+        frame.src = '/pje/Processo/ConsultaProcesso/listView.seam';
+        frame.width = 1100; frame.height = 800;
+        document.getElementById('areaConsulta').appendChild(frame);
+    }
+    return false;
+}
+function mostrarEtiquetas() { document.getElementById('painelEtiquetas').style.display = 'block'; return false; }
+function pesquisarEtiquetas() {
+    var texto = document.getElementById('itPesquisarEtiquetas').value;
+    fetch('/pje/ng/etiquetas?q=' + encodeURIComponent(texto)).then(function (r) { return r.json(); }).then(function (nomes) {
+        var lista = document.getElementById('listaEtiquetas');
+        lista.innerHTML = '';
+        nomes.forEach(function (nome) {
+            var li = document.createElement('li');
+            var div = document.createElement('div');
+            var liInterno = document.createElement('li');
+            var icone = document.createElement('div');
+            var divNome = document.createElement('div');
+            var span = document.createElement('span');
+            var spanNome = document.createElement('span');
+            spanNome.textContent = nome;
+            spanNome.onclick = function () { location.href = '/pje/ng/painel?etiqueta=' + encodeURIComponent(nome); };
+            span.appendChild(spanNome); divNome.appendChild(span);
+            liInterno.appendChild(icone); liInterno.appendChild(divNome);
+            div.appendChild(liInterno); li.appendChild(div); lista.appendChild(li);
+        });
+    });
+    return false;
+}
+</script>"""
+        body = (
+            "<app-root><selector><div><div>"
+            "<div><side-bar><nav><ul>"
+            "<li><a href='#'>Início</a></li>"
+            "<li id='liConsultaProcessual'><a href='#' onclick='return abrirConsulta()'><i class='fas fa-search'>Consulta</i></a></li>"
+            "<li><a href='#'>Tarefas</a></li>"
+            "<li><a href='#'>Expedientes</a></li>"
+            "<li><a href='#' onclick='return mostrarEtiquetas()'>Etiquetas</a></li>"
+            "</ul></nav></side-bar>"
+            "<div class='menuItem'><a href='/pje/ng/lista-processos-tarefa'>Minhas tarefas</a></div>"
+            "</div>"
+            "<div><right-panel><div><etiquetas id='painelEtiquetas' style='display:none'>"
+            "<div><div>"
+            "<div><div></div><div><div><span>"
+            "<input id='itPesquisarEtiquetas' type='text'>"
+            "<button type='button' onclick='return pesquisarEtiquetas()'>Pesquisar</button>"
+            "</span></div></div></div>"
+            "<div><ul><p-datalist><div><div><ul id='listaEtiquetas'></ul></div></div></p-datalist></ul></div>"
+            "</div></div>"
+            "</etiquetas></div></right-panel>"
+            f"<div id='listaProcessos'>{cards}</div>"
+            "<div id='areaConsulta'></div>"
+            "</div>"
+            "</div></div></selector></app-root>"
+        )
+        return self.send(body=page(body, "Painel", head=script))
+
+    def ng_etiquetas(self, params):
+        texto = params.get("q", "").strip()
+        return self.send_json([texto] if texto else [])
+
+    def ng_lista_tarefa(self, params):
+        processo = self.mock.data.processos[0]
+        url = f"/pje/Processo/ConsultaProcesso/Detalhe/listAutosDigitais.seam?id={processo['id']}&ca={secrets.token_hex(8)}"
+        body = f"<button type='button' title='Abrir autos' onclick=\"window.open('{url}')\">Autos</button>"
+        return self.send(body=page(body, "Tarefa"))
+
+    # Consulta processual
+    def consulta(self, params):
+        campos = [
+            ("fPP:numeroProcesso:NumeroOrgaoJustica", "input"),
+            ("fPP:decorationDados:numeroOAB", "input"),
+            ("fPP:decorationDados:ufOABCombo", "select"),
+            ("fPP:dataAutuacaoDecoration:dataAutuacaoInicioInputDate", "input"),
+            ("fPP:dataAutuacaoDecoration:dataAutuacaoFimInputDate", "input"),
+            ("fPP:j_id236:assunto", "input"),
+            ("fPP:j_id245:classeJudicial", "input"),
+            ("fPP:j_id150:nomeParte", "input"),
+        ]
+        html_campos = ""
+        for campo, tipo in campos:
+            if tipo == "select":
+                opcoes = "".join(f"<option value='{uf}'>{uf}</option>" for uf in ("", "BA", "SE", "PE"))
+                html_campos += f"<select id='{campo}' name='{campo}'>{opcoes}</select>"
+            else:
+                html_campos += f"<input id='{campo}' name='{campo}' type='text'>"
+        script = r"""
+<script>
+function pesquisar(pagina) {
+    var form = document.getElementById('fPP');
+    var dados = new URLSearchParams(new FormData(form));
+    dados.set('pagina', pagina || 1);
+    mostrarModal();
+    return fetch('/pje/Processo/ConsultaProcesso/resultados?' + dados.toString())
+        .then(function (r) { return r.text(); })
+        .then(function (texto) {
+            var container = document.getElementById('fPP:processosTableContainer');
+            container.innerHTML = texto;
+            var tabela = document.getElementById('fPP:processosTable');
+            document.body.setAttribute('data-pagina', tabela.getAttribute('data-pagina'));
+            document.body.setAttribute('data-paginas', tabela.getAttribute('data-paginas'));
+            esconderModal();
+        });
+}
+window.irParaPagina = function (pagina) { pesquisar(pagina); };
+</script>"""
+        tamanhos = "".join(f"<option value='{n}'>{n}</option>" for n in (self.mock.linhas_por_pagina, 50, 100))
+        body = (
+            "<form id='fPP' onsubmit='return false;'>"
+            f"{html_campos}"
+            f"<select id='fPP:linhasPorPagina' name='linhas'>{tamanhos}</select>"
+            "<input id='fPP:searchProcessos' type='button' value='Pesquisar' onclick='pesquisar(1)'>"
+            "</form>"
+            "<div id='j_id136:modalStatusCDiv' style='display:none'>Carregando...</div>"
+            "<div id='fPP:processosTableContainer'></div>"
+        )
+        return self.send(body=page(body, "Consulta processual", head=script))
+
+    def consulta_resultados(self, params):
+        processos = self.mock.data.processos
+        de = parse_date(params.get("fPP:dataAutuacaoDecoration:dataAutuacaoInicioInputDate", ""))
+        ate = parse_date(params.get("fPP:dataAutuacaoDecoration:dataAutuacaoFimInputDate", ""))
+        classe = params.get("fPP:j_id245:classeJudicial", "").strip().lower()
+        if de:
+            processos = [p for p in processos if p["autuado_em"] >= de]
+        if ate:
+            processos = [p for p in processos if p["autuado_em"] <= ate]
+        if classe:
+            processos = [p for p in processos if classe in p["classe"].lower()]
+        por_pagina = int(params.get("linhas") or self.mock.linhas_por_pagina)
+        itens, pagina, paginas = paginate(processos, int(params.get("pagina") or 1), por_pagina)
+        self.mock.count("paginas_consulta")
+        self.mock.count("linhas_consulta", len(itens))
+
+        linhas = ""
+        for p in itens:
+            partes = ", ".join(self.mock.data.partes_por_id[i]["nome"] for i in p["partes"])
+            linhas += (
+                "<tr class='rich-table-row'>"
+                f"<td><a href='#' title='{e(p['numero'])}'>{e(p['numero'])}</a></td>"
+                "<td></td>"
+                f"<td>{e(p['orgao'])}</td>"
+                "<td></td>"
+                f"<td>{p['autuado_em'].strftime('%d/%m/%Y')}</td>"
+                f"<td>{e(p['classe'])}</td>"
+                f"<td>{e(p['polo_ativo'])}</td>"
+                f"<td>{e(partes)}</td>"
+                "<td></td>"
+                f"<td>{e(p['ultima_movimentacao'])}</td>"
+                "</tr>"
+            )
+        tabela = (
+            f"<table id='fPP:processosTable' data-pagina='{pagina}' data-paginas='{paginas}'>"
+            "<thead><tr><th>Processo</th><th></th><th>Órgão julgador</th><th></th><th>Autuado em</th>"
+            "<th>Classe judicial</th><th>Polo ativo</th><th>Polo passivo</th><th></th><th>Última movimentação</th></tr></thead>"
+            f"<tbody id='fPP:processosTable:tb'>{linhas}</tbody>"
+            f"<tfoot><tr><td colspan='10'><span>{len(processos)} resultados encontrados</span>"
+            f"{datascroller(pagina, paginas)}</td></tr></tfoot>"
+            "</table>"
+        )
+        return self.send(body=tabela)
+
+    # Processo e partes
+    def detalhe_processo(self, params):
+        processo = self.mock.data.processos_por_id.get(int(params.get("id", 0)))
+        if not processo:
+            return self.send(404, "Processo não encontrado")
+        self.mock.count("processos_abertos")
+        partes = "".join(
+            f"<tr><td><a href='/pje/pessoaFisicaViewView.seam?id={i}' target='_blank'>"
+            f"{e(self.mock.data.partes_por_id[i]['nome'])}</a></td></tr>"
+            for i in processo["partes"]
+        )
+        script = r"""
+<script>
+function mostrarPartes() { document.getElementById('poloPassivo').style.display = 'block'; return false; }
+function mostrarDownload() { document.getElementById('painelDownload').style.display = 'block'; return false; }
+function solicitarDownload(id) {
+    var tipo = document.getElementById('navbar:cbTipoDocumento').value;
+    mostrarModal();
+    fetch('/pje/mock/solicitar', {method: 'POST', headers: {'Content-Type': 'application/x-www-form-urlencoded'},
+        body: 'id=' + id + '&tipo=' + encodeURIComponent(tipo)}).then(function () { esconderModal(); });
+}
+</script>"""
+        body = (
+            "<div>"
+            "<div id='navbar'>"
+            "<ul><li><a href='#' onclick='return mostrarPartes()'>Detalhes</a></li></ul>"
+            "<div><form id='navbarForm' onsubmit='return false;'><span id='navbar:ajaxPanelAlerts'>"
+            "<ul></ul><ul>"
+            "<li></li><li></li><li></li><li></li>"
+            "<li><a href='#' onclick='return mostrarDownload()'>Download</a>"
+            "<div id='painelDownload' style='display:none'>"
+            "<div><select id='navbar:cbTipoDocumento'><option>Todos</option><option>Ofício</option><option>Sentença</option></select></div>"
+            "<div></div><div></div><div></div>"
+            f"<div><input type='button' value='Download' onclick='solicitarDownload({processo['id']})'></div>"
+            "</div></li>"
+            "</ul></span></form></div>"
+            "</div>"
+            "<div>"
+            f"<div id='numeroProcesso'>{e(processo['numero'])}</div>"
+            f"<div id='classeProcesso'>{e(processo['classe'])}</div>"
+            f"<div id='assuntoProcesso'>{e(processo['assunto'])}</div>"
+            f"<div id='areaProcesso'>{e(processo['area'])}</div>"
+            "</div>"
+            f"<div id='poloPassivo' style='display:none'><table><tbody>{partes}</tbody></table></div>"
+            "<div id='j_id136:modalStatusCDiv' style='display:none'>Carregando...</div>"
+            "</div>"
+        )
+        return self.send(body=page(body, processo["numero"], head=script))
+
+    def pessoa_fisica(self, params):
+        parte = self.mock.data.partes_por_id.get(int(params.get("id", 0)))
+        if not parte:
+            return self.send(404, "Parte não encontrada")
+        self.mock.count("partes_abertas")
+        campos = [
+            ("j_id58", "CPF", parte["cpf"]),
+            ("j_id80", "Nome Civil", parte["nome"]),
+            ("j_id157", "Data de Nascimento", parte["nascimento"]),
+            ("j_id168", "Genitor", parte["genitor"]),
+            ("j_id179", "Genitora", parte["genitora"]),
+        ]
+        body = "".join(
+            f"<div id='pessoaFisicaViewView:{campo}'><div><div>{rotulo}</div><div>{e(valor)}</div></div></div>"
+            for campo, rotulo, valor in campos
+        )
+        return self.send(body=page(body, parte["nome"]))
+
+    def solicitar_documento(self, params):
+        entrada = self.mock.data.add_download(int(params["id"]), params.get("tipo", "Todos"))
+        self.mock.count("documentos_solicitados")
+        return self.send_json(entrada)
+
+    # Área de download
+    def area_download(self, params):
+        return self.send(body=page("<iframe id='ngFrame' class='ng-frame' src='/pje/ng/area-download' width='1200' height='900'></iframe>", "Área de download"))
+
+    def ng_area_download(self, params):
+        itens, pagina, paginas = paginate(self.mock.data.area_download, int(params.get("pagina") or 1), self.mock.linhas_area_download)
+        linhas = "".join(
+            "<tr>"
+            f"<td>{e(item['numero'])}</td><td>{e(item['tipo'])}</td><td>{e(item['data'])}</td>"
+            f"<td><button type='button' onclick=\"window.location.href='/pje/mock/arquivo?id={item['id']}'\">Baixar</button></td>"
+            "</tr>"
+            for item in itens
+        )
+        script = "<script>window.irParaPagina = function (p) { location.href = '/pje/ng/area-download?pagina=' + p; };</script>"
+        body = (
+            "<table id='tabelaDownloads'><thead><tr><th>Processo</th><th>Tipo</th><th>Data</th><th></th></tr></thead>"
+            f"<tbody>{linhas}</tbody></table>"
+            f"<div id='paginacaoDownloads'>{datascroller(pagina, paginas)}</div>"
+        )
+        return self.send(body=page(body, "Área de download", head=script, attrs=f"data-pagina='{pagina}' data-paginas='{paginas}'"))
+
+    def arquivo(self, params):
+        entrada = next((item for item in self.mock.data.area_download if item["id"] == int(params.get("id", 0))), None)
+        if not entrada:
+            return self.send(404, "Arquivo não encontrado")
+        processo = self.mock.data.processos_por_id[entrada["processo_id"]]
+        texto = f"Processo {processo['numero']} - {entrada['tipo']} - {processo['classe']} - {processo['texto']}"
+        conteudo = build_pdf(texto, self.mock.tamanho_pdf)
+        self.mock.count("arquivos_baixados")
+        nome = re.sub(r"\D", "", processo["numero"])
+        headers = {"Content-Disposition": f"attachment; filename=\"{nome}.pdf\"", "Accept-Ranges": "bytes"}
+        intervalo = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+        if intervalo:
+            inicio = int(intervalo.group(1))
+            if inicio >= len(conteudo):
+                return self.send(416, b"", headers={"Content-Range": f"bytes */{len(conteudo)}"})
+            headers["Content-Range"] = f"bytes {inicio}-{len(conteudo) - 1}/{len(conteudo)}"
+            return self.send(206, conteudo[inicio:], content_type="application/pdf", headers=headers)
+        return self.send(body=conteudo, content_type="application/pdf", headers=headers)
+
+    # Modelos de documento
+    def modelos(self, params):
+        titulo = params.get("modeloSearchForm:tituloModeloDocumentoDecoration:tituloModeloDocumento", "")
+        modelos = [m for m in self.mock.data.modelos if titulo.lower() in m["titulo"].lower()]
+        itens, pagina, paginas = paginate(modelos, int(params.get("pagina") or 1), self.mock.modelos_por_pagina)
+        linhas = "".join(
+            "<tr class='rich-table-row'>"
+            f"<td>{e(m['titulo'])}</td><td>{e(m['data'])}</td><td>{e(m['autor'])}</td>"
+            f"<td><a href='#' id='modeloGrid:{indice}:j_id262:modeloGrid' onclick='return excluirModelo({m['id']})'>Excluir</a></td>"
+            "</tr>"
+            for indice, m in enumerate(itens)
+        )
+        script = r"""
+<script>
+function excluirModelo(id) {
+    if (!confirm('Confirma a exclusão do modelo?')) { return false; }
+    mostrarModal();
+    fetch('/pje/mock/excluir-modelo', {method: 'POST', headers: {'Content-Type': 'application/x-www-form-urlencoded'},
+        body: 'id=' + id}).then(function () { location.reload(); });
+    return false;
+}
+window.irParaPagina = function (p) {
+    var url = new URL(location.href);
+    url.searchParams.set('pagina', p);
+    location.href = url.toString();
+};
+</script>"""
+        body = (
+            "<form id='modeloSearchForm' method='get' action='/pje/ModeloDocumento/listView.seam'>"
+            f"<input id='modeloSearchForm:tituloModeloDocumentoDecoration:tituloModeloDocumento' "
+            f"name='modeloSearchForm:tituloModeloDocumentoDecoration:tituloModeloDocumento' type='text' value='{e(titulo)}'>"
+            "<input id='modeloSearchForm:searchButton' type='submit' value='Pesquisar'>"
+            "</form>"
+            "<div id='j_id136:modalStatusCDiv' style='display:none'>Carregando...</div>"
+            "<table id='modeloGrid'><thead><tr><th>Título</th><th>Data</th><th>Autor</th><th></th></tr></thead>"
+            f"<tbody>{linhas}</tbody>"
+            f"<tfoot><tr><td colspan='4'><span>{len(modelos)} resultados encontrados</span>{datascroller(pagina, paginas)}</td></tr></tfoot>"
+            "</table>"
+        )
+        return self.send(body=page(body, "Modelos de documento", head=script, attrs=f"data-pagina='{pagina}' data-paginas='{paginas}'"))
+
+    def excluir_modelo(self, params):
+        modelo_id = int(params.get("id", 0))
+        antes = len(self.mock.data.modelos)
+        self.mock.data.modelos = [m for m in self.mock.data.modelos if m["id"] != modelo_id]
+        if len(self.mock.data.modelos) < antes:
+            self.mock.count("modelos_excluidos")
+        return self.send_json({"excluido": len(self.mock.data.modelos) < antes})
+
+
+def start_server(port=0, host="127.0.0.1", **options):
+    """
+    Sobe o PJe simulado em uma thread e retorna (servidor, url_base).
+    As opções são as de MockData e MockPje.
+    """
+    data_options = {key: options.pop(key) for key in list(options)
+                    if key in ("processos", "partes_por_processo", "por_etiqueta", "modelos", "downloads_antigos", "seed")}
+    handler = type("MockHandler", (Handler,), {"mock": MockPje(MockData(**data_options), **options)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}/pje"
+    logging.info(f"PJe simulado disponível em {base_url}")
+    return server, base_url
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="PJe simulado para testes e benchmarks.")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--processos", type=int, default=200)
+    parser.add_argument("--partes", type=int, default=2, help="Partes no polo passivo por processo")
+    parser.add_argument("--por-etiqueta", type=int, default=50, help="Processos por etiqueta")
+    parser.add_argument("--modelos", type=int, default=100)
+    parser.add_argument("--downloads-antigos", type=int, default=50)
+    parser.add_argument("--latencia", type=int, default=0, help="Latência fixa por requisição (ms)")
+    parser.add_argument("--jitter", type=int, default=0, help="Variação aleatória adicional (ms)")
+    parser.add_argument("--linhas-por-pagina", type=int, default=20)
+    parser.add_argument("--tamanho-pdf", type=int, default=0, help="Tamanho mínimo dos PDFs gerados (bytes)")
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        port=args.porta,
+        processos=args.processos,
+        partes_por_processo=args.partes,
+        por_etiqueta=args.por_etiqueta,
+        modelos=args.modelos,
+        downloads_antigos=args.downloads_antigos,
+        latencia_ms=args.latencia,
+        jitter_ms=args.jitter,
+        linhas_por_pagina=args.linhas_por_pagina,
+        tamanho_pdf=args.tamanho_pdf,
+    )
+    print(f"PJE_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
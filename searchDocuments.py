@@ -0,0 +1,56 @@
+"""
+Índice de texto completo dos documentos baixados para o acervo.
+
+Uso:
+    python searchDocuments.py indexar [--etiqueta ETIQUETA] [--processos N]
+    python searchDocuments.py buscar '"medida protetiva" AND urgente' [--tipo Ofício] [--processo NUMERO] [--limite 20]
+
+A busca aceita a sintaxe do SQLite FTS5: termos, "frase exata", OR, NOT e prefixo*.
+"""
+import argparse
+import sqlite3
+import logging
+import time
+
+from dotenv import load_dotenv
+
+from utils.document_store import DocumentStore
+from utils.text_index import TextIndex
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Indexa e pesquisa o texto dos documentos do acervo.")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    index_parser = commands.add_parser("indexar", help="Extrai e indexa o texto dos documentos novos do acervo.")
+    index_parser.add_argument("--etiqueta")
+    index_parser.add_argument("--processos", type=int, help="Processos do pool de extração.")
+    search_parser = commands.add_parser("buscar", help="Pesquisa termos ou frases no índice.")
+    search_parser.add_argument("consulta")
+    search_parser.add_argument("--tipo")
+    search_parser.add_argument("--processo")
+    search_parser.add_argument("--limite", type=int, default=20)
+    args = parser.parse_args()
+
+    index = TextIndex()
+    if args.comando == "indexar":
+        index.add_store(DocumentStore(), tag=args.etiqueta, workers=args.processos)
+        index.optimize()
+        print(index.stats())
+        return
+    start = time.perf_counter()
+    try:
+        results = index.search(args.consulta, limit=args.limite, doc_type=args.tipo, process_number=args.processo)
+    except sqlite3.OperationalError as e:
+        search_parser.error(f"consulta inválida ({e}). Use a sintaxe do FTS5: termos, \"frase exata\", "
+                            f"OR, NOT e prefixo*; termos com hífen ou pontuação vão entre aspas.")
+    elapsed = time.perf_counter() - start
+    for result in results:
+        print(f"{result['processo']}  {result['tipo']:<12} {result['arquivo']}\n    {result['trecho']}")
+    print(f"{len(results)} resultado(s) em {elapsed * 1000:.1f} ms.")
+
+
+if __name__ == "__main__":
+    main()
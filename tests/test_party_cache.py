@@ -0,0 +1,26 @@
+from utils.party_cache import PartyCache, party_key
+
+
+def test_same_person_in_different_processes_and_sessions_has_one_key():
+    first = "https://pje.tjba.jus.br/pje/pessoaFisicaViewView.seam?idPessoa=4821&idProcessoParte=101&cid=77&ca=a1b2"
+    second = "https://pje.tjba.jus.br/pje/pessoaFisicaViewView.seam?cid=9031&idProcessoParte=555&idPessoa=4821&ca=ffee"
+    assert party_key(first) == party_key(second) == "pessoa:4821"
+
+
+def test_person_page_id_is_used_when_there_is_no_id_pessoa():
+    assert party_key("/pje/pessoaFisicaViewView.seam?id=4821&cid=12") == "pessoa:4821"
+
+
+def test_links_without_person_id_are_not_cached(tmp_path):
+    assert party_key("/pje/pessoaFisicaViewView.seam?idProcessoParte=101&cid=77") is None
+    assert party_key(None) is None
+    cache = PartyCache(path=str(tmp_path / "partes.sqlite"))
+    cache.put(party_key("/pje/parte.seam?cid=1"), {"nome": "X"}, 1.0)
+    assert cache.get(party_key("/pje/parte.seam?cid=1")) is None
+
+
+def test_cache_hits_across_processes(tmp_path):
+    cache = PartyCache(path=str(tmp_path / "partes.sqlite"))
+    cache.put(party_key("/pje/pessoaFisicaViewView.seam?idPessoa=7&idProcessoParte=1&cid=1"), {"nome": "Maria"}, 2.5)
+    assert cache.get(party_key("/pje/pessoaFisicaViewView.seam?idPessoa=7&idProcessoParte=2&cid=2")) == {"nome": "Maria"}
+    assert cache.hits == 1 and cache.saved_seconds == 2.5
@@ -0,0 +1,151 @@
+import re
+from typing import NamedTuple
+
+# NNNNNNN-DD.AAAA.J.TR.OOOO, com ou sem a pontuação, em qualquer posição do texto
+CNJ_PATTERN = re.compile(r"(?<!\d)(\d{7})[-.\s]?(\d{2})[-.\s]?(\d{4})[-.\s]?(\d)[-.\s]?(\d{2})[-.\s]?(\d{4})(?!\d)")
+CNJ_LENGTH = 20
+
+
+class _DeleteNonDigits(dict):
+    """
+    Tabela para str.translate que descarta qualquer caractere que não seja um
+    dígito ASCII (mais rápida que re.sub para textos curtos).
+    """
+
+    def __missing__(self, code):
+        value = code if 0x30 <= code <= 0x39 else None
+        self[code] = value
+        return value
+
+
+_DIGITS_TABLE = _DeleteNonDigits()
+
+
+class InvalidCnj(ValueError):
+    """
+    Texto que não contém um número CNJ válido (formato ou dígito verificador).
+    """
+
+    def __init__(self, text, reason):
+        super().__init__(f"Número CNJ inválido ({reason}): {text!r}")
+        self.text = text
+        self.reason = reason
+
+
+class CnjNumber(NamedTuple):
+    """
+    Número único de processo (Resolução CNJ 65/2008): NNNNNNN-DD.AAAA.J.TR.OOOO.
+    """
+    sequencial: str
+    digito: str
+    ano: str
+    segmento: str
+    tribunal: str
+    origem: str
+
+    @property
+    def digits(self):
+        """
+        Os 20 dígitos, como no campo `numeroProcesso` do DataJud.
+        """
+        return "".join(self)
+
+    @property
+    def formatted(self):
+        return f"{self.sequencial}-{self.digito}.{self.ano}.{self.segmento}.{self.tribunal}.{self.origem}"
+
+    def __str__(self):
+        return self.formatted
+
+
+def digits(text):
+    """
+    Apenas os dígitos de `text`.
+    """
+    return (text or "").translate(_DIGITS_TABLE)
+
+
+def check_digits(sequencial, ano, segmento, tribunal, origem):
+    """
+    Dígito verificador (módulo 97, ISO 7064) do número sem o DD.
+    """
+    return f"{98 - int(f'{sequencial}{ano}{segmento}{tribunal}{origem}00') % 97:02d}"
+
+
+def _valid_digits(number):
+    # NNNNNNN AAAA J TR OOOO DD módulo 97 deve ser 1
+    return int(number[:7] + number[9:] + number[7:9]) % 97 == 1
+
+
+def parse(text):
+    """
+    Extrai o número CNJ de `text` (o primeiro no formato NNNNNNN-DD.AAAA.J.TR.OOOO,
+    ou os 20 dígitos do texto) e confere o dígito verificador. Levanta
+    InvalidCnj se não houver número ou se o dígito não conferir.
+    """
+    match = CNJ_PATTERN.search(text or "")
+    if match:
+        number = CnjNumber(*match.groups())
+    else:
+        only_digits = digits(text)
+        if len(only_digits) != CNJ_LENGTH:
+            raise InvalidCnj(text, f"{len(only_digits)} dígitos")
+        number = CnjNumber(only_digits[:7], only_digits[7:9], only_digits[9:13], only_digits[13],
+                           only_digits[14:16], only_digits[16:])
+    if not _valid_digits(number.digits):
+        expected = check_digits(number.sequencial, number.ano, number.segmento, number.tribunal, number.origem)
+        raise InvalidCnj(text, f"dígito verificador {number.digito}, esperado {expected}")
+    return number
+
+
+def is_valid(text):
+    try:
+        parse(text)
+    except InvalidCnj:
+        return False
+    return True
+
+
+def format_cnj(text):
+    """
+    Número de `text` no formato NNNNNNN-DD.AAAA.J.TR.OOOO (levanta InvalidCnj).
+    """
+    return parse(text).formatted
+
+
+def normalize_many(texts, digits_only=False):
+    """
+    Normaliza uma sequência de números em lote: retorna, na mesma ordem, o
+    número formatado (ou só os dígitos, com `digits_only`) ou None quando o
+    número é inválido. O caso comum (20 dígitos após remover hífen e pontos)
+    não passa pela expressão regular, o que permite cruzar milhões de números com
+    o `numeroProcesso` do DataJud em poucos segundos.
+    """
+    result = []
+    append = result.append
+    for text in texts:
+        # Pontuação padrão removida com str.replace, bem mais barato que re.sub ou translate
+        number = text.replace("-", "").replace(".", "") if text else ""
+        if len(number) != CNJ_LENGTH or not (number.isascii() and number.isdigit()):
+            try:
+                number = parse(text).digits
+            except InvalidCnj:
+                append(None)
+                continue
+        elif int(number[:7] + number[9:] + number[7:9]) % 97 != 1:
+            append(None)
+            continue
+        if digits_only:
+            append(number)
+        else:
+            append(f"{number[:7]}-{number[7:9]}.{number[9:13]}.{number[13]}.{number[14:16]}.{number[16:]}")
+    return result
+
+
+def index_by_digits(texts):
+    """
+    {20 dígitos: texto original} dos números válidos de `texts`, para juntar
+    listas em formatos diferentes (cards do PJe, planilhas, DataJud).
+    """
+    texts = list(texts)
+    return {number: text for text, number in zip(texts, normalize_many(texts, digits_only=True)) if number}
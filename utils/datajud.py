@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+
+import aiohttp
+from dotenv import load_dotenv
+
+from utils.cnj import digits, normalize_many
+
+DATAJUD_URL = "https://api-publica.datajud.cnj.jus.br"
+DATAJUD_INDEX = "api_publica_tjba"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Desempate da ordenação: vários processos têm o mesmo @timestamp, e o
+# search_after só não pula nem repete hits se a chave de ordenação for única
+SORT_TIEBREAKERS = [{"numeroProcesso": {"order": "asc"}}, {"grau": {"order": "asc"}}]
+
+_DONE = object()
+
+
+def normalize_numero_processo(numero):
+    """
+    Remove a formatação do número CNJ, como no campo `numeroProcesso` do DataJud.
+    """
+    return digits(numero)
+
+
+class DataJudClient:
+    """
+    Cliente assíncrono da API pública do DataJud (Elasticsearch).
+
+    As consultas são paginadas com `search_after` e executadas em paralelo,
+    limitadas por `concurrency`, sobre um único pool de conexões. A URL base
+    pode apontar para um Elasticsearch local de testes (DATAJUD_URL).
+    """
+
+    def __init__(self, base_url=None, index=None, api_key=None, concurrency=8, page_size=100, timeout=60, max_retries=3):
+        self.base_url = (base_url or os.getenv("DATAJUD_URL", DATAJUD_URL)).rstrip("/")
+        self.index = index or os.getenv("DATAJUD_INDEX", DATAJUD_INDEX)
+        self.api_key = api_key if api_key is not None else os.getenv("DATAJUD_API_KEY", "")
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"APIKey {self.api_key}"
+        self.session = aiohttp.ClientSession(
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def _post(self, body):
+        url = f"{self.base_url}/{self.index}/_search"
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.semaphore:
+                    async with self.session.post(url, json=body) as response:
+                        if response.status in RETRY_STATUS and attempt < self.max_retries:
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=response.status
+                            )
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                logging.warning(f"Tentativa {attempt} da consulta ao DataJud falhou: {e}. Tentando novamente...")
+                await asyncio.sleep(2 ** attempt)
+
+    async def search(self, query, sort=None):
+        """
+        Produz todos os hits da consulta, página a página, usando `search_after`.
+        Os campos de desempate são acrescentados à ordenação que não os tiver.
+        """
+        sort = list(sort or [{"@timestamp": {"order": "asc"}}])
+        fields = {next(iter(item)) if isinstance(item, dict) else item for item in sort}
+        sort.extend(item for item in SORT_TIEBREAKERS if next(iter(item)) not in fields)
+        body = {
+            "size": self.page_size,
+            "query": query,
+            "sort": sort,
+        }
+        while True:
+            result = await self._post(body)
+            hits = result["hits"]["hits"]
+            for hit in hits:
+                yield hit
+            if len(hits) < self.page_size:
+                break
+            body["search_after"] = hits[-1]["sort"]
+
+    async def fetch_processes(self, numeros, batch_size=100):
+        """
+        Busca os processos de `numeros` em lotes concorrentes e produz os hits à
+        medida que chegam (sem ordem garantida).
+        """
+        numeros = [numero for numero in numeros if numero]
+        normalized = normalize_many(numeros, digits_only=True)
+        invalid = [numero for numero, number in zip(numeros, normalized) if number is None]
+        if invalid:
+            logging.warning(f"{len(invalid)} números CNJ inválidos ignorados (ex.: {invalid[:3]}).")
+        numeros = list(dict.fromkeys(number for number in normalized if number))
+        batches = [numeros[i:i + batch_size] for i in range(0, len(numeros), batch_size)]
+        logging.info(f"Consultando {len(numeros)} processos no DataJud em {len(batches)} lotes.")
+        queue = asyncio.Queue(maxsize=self.page_size * self.concurrency)
+
+        async def fetch_batch(batch):
+            async for hit in self.search({"terms": {"numeroProcesso": batch}}):
+                await queue.put(hit)
+
+        async def fetch_all():
+            try:
+                await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+            finally:
+                await queue.put(_DONE)
+
+        task = asyncio.create_task(fetch_all())
+        try:
+            while True:
+                hit = await queue.get()
+                if hit is _DONE:
+                    break
+                yield hit
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+async def fetch_processes_to_jsonl(numeros, filename, **client_options):
+    """
+    Grava em `filename` (JSONL) o `_source` de cada processo encontrado.
+    Retorna o número de registros gravados.
+    """
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    count = 0
+    async with DataJudClient(**client_options) as client:
+        with open(filename, "w", encoding="utf-8") as f:
+            async for hit in client.fetch_processes(numeros):
+                f.write(json.dumps(hit["_source"], ensure_ascii=False) + "\n")
+                count += 1
+    logging.info(f"{count} processos do DataJud salvos em {filename}.")
+    return count
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    load_dotenv()
+    if len(sys.argv) < 2:
+        print("Uso: python -m utils.datajud <arquivo_com_numeros.txt> [saida.jsonl]")
+        sys.exit(1)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        numeros = [line.strip() for line in f if line.strip()]
+    filename = sys.argv[2] if len(sys.argv) > 2 else "./docs/datajud.jsonl"
+    asyncio.run(fetch_processes_to_jsonl(numeros, filename))
+
+
+if __name__ == "__main__":
+    main()
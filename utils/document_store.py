@@ -0,0 +1,191 @@
+import os
+import re
+import shutil
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+from utils.download_area import process_key
+from utils.download_manager import file_sha256
+
+DEFAULT_STORE_PATH = ".acervo"
+DEFAULT_DOC_TYPE = "documento"
+
+
+def slug(text):
+    return re.sub(r"[^\w.-]+", "_", (text or "").strip()).strip("_") or DEFAULT_DOC_TYPE
+
+
+def _link_or_copy(source, target):
+    """
+    Cria `target` como hardlink de `source` (cópia se o sistema de arquivos não
+    permitir), substituindo o que houver em `target`.
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.exists(target):
+        if os.path.samefile(source, target):
+            return
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class DocumentStore:
+    """
+    Acervo dos documentos baixados endereçado pelo conteúdo: cada arquivo é
+    guardado uma única vez em `objetos/<sha256[:2]>/<sha256><ext>`, e o índice
+    (SQLite) aponta para ele a versão atual de cada (processo, tipo de
+    documento) e as etiquetas em que o processo apareceu. As pastas
+    `por_processo/` e `por_etiqueta/` são hardlinks para os objetos.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.getenv("PJE_DOC_STORE", DEFAULT_STORE_PATH)
+        os.makedirs(os.path.join(self.root, "objetos"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.root, "indice.sqlite"), timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS objetos (
+                    sha256 TEXT PRIMARY KEY,
+                    caminho TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS documentos (
+                    processo TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    sha256 TEXT NOT NULL REFERENCES objetos (sha256),
+                    nome_original TEXT,
+                    atualizado_em TEXT NOT NULL,
+                    PRIMARY KEY (processo, tipo)
+                );
+                CREATE TABLE IF NOT EXISTS etiquetas (
+                    etiqueta TEXT NOT NULL,
+                    processo TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    PRIMARY KEY (etiqueta, processo, tipo)
+                );
+                """
+            )
+        self.added = 0
+        self.duplicates = 0
+
+    def process_path(self, process_number, doc_type, extension=".pdf"):
+        return os.path.join(self.root, "por_processo", process_key(process_number), f"{slug(doc_type)}{extension}")
+
+    def tag_path(self, tag, process_number, doc_type, extension=".pdf"):
+        return os.path.join(self.root, "por_etiqueta", slug(tag),
+                            f"{process_key(process_number)}_{slug(doc_type)}{extension}")
+
+    def add(self, path, process_number, doc_type=None, tag=None):
+        """
+        Guarda o arquivo baixado em `path` como a versão atual do documento do
+        processo e remove o arquivo de origem. Um conteúdo já guardado não é
+        copiado de novo. Os hardlinks do documento em `por_processo/` e nas
+        etiquetas já associadas passam a apontar para a nova versão. Retorna o
+        caminho do documento em `por_processo/`.
+        """
+        doc_type = doc_type or DEFAULT_DOC_TYPE
+        extension = os.path.splitext(path)[1].lower() or ".pdf"
+        previous = self.lookup(process_number, doc_type)
+        sha256 = file_sha256(path).hexdigest()
+        size = os.path.getsize(path)
+        obj = os.path.join(self.root, "objetos", sha256[:2], f"{sha256}{extension}")
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            if os.path.exists(obj):
+                self.duplicates += 1
+                logging.info(f"Conteúdo de {os.path.basename(path)} já está no acervo ({sha256[:12]}...).")
+            else:
+                _link_or_copy(path, obj)
+                self.added += 1
+            with self.conn:
+                self.conn.execute("INSERT OR IGNORE INTO objetos (sha256, caminho, tamanho, criado_em) VALUES (?, ?, ?, ?)",
+                                  (sha256, obj, size, now))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO documentos (processo, tipo, sha256, nome_original, atualizado_em) VALUES (?, ?, ?, ?, ?)",
+                    (process_key(process_number), doc_type, sha256, os.path.basename(path), now),
+                )
+                tags = [row[0] for row in self.conn.execute(
+                    "SELECT etiqueta FROM etiquetas WHERE processo = ? AND tipo = ?",
+                    (process_key(process_number), doc_type),
+                )]
+            if os.path.abspath(path) != os.path.abspath(obj):
+                os.remove(path)
+            # A nova versão substitui a anterior em por_processo/ e em todas as etiquetas já associadas
+            old_extension = os.path.splitext(previous["caminho"])[1] if previous else extension
+            targets = [(self.process_path(process_number, doc_type, extension),
+                        self.process_path(process_number, doc_type, old_extension))]
+            targets += [(self.tag_path(name, process_number, doc_type, extension),
+                         self.tag_path(name, process_number, doc_type, old_extension)) for name in tags]
+            for new_target, old_target in targets:
+                if old_target != new_target and os.path.exists(old_target):
+                    os.remove(old_target)
+                _link_or_copy(obj, new_target)
+            target = targets[0][0]
+        if tag:
+            self.link_tag(process_number, doc_type, tag)
+        return target
+
+    def link_tag(self, process_number, doc_type, tag):
+        """
+        Associa a versão atual do documento à etiqueta (índice e hardlink em `por_etiqueta/`).
+        """
+        doc_type = doc_type or DEFAULT_DOC_TYPE
+        entry = self.lookup(process_number, doc_type)
+        if not entry:
+            return None
+        target = self.tag_path(tag, process_number, doc_type, os.path.splitext(entry["caminho"])[1])
+        with self.lock:
+            with self.conn:
+                self.conn.execute("INSERT OR IGNORE INTO etiquetas (etiqueta, processo, tipo) VALUES (?, ?, ?)",
+                                  (tag, process_key(process_number), doc_type))
+            _link_or_copy(entry["caminho"], target)
+        return target
+
+    def lookup(self, process_number, doc_type=None):
+        """
+        Versão atual do documento do processo ({sha256, caminho, tamanho, atualizado_em}), ou None.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                """
+                SELECT d.sha256, o.caminho, o.tamanho, d.atualizado_em FROM documentos d
+                JOIN objetos o ON o.sha256 = d.sha256 WHERE d.processo = ? AND d.tipo = ?
+                """,
+                (process_key(process_number), doc_type or DEFAULT_DOC_TYPE),
+            ).fetchone()
+        if row is None or not os.path.exists(row[1]):
+            return None
+        return {"sha256": row[0], "caminho": row[1], "tamanho": row[2], "atualizado_em": row[3]}
+
+    def has(self, process_number, doc_type=None):
+        return self.lookup(process_number, doc_type) is not None
+
+    def documents(self, tag=None):
+        """
+        Documentos atuais do acervo (de uma etiqueta, se informada) como (processo, tipo, caminho, sha256).
+        """
+        query = "SELECT d.processo, d.tipo, o.caminho, d.sha256 FROM documentos d JOIN objetos o ON o.sha256 = d.sha256"
+        params = ()
+        if tag:
+            query += " JOIN etiquetas e ON e.processo = d.processo AND e.tipo = d.tipo WHERE e.etiqueta = ?"
+            params = (tag,)
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def summary(self):
+        return f"Acervo de documentos: {self.added} novos, {self.duplicates} duplicados descartados."
+
+    def close(self):
+        self.conn.close()
+
+
+def document_store_enabled():
+    return os.getenv("PJE_DOC_STORE_ENABLED", "1") != "0"
@@ -0,0 +1,136 @@
+import logging
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from utils.cnj import digits
+from utils.extraction import extract_rows, click_in_row
+
+# Linhas da tabela da Área de Download (dentro do ngFrame)
+DOWNLOAD_ROWS_SELECTOR = "table tbody tr"
+DOWNLOAD_BUTTON_SELECTOR = "td:last-child button"
+
+NEXT_PAGE_SCRIPT = """
+var candidates = document.querySelectorAll(
+    "td[onclick*='next'], .ui-paginator-next, .p-paginator-next, a[aria-label='Next page'], button[aria-label='Next page']");
+for (var i = 0; i < candidates.length; i++) {
+    var el = candidates[i];
+    var cls = el.className || '';
+    if (el.disabled || cls.indexOf('disabled') >= 0 || cls.indexOf('dsbld') >= 0) { continue; }
+    el.click();
+    return true;
+}
+return false;
+"""
+
+FIRST_ROW_SCRIPT = """
+var row = document.querySelector(arguments[0]);
+return row ? row.innerText : null;
+"""
+
+
+def process_key(process_number):
+    """
+    Chave de comparação de números de processo: apenas os dígitos.
+    """
+    return digits(process_number)
+
+
+class DownloadAreaIndex:
+    """
+    Índice das entradas da Área de Download por número de processo, lido página
+    a página com uma única extração por página.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.pages = 0
+        self.rows = 0
+
+    def add_page(self, page, rows):
+        self.pages += 1
+        for position, cells in enumerate(rows):
+            number = cells[0]["text"] if cells else ""
+            if not process_key(number):
+                # Linhas sem número de processo (paginação, cabeçalhos internos)
+                continue
+            self.rows += 1
+            self.entries.setdefault(process_key(number), []).append({
+                "numero": number,
+                "pagina": page,
+                "linha": position,
+                "celulas": [cell["text"] for cell in cells],
+                "acao": cells[-1],
+            })
+
+    def has_all(self, keys):
+        return all(key in self.entries for key in keys)
+
+    def match(self, process_numbers):
+        """
+        Cruza os processos solicitados com o índice. Retorna (encontrados,
+        ausentes, duplicados): encontrados mapeia o número solicitado para a
+        primeira entrada (a mais recente) e duplicados lista os solicitados com
+        mais de uma entrada nas páginas lidas (todas, se a leitura foi completa).
+        """
+        found, missing, duplicates = {}, [], {}
+        for number in dict.fromkeys(process_numbers):
+            entries = self.entries.get(process_key(number))
+            if not entries:
+                missing.append(number)
+                continue
+            found[number] = entries[0]
+            if len(entries) > 1:
+                duplicates[number] = len(entries)
+        return found, missing, duplicates
+
+
+def _rows_changed(selector, previous):
+    def condition(driver):
+        return driver.execute_script(FIRST_ROW_SCRIPT, selector) != previous
+    return condition
+
+
+def go_to_next_page(driver, selector=DOWNLOAD_ROWS_SELECTOR, timeout=10):
+    """
+    Avança a paginação da tabela e espera as linhas mudarem. Retorna False na última página.
+    """
+    previous = driver.execute_script(FIRST_ROW_SCRIPT, selector)
+    if not driver.execute_script(NEXT_PAGE_SCRIPT):
+        return False
+    try:
+        WebDriverWait(driver, timeout, 0.2).until(_rows_changed(selector, previous))
+    except TimeoutException:
+        logging.warning("A página seguinte da Área de Download não carregou; leitura interrompida.")
+        return False
+    return True
+
+
+def scan_download_area(driver, process_numbers, max_pages=None, selector=DOWNLOAD_ROWS_SELECTOR, on_page=None,
+                       full_scan=False):
+    """
+    Lê a Área de Download (o driver já deve estar no ngFrame) montando o índice
+    por número de processo. A leitura para quando todos os processos solicitados
+    foram encontrados, na última página ou após `max_pages` páginas; com
+    `full_scan`, lê todas as páginas para que as entradas duplicadas das páginas
+    seguintes também sejam contadas. `on_page(page, index)` é chamado após cada
+    página, antes de avançar.
+    """
+    wanted = {process_key(number) for number in process_numbers}
+    index = DownloadAreaIndex()
+    page = 1
+    while True:
+        index.add_page(page, extract_rows(driver, selector) or [])
+        if on_page:
+            on_page(page, index)
+        if (not full_scan and index.has_all(wanted)) or (max_pages and page >= max_pages):
+            break
+        if not go_to_next_page(driver, selector):
+            break
+        page += 1
+    logging.info(f"Área de Download: {index.rows} entradas lidas em {index.pages} página(s).")
+    return index
+
+
+def click_download(driver, row, selector=DOWNLOAD_ROWS_SELECTOR, target=DOWNLOAD_BUTTON_SELECTOR):
+    return click_in_row(driver, selector, row, target)
@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.journal import FILE_DOWNLOADED
+
+# URL entre aspas em um onclick (ex.: window.location.href='/pje/...'; window.open("https://..."))
+ONCLICK_LINK_PATTERN = re.compile(r"""['"]((?:https?://|/)[^'"]+)['"]""")
+
+MANIFEST_FILENAME = "manifest.json"
+PDF_MAGIC = b"%PDF-"
+
+
+class InvalidDocument(Exception):
+    """
+    Resposta que não é um PDF (ex.: página de login ou de erro do PJe em HTML).
+    """
+
+
+def resolve_download_url(cell, base_url):
+    """
+    URL do arquivo a partir de uma célula extraída (href ou onclick do botão), ou None.
+    """
+    href = cell.get("href")
+    if href and not href.startswith("javascript") and not href.endswith("#"):
+        return urljoin(base_url, href)
+    match = ONCLICK_LINK_PATTERN.search(cell.get("onclick") or "")
+    return urljoin(base_url, match.group(1)) if match else None
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest
+
+
+class DownloadManager:
+    """
+    Baixa os arquivos gerados pelo PJe direto por HTTP, com os cookies da sessão
+    autenticada: vários downloads simultâneos sobre conexões reaproveitadas,
+    retomada de transferências interrompidas (cabeçalho Range) e gravação em
+    disco por partes. Respostas que não são PDF são rejeitadas. Tamanho e
+    SHA-256 de cada processo ficam no manifesto da pasta, gravado ao fim de
+    cada lote (e no journal, se informado). Com `store`, cada arquivo concluído é
+    movido para o acervo de documentos (DocumentStore) e os processos cujo
+    documento já está no acervo não são baixados de novo.
+    """
+
+    def __init__(self, directory, cookies=(), user_agent=None, workers=4, chunk_size=256 * 1024,
+                 retries=3, timeout=60, journal=None, store=None, doc_type=None, tag=None):
+        self.directory = directory
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+        self.journal = journal
+        self.store = store
+        self.doc_type = doc_type
+        self.tag = tag
+        os.makedirs(directory, exist_ok=True)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        for cookie in cookies:
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"),
+                                     path=cookie.get("path", "/"))
+
+        self.manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_driver(cls, driver, directory, **options):
+        """
+        Cria o gerenciador com os cookies e o User-Agent atuais do navegador.
+        """
+        return cls(directory, cookies=driver.get_cookies(),
+                   user_agent=driver.execute_script("return navigator.userAgent;"), **options)
+
+    def target_path(self, process_number):
+        name = re.sub(r"\D", "", process_number) or re.sub(r"[^\w.-]", "_", process_number)
+        return os.path.join(self.directory, f"{name}.pdf")
+
+    def is_downloaded(self, process_number):
+        entry = self.manifest.get(process_number)
+        return bool(entry) and os.path.exists(entry["arquivo"]) and os.path.getsize(entry["arquivo"]) == entry["tamanho"]
+
+    def _fetch(self, url, path):
+        """
+        Baixa `url` para `path` retomando de `path`.part se ele existir.
+        Retorna (tamanho, sha256, retomado).
+        """
+        partial = path + ".part"
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # O arquivo parcial já está completo
+                response.close()
+            else:
+                response.raise_for_status()
+                if "login.seam" in response.url:
+                    raise requests.HTTPError(f"Sessão expirada ao baixar {url}")
+                resumed = offset and response.status_code == 206
+                if not resumed:
+                    offset = 0
+                    content_type = response.headers.get("Content-Type", "").lower()
+                    if content_type.startswith(("text/html", "application/json", "text/plain")):
+                        raise InvalidDocument(f"Resposta {content_type!r} em vez de PDF ao baixar {url}")
+                with open(partial, "ab" if resumed else "wb") as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+        with open(partial, "rb") as f:
+            if f.read(len(PDF_MAGIC)) != PDF_MAGIC:
+                raise InvalidDocument(f"Arquivo baixado de {url} não é um PDF")
+        digest = file_sha256(partial)
+        os.replace(partial, path)
+        return os.path.getsize(path), digest.hexdigest(), bool(offset)
+
+    def download_one(self, process_number, url):
+        """
+        Baixa o arquivo de um processo com até `retries` tentativas, retomando a
+        parte já recebida em cada nova tentativa. Retorna o registro do manifesto.
+        """
+        if self.is_downloaded(process_number):
+            return {**self.manifest[process_number], "status": "existente"}
+        if self.store and self.store.has(process_number, self.doc_type):
+            path = self.store.link_tag(process_number, self.doc_type, self.tag) if self.tag else None
+            entry = self.store.lookup(process_number, self.doc_type)
+            return {"processo": process_number, "arquivo": path or entry["caminho"], "tamanho": entry["tamanho"],
+                    "sha256": entry["sha256"], "url": url, "status": "existente"}
+        path = self.target_path(process_number)
+        start = time.perf_counter()
+        for attempt in range(1, self.retries + 1):
+            try:
+                size, sha256, resumed = self._fetch(url, path)
+                break
+            except InvalidDocument as e:
+                # Repetir traria a mesma página; o arquivo parcial é descartado
+                logging.warning(f"Download do processo {process_number} rejeitado: {e}")
+                if os.path.exists(path + ".part"):
+                    os.remove(path + ".part")
+                return {"processo": process_number, "url": url, "status": "erro", "erro": str(e)}
+            except (requests.RequestException, OSError) as e:
+                logging.warning(f"Download do processo {process_number} falhou (tentativa {attempt}): {e}")
+                if attempt == self.retries:
+                    return {"processo": process_number, "url": url, "status": "erro", "erro": str(e)}
+                time.sleep(attempt)
+        if self.store:
+            path = self.store.add(path, process_number, self.doc_type, self.tag)
+        entry = {
+            "processo": process_number,
+            "arquivo": path,
+            "tamanho": size,
+            "sha256": sha256,
+            "url": url,
+            "retomado": resumed,
+            "segundos": round(time.perf_counter() - start, 3),
+        }
+        with self.lock:
+            self.manifest[process_number] = entry
+        logging.info(f"Processo {process_number} baixado: {size} bytes, sha256 {sha256[:12]}...")
+        return {**entry, "status": "baixado"}
+
+    def download(self, links):
+        """
+        Baixa `links` ({número do processo: url}) com `workers` transferências
+        simultâneas e retorna os registros na ordem em que terminaram. O journal
+        é gravado nesta thread, à medida que cada download termina; uma falha
+        inesperada em um arquivo é registrada como erro dele sem interromper os
+        demais. O manifesto é gravado uma única vez, ao final.
+        """
+        results = []
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(self.download_one, number, url): (number, url) for number, url in links.items()}
+                for future in as_completed(futures):
+                    results.append(self._collect(future, *futures[future]))
+        finally:
+            with self.lock:
+                self._save_manifest()
+        elapsed = time.perf_counter() - start
+        total = sum(result.get("tamanho", 0) for result in results if result["status"] == "baixado")
+        logging.info(f"{len(results)} downloads tratados em {elapsed:.1f}s "
+                     f"({total / max(elapsed, 1e-9) / 1024 / 1024:.2f} MB/s).")
+        return results
+
+    def _collect(self, future, process_number, url):
+        try:
+            result = future.result()
+        except Exception as e:
+            logging.error(f"Erro inesperado no download do processo {process_number}: {e}")
+            return {"processo": process_number, "url": url, "status": "erro", "erro": f"{type(e).__name__}: {e}"}
+        if self.journal and result["status"] == "baixado":
+            self.journal.mark(result["processo"], FILE_DOWNLOADED, {
+                "arquivo": result["arquivo"], "tamanho": result["tamanho"], "sha256": result["sha256"]})
+        return result
+
+    def _save_manifest(self):
+        temporary = self.manifest_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=4)
+        os.replace(temporary, self.manifest_path)
@@ -0,0 +1,89 @@
+import os
+import logging
+
+from selenium import webdriver
+
+# Padrões de URL bloqueados no modo enxuto (imagens, fontes e analytics)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*",
+]
+
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-notifications",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+    "--window-size=1920,1080",
+]
+
+
+def env_flag(name, default="0"):
+    return os.getenv(name, default).lower() in ("1", "true", "sim", "yes")
+
+
+def build_options(lean=False, headless=None, download_directory=None, page_load_strategy=None, extra_arguments=()):
+    """
+    Monta as opções do Chrome. No modo enxuto o navegador roda sem interface
+    (a menos que headless=False), sem extensões, sincronização e rede em
+    segundo plano, e sem carregar imagens.
+    """
+    options = webdriver.ChromeOptions()
+    prefs = {}
+    if download_directory:
+        os.makedirs(download_directory, exist_ok=True)
+        prefs.update({
+            "plugins.always_open_pdf_externally": True,
+            "download.default_directory": download_directory,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "profile.default_content_setting_values.automatic_downloads": 1,
+            "safebrowsing.enabled": True,
+        })
+    if headless is None:
+        headless = lean
+    if headless:
+        options.add_argument("--headless=new")
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        prefs["profile.managed_default_content_settings.images"] = 2
+    for argument in extra_arguments:
+        options.add_argument(argument)
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+    if prefs:
+        options.add_experimental_option("prefs", prefs)
+    return options
+
+
+def create_driver(lean=None, headless=None, download_directory=None, page_load_strategy=None, extra_arguments=()):
+    """
+    Cria o Chrome usado por todos os scripts.
+
+    Sem argumentos, segue as variáveis de ambiente PJE_LEAN, PJE_HEADLESS e
+    PJE_PAGE_LOAD_STRATEGY ("normal", "eager" ou "none"). No modo enxuto, os
+    recursos pesados também são bloqueados via DevTools na aba principal; as
+    janelas abertas depois continuam sem imagens pela preferência do perfil.
+    """
+    if lean is None:
+        lean = env_flag("PJE_LEAN")
+    if headless is None:
+        headless = env_flag("PJE_HEADLESS") if os.getenv("PJE_HEADLESS") else lean
+    page_load_strategy = page_load_strategy or os.getenv("PJE_PAGE_LOAD_STRATEGY") or None
+
+    options = build_options(lean, headless, download_directory, page_load_strategy, extra_arguments)
+    driver = webdriver.Chrome(options=options)
+    if lean:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    if download_directory and headless:
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": download_directory})
+    logging.info(f"Chrome iniciado (enxuto={lean}, estratégia de carregamento={page_load_strategy or 'normal'}).")
+    return driver
@@ -0,0 +1,169 @@
+import os
+import csv
+import json
+import logging
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+
+class JsonlSink:
+    """
+    Grava um registro JSON por linha, com flush a cada registro.
+    """
+
+    def __init__(self, filename, headers):
+        self.headers = headers
+        self.file = open(filename, "w", encoding="utf-8")
+
+    def write(self, row):
+        self.file.write(json.dumps(dict(zip(self.headers, row)), ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonArraySink:
+    """
+    Grava uma lista JSON incrementalmente; o arquivo fica válido ao ser fechado.
+    """
+
+    def __init__(self, filename, headers):
+        self.headers = headers
+        self.file = open(filename, "w", encoding="utf-8")
+        self.file.write("[")
+        self.count = 0
+
+    def write(self, row):
+        separator = "," if self.count else ""
+        record = json.dumps(dict(zip(self.headers, row)), ensure_ascii=False, indent=4)
+        self.file.write(f"{separator}\n    " + record.replace("\n", "\n    "))
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.write("\n]" if self.count else "]")
+        self.file.close()
+
+
+class CsvSink:
+    def __init__(self, filename, headers):
+        self.file = open(filename, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.file, delimiter=";")
+        self.writer.writerow(headers)
+        self.file.flush()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxSink:
+    """
+    Planilha gerada em modo write-only. As linhas são gravadas em um arquivo
+    auxiliar (.rows.jsonl) conforme chegam e a largura das colunas é calculada
+    incrementalmente; ao fechar, a planilha é escrita em streaming a partir desse
+    arquivo, sem manter as linhas em memória.
+    """
+
+    def __init__(self, filename, headers, sheet_title="Dados"):
+        self.filename = filename
+        self.headers = headers
+        self.sheet_title = sheet_title
+        self.spool_filename = f"{filename}.rows.jsonl"
+        self.spool = open(self.spool_filename, "w", encoding="utf-8")
+        self.widths = [len(str(header)) for header in headers]
+
+    def write(self, row):
+        for index, value in enumerate(row):
+            if value is not None and len(str(value)) > self.widths[index]:
+                self.widths[index] = len(str(value))
+        self.spool.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.spool.flush()
+
+    def close(self):
+        self.spool.close()
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(self.sheet_title)
+        for index, width in enumerate(self.widths, 1):
+            ws.column_dimensions[get_column_letter(index)].width = width + 2
+        bold_font = Font(bold=True)
+        header_cells = []
+        for header in self.headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = bold_font
+            header_cells.append(cell)
+        ws.append(header_cells)
+        with open(self.spool_filename, "r", encoding="utf-8") as f:
+            for line in f:
+                ws.append(json.loads(line))
+        wb.save(self.filename)
+        os.remove(self.spool_filename)
+
+
+SINKS = {
+    "xlsx": XlsxSink,
+    "jsonl": JsonlSink,
+    "json": JsonArraySink,
+    "csv": CsvSink,
+}
+
+
+class StreamingExporter:
+    """
+    Distribui cada registro, assim que produzido, para todos os formatos de saída.
+    """
+
+    def __init__(self, headers, outputs, sheet_title="Dados"):
+        self.headers = headers
+        self.outputs = outputs
+        self.count = 0
+        self.sinks = []
+        for fmt, filename in outputs.items():
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            if fmt == "xlsx":
+                self.sinks.append(XlsxSink(filename, headers, sheet_title))
+            else:
+                self.sinks.append(SINKS[fmt](filename, headers))
+
+    def write(self, record):
+        row = [record.get(header, '') for header in self.headers]
+        for sink in self.sinks:
+            sink.write(row)
+        self.count += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        # Um formato que falhe ao fechar não impede que os demais sejam gravados
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logging.error(f"Falha ao fechar a saída {type(sink).__name__}: {e}")
+                error = error or e
+        if error:
+            raise error
+        logging.info(f"{self.count} registros exportados para: {', '.join(self.outputs.values())}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def exporter_outputs(base_filename, formats=("xlsx", "jsonl", "csv")):
+    """
+    Monta {formato: arquivo} a partir do nome base (sem extensão).
+    """
+    return {fmt: f"{base_filename}.{fmt}" for fmt in formats}
@@ -0,0 +1,108 @@
+TABLE_ROWS_SCRIPT = """
+var container = document.getElementById(arguments[0]);
+if (!container) { return null; }
+var tbody = container.tagName === 'TBODY' ? container : container.querySelector('tbody');
+if (!tbody) { return []; }
+var rows = [];
+for (var i = 0; i < tbody.rows.length; i++) {
+    var tr = tbody.rows[i];
+    var cells = [];
+    for (var j = 0; j < tr.cells.length; j++) {
+        var td = tr.cells[j];
+        var link = td.querySelector('a');
+        cells.push({
+            text: (td.innerText || '').trim(),
+            title: link ? link.getAttribute('title') : null,
+            href: link ? link.getAttribute('href') : null,
+            onclick: link ? link.getAttribute('onclick') : null
+        });
+    }
+    rows.push(cells);
+}
+return rows;
+"""
+
+
+def extract_table_rows(driver, table_id):
+    """
+    Retorna todas as linhas da tabela (ou tbody) `table_id` com um único
+    execute_script, como listas de células {text, title, href, onclick}, evitando
+    uma chamada ao WebDriver por linha e por célula. Retorna None se a tabela não
+    existir na página.
+    """
+    return driver.execute_script(TABLE_ROWS_SCRIPT, table_id)
+
+FIELDS_SCRIPT = """
+var fields = arguments[0];
+var data = {};
+for (var name in fields) {
+    var node = document.evaluate(fields[name], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    data[name] = node ? (node.innerText || node.textContent || '').trim() : null;
+}
+return data;
+"""
+
+
+def extract_fields(driver, fields):
+    """
+    Lê todos os campos de `fields` ({nome: xpath}) da página atual com um único
+    execute_script. Campos ausentes ficam como string vazia e são listados em
+    `missing`. Retorna (dados, missing).
+    """
+    raw = driver.execute_script(FIELDS_SCRIPT, fields)
+    data, missing = {}, []
+    for field_name in fields:
+        value = raw.get(field_name)
+        if value is None:
+            missing.append(field_name)
+            value = ''
+        data[field_name] = value
+    return data, missing
+
+ROWS_BY_SELECTOR_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]);
+var result = [];
+for (var i = 0; i < rows.length; i++) {
+    var cells = [];
+    for (var j = 0; j < rows[i].cells.length; j++) {
+        var td = rows[i].cells[j];
+        var link = td.querySelector('a');
+        var button = td.querySelector('button');
+        cells.push({
+            text: (td.innerText || '').trim(),
+            title: link ? link.getAttribute('title') : null,
+            href: link ? link.getAttribute('href') : null,
+            onclick: (link || button) ? (link || button).getAttribute('onclick') : null
+        });
+    }
+    result.push(cells);
+}
+return result;
+"""
+
+CLICK_IN_ROW_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]);
+var row = rows[arguments[1]];
+if (!row) { return false; }
+var target = row.querySelector(arguments[2]);
+if (!target) { return false; }
+target.scrollIntoView(true);
+target.click();
+return true;
+"""
+
+
+def extract_rows(driver, selector):
+    """
+    Como `extract_table_rows`, mas para tabelas sem id: lê todas as linhas que
+    casam com o seletor CSS `selector` em um único execute_script.
+    """
+    return driver.execute_script(ROWS_BY_SELECTOR_SCRIPT, selector)
+
+
+def click_in_row(driver, selector, index, target):
+    """
+    Clica no elemento `target` (seletor CSS) da linha `index` de `selector`, sem
+    trazer as linhas para o Python. Retorna False se a linha ou o alvo não existirem.
+    """
+    return driver.execute_script(CLICK_IN_ROW_SCRIPT, selector, index, target)
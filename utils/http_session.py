@@ -0,0 +1,95 @@
+import re
+import logging
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html
+
+# Extrai a URL de links que abrem a página via JavaScript (ex.: openPopUp('id', '/pje/...seam?...'))
+ONCLICK_URL_PATTERN = re.compile(r"""['"]([^'"]*\.seam[^'"]*)['"]""")
+
+
+class PjeSessionExpired(Exception):
+    """
+    A requisição HTTP foi redirecionada para o login: os cookies exportados expiraram.
+    """
+
+
+class PjeHttpClient:
+    """
+    Cliente HTTP que reaproveita os cookies da sessão autenticada do Selenium
+    para buscar e interpretar páginas do PJe sem renderizá-las no navegador.
+    """
+
+    def __init__(self, driver, pool_size=10, timeout=30):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.refresh_cookies(driver)
+
+    def refresh_cookies(self, driver):
+        """
+        Copia os cookies e o User-Agent atuais do navegador para a sessão HTTP.
+        """
+        self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+            )
+        logging.info(f"{len(self.session.cookies)} cookies exportados do navegador para a sessão HTTP.")
+
+    def fetch(self, url):
+        """
+        Busca `url` e retorna a árvore HTML já interpretada.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if "login.seam" in response.url or "ssoFrame" in response.text:
+            raise PjeSessionExpired(f"Sessão expirada ao acessar {url}")
+        tree = html.fromstring(response.content)
+        tree.make_links_absolute(response.url)
+        return tree
+
+
+def element_text(element):
+    return " ".join(element.text_content().split())
+
+
+def extract_fields_from_html(tree, fields):
+    """
+    Extrai o texto de cada XPath de `fields` ({nome: xpath}); campos ausentes ficam vazios.
+    """
+    data = {}
+    for field_name, xpath in fields.items():
+        found = tree.xpath(xpath)
+        data[field_name] = element_text(found[0]) if found else ''
+    return data
+
+
+def link_url(link, base_url):
+    """
+    Resolve a URL de destino de um link, seja pelo href ou pelo onclick.
+    """
+    href = link.get("href", "")
+    if href and not href.startswith("javascript") and not href.endswith("#"):
+        return urljoin(base_url, href)
+    match = ONCLICK_URL_PATTERN.search(link.get("onclick", ""))
+    if match:
+        return urljoin(base_url, match.group(1))
+    return None
+
+
+def extract_party_links(tree, base_url, polo_id="poloPassivo"):
+    """
+    Retorna [(nome da parte, url da página da parte)] do polo informado.
+    """
+    parties = []
+    for link in tree.xpath(f'//*[@id="{polo_id}"]//tbody//tr//td//a'):
+        parties.append((element_text(link), link_url(link, base_url)))
+    return parties
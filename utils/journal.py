@@ -0,0 +1,133 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from uuid import uuid4
+from datetime import datetime
+
+# Etapas registradas por processo
+CARD_READ = "card_read"
+DOCUMENT_REQUESTED = "document_requested"
+FILE_DOWNLOADED = "file_downloaded"
+PARTIES_COLLECTED = "parties_collected"
+
+DEFAULT_JOURNAL_PATH = os.path.join(".journal", "journal.sqlite")
+
+
+class RunJournal:
+    """
+    Diário persistente (SQLite) das etapas concluídas por número de processo.
+
+    Cada execução é identificada por `run` (ex.: "downloadProcessByTag:OFICIO CDEP")
+    e recebe um id guardado até ser concluída: enquanto não chamar `complete()`,
+    uma nova execução da mesma etiqueta retoma a anterior e pula o que já foi
+    feito. Com `reset` (ou PJE_JOURNAL_RESET=1), a execução pendente é
+    descartada. Cada etapa é gravada em sua própria transação assim que termina.
+    A conexão pode ser usada por várias threads (downloads simultâneos, estágios
+    do pipeline).
+    """
+
+    def __init__(self, run, path=None, reset=False):
+        self.run = run
+        self.path = path or os.getenv("PJE_JOURNAL", DEFAULT_JOURNAL_PATH)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS steps (
+                    run TEXT NOT NULL,
+                    process_number TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    payload TEXT,
+                    finished_at TEXT NOT NULL,
+                    PRIMARY KEY (run, process_number, step)
+                )
+                """
+            )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run TEXT PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    started_at TEXT NOT NULL
+                )
+                """
+            )
+        if reset:
+            self.reset()
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO runs (run, run_id, started_at) VALUES (?, ?, ?)",
+                              (run, uuid4().hex[:12], datetime.now().isoformat(timespec="seconds")))
+        self.run_id, started_at = self.conn.execute(
+            "SELECT run_id, started_at FROM runs WHERE run = ?", (run,)).fetchone()
+        logging.info(f"Diário da execução '{run}' ({self.run_id}, iniciada em {started_at}) aberto em {self.path}.")
+
+    def mark(self, process_number, step, payload=None):
+        """
+        Registra a etapa como concluída para o processo.
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO steps (run, process_number, step, payload, finished_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.run,
+                    process_number,
+                    step,
+                    json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+
+    def is_done(self, process_number, step):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM steps WHERE run = ? AND process_number = ? AND step = ?",
+                (self.run, process_number, step),
+            ).fetchone()
+        return row is not None
+
+    def payload(self, process_number, step):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT payload FROM steps WHERE run = ? AND process_number = ? AND step = ?",
+                (self.run, process_number, step),
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def done(self, step):
+        """
+        Retorna o conjunto de processos com a etapa concluída nesta execução.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT process_number FROM steps WHERE run = ? AND step = ?", (self.run, step)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM steps WHERE run = ?", (self.run,))
+            self.conn.execute("DELETE FROM runs WHERE run = ?", (self.run,))
+
+    def complete(self):
+        """
+        Encerra a execução concluída: as etapas são apagadas e a próxima execução
+        da mesma etiqueta começa do zero.
+        """
+        self._clear()
+        logging.info(f"Execução '{self.run}' ({self.run_id}) concluída; diário encerrado.")
+
+    def reset(self):
+        self._clear()
+        logging.info(f"Diário da execução '{self.run}' reiniciado.")
+
+    def close(self):
+        self.conn.close()
+
+
+def journal_reset_requested():
+    return os.getenv("PJE_JOURNAL_RESET", "0") == "1"
@@ -0,0 +1,230 @@
+import os
+import json
+import sqlite3
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_STORE_PATH = os.path.join("docs", "movimentos.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processos (
+    id TEXT PRIMARY KEY,
+    numero TEXT NOT NULL,
+    grau TEXT,
+    classe_codigo INTEGER,
+    classe_nome TEXT,
+    orgao_codigo INTEGER,
+    data_ajuizamento TEXT,
+    ultima_atualizacao TEXT,
+    ultimo_mov_codigo INTEGER,
+    ultimo_mov_data TEXT
+);
+CREATE TABLE IF NOT EXISTS movimentos (
+    processo_id TEXT NOT NULL,
+    codigo INTEGER NOT NULL,
+    data_hora TEXT NOT NULL,
+    complementos TEXT
+);
+CREATE TABLE IF NOT EXISTS orgaos (
+    codigo INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tipos_movimento (
+    codigo INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_processos_numero ON processos (numero);
+CREATE INDEX IF NOT EXISTS idx_processos_ultimo_mov ON processos (orgao_codigo, ultimo_mov_codigo, ultimo_mov_data);
+CREATE INDEX IF NOT EXISTS idx_processos_ultimo_mov_data ON processos (ultimo_mov_codigo, ultimo_mov_data);
+CREATE INDEX IF NOT EXISTS idx_movimentos_processo ON movimentos (processo_id, data_hora);
+CREATE INDEX IF NOT EXISTS idx_movimentos_codigo ON movimentos (codigo, data_hora);
+CREATE INDEX IF NOT EXISTS idx_orgaos_nome ON orgaos (nome);
+CREATE INDEX IF NOT EXISTS idx_tipos_movimento_nome ON tipos_movimento (nome);
+"""
+
+
+def iter_sources(path):
+    """
+    Lê os `_source` de uma resposta do Elasticsearch (como x.json) ou de um
+    arquivo JSONL (um hit ou `_source` por linha, como o gerado por utils.datajud).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1024).lstrip()
+        f.seek(0)
+        if head.startswith("{") and '"hits"' in head:
+            for hit in json.load(f)["hits"]["hits"]:
+                yield hit.get("_source", hit)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                yield record.get("_source", record)
+
+
+class MovementStore:
+    """
+    Base local (SQLite) dos processos e movimentos do DataJud, indexada para
+    consultas pelo último movimento de cada processo.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def ingest(self, sources):
+        """
+        Carrega (ou atualiza) os processos de `sources` em uma única transação.
+        Retorna a quantidade de processos carregados.
+        """
+        count = 0
+        with self.conn:
+            for source in sources:
+                self._ingest_one(source)
+                count += 1
+        logging.info(f"{count} processos carregados na base de movimentos.")
+        return count
+
+    def ingest_file(self, path):
+        return self.ingest(iter_sources(path))
+
+    def _ingest_one(self, source):
+        processo_id = source.get("id") or f"{source.get('tribunal')}_{source.get('grau')}_{source['numeroProcesso']}"
+        movimentos = source.get("movimentos") or []
+        classe = source.get("classe") or {}
+        orgao = source.get("orgaoJulgador") or {}
+        ultimo = max(movimentos, key=lambda m: m.get("dataHora", ""), default={})
+
+        if orgao.get("codigo") is not None:
+            self.conn.execute("INSERT OR REPLACE INTO orgaos (codigo, nome) VALUES (?, ?)", (orgao["codigo"], orgao.get("nome", "")))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO tipos_movimento (codigo, nome) VALUES (?, ?)",
+            {(m["codigo"], m.get("nome", "")) for m in movimentos},
+        )
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO processos (id, numero, grau, classe_codigo, classe_nome, orgao_codigo,
+                data_ajuizamento, ultima_atualizacao, ultimo_mov_codigo, ultimo_mov_data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                processo_id,
+                source["numeroProcesso"],
+                source.get("grau"),
+                classe.get("codigo"),
+                classe.get("nome"),
+                orgao.get("codigo"),
+                source.get("dataAjuizamento"),
+                source.get("dataHoraUltimaAtualizacao"),
+                ultimo.get("codigo"),
+                ultimo.get("dataHora"),
+            ),
+        )
+        self.conn.execute("DELETE FROM movimentos WHERE processo_id = ?", (processo_id,))
+        self.conn.executemany(
+            "INSERT INTO movimentos (processo_id, codigo, data_hora, complementos) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    processo_id,
+                    m["codigo"],
+                    m.get("dataHora", ""),
+                    json.dumps(m["complementosTabelados"], ensure_ascii=False) if m.get("complementosTabelados") else None,
+                )
+                for m in movimentos
+            ],
+        )
+
+    def _codes(self, table, value):
+        if value is None:
+            return None
+        if isinstance(value, int) or str(value).isdigit():
+            return [int(value)]
+        rows = self.conn.execute(f"SELECT codigo FROM {table} WHERE nome = ?", (value,)).fetchall()
+        return [row[0] for row in rows]
+
+    def processes_by_last_movement(self, movimento, older_than_days=None, orgao=None, reference=None):
+        """
+        Processos cujo último movimento é `movimento` (código ou nome), opcionalmente
+        ocorrido há mais de `older_than_days` dias e restritos ao órgão julgador
+        `orgao` (código ou nome).
+        """
+        movimento_codes = self._codes("tipos_movimento", movimento)
+        orgao_codes = self._codes("orgaos", orgao)
+        if not movimento_codes or orgao_codes == []:
+            return []
+
+        sql = """
+            SELECT p.numero, p.grau, p.classe_nome, o.nome, t.nome, p.ultimo_mov_data
+            FROM processos p
+            LEFT JOIN orgaos o ON o.codigo = p.orgao_codigo
+            LEFT JOIN tipos_movimento t ON t.codigo = p.ultimo_mov_codigo
+            WHERE p.ultimo_mov_codigo IN ({})
+        """.format(",".join("?" * len(movimento_codes)))
+        params = list(movimento_codes)
+        if orgao_codes:
+            sql += " AND p.orgao_codigo IN ({})".format(",".join("?" * len(orgao_codes)))
+            params.extend(orgao_codes)
+        if older_than_days is not None:
+            reference = reference or datetime.now(timezone.utc)
+            limit = (reference - timedelta(days=older_than_days)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            sql += " AND p.ultimo_mov_data < ?"
+            params.append(limit)
+        sql += " ORDER BY p.ultimo_mov_data"
+
+        columns = ["numeroProcesso", "grau", "classe", "orgaoJulgador", "ultimoMovimento", "dataUltimoMovimento"]
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+
+    def movements(self, numero):
+        """
+        Movimentos de um processo em ordem cronológica.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT m.codigo, t.nome, m.data_hora, m.complementos
+            FROM processos p
+            JOIN movimentos m ON m.processo_id = p.id
+            LEFT JOIN tipos_movimento t ON t.codigo = m.codigo
+            WHERE p.numero = ?
+            ORDER BY m.data_hora
+            """,
+            (numero,),
+        ).fetchall()
+        return [
+            {"codigo": codigo, "nome": nome, "dataHora": data_hora, "complementosTabelados": json.loads(comp) if comp else []}
+            for codigo, nome, data_hora, comp in rows
+        ]
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Base local de movimentos do DataJud.")
+    parser.add_argument("--base", default=DEFAULT_STORE_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = subparsers.add_parser("ingest", help="Carrega respostas do DataJud (JSON ou JSONL).")
+    ingest_parser.add_argument("arquivos", nargs="+")
+    query_parser = subparsers.add_parser("query", help="Processos pelo último movimento.")
+    query_parser.add_argument("--movimento", required=True, help="Código ou nome do movimento (ex.: Conclusão)")
+    query_parser.add_argument("--dias", type=int, help="Último movimento há mais de N dias")
+    query_parser.add_argument("--orgao", help="Código ou nome do órgão julgador")
+    args = parser.parse_args()
+
+    store = MovementStore(args.base)
+    try:
+        if args.command == "ingest":
+            for path in args.arquivos:
+                store.ingest_file(path)
+        else:
+            for row in store.processes_by_last_movement(args.movimento, args.dias, args.orgao):
+                print(json.dumps(row, ensure_ascii=False))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
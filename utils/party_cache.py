@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "partes.sqlite")
+
+# Parâmetros de URL com o id da pessoa, em ordem de preferência. idProcessoParte
+# (a parte em um processo) e cid/ca (da sessão) não servem: mudam para a mesma pessoa
+IDENTITY_PARAMS = ("idPessoa", "id")
+
+
+def party_key(url):
+    """
+    Chave estável da pessoa a partir do link para a página dela (a mesma em
+    qualquer processo e sessão), ou None quando o link não traz o id da pessoa;
+    nesse caso a parte não usa o cache.
+    """
+    if not url:
+        return None
+    params = parse_qs(urlparse(url).query)
+    for name in IDENTITY_PARAMS:
+        if params.get(name, [""])[0]:
+            return f"pessoa:{params[name][0]}"
+    return None
+
+
+class PartyCache:
+    """
+    Cache persistente (SQLite) dos dados das partes por pessoa (party_key), com
+    validade (TTL) e limite de entradas: as menos usadas recentemente são
+    descartadas primeiro. Registra acertos e o tempo de coleta economizado.
+    """
+
+    def __init__(self, path=None, ttl_days=None, max_entries=None):
+        self.path = path or os.getenv("PJE_PARTY_CACHE", DEFAULT_CACHE_PATH)
+        self.ttl = float(ttl_days or os.getenv("PJE_PARTY_CACHE_TTL_DAYS", "30")) * 86400
+        self.max_entries = int(max_entries or os.getenv("PJE_PARTY_CACHE_MAX", "50000"))
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS partes (
+                    chave TEXT PRIMARY KEY,
+                    dados TEXT NOT NULL,
+                    criado_em REAL NOT NULL,
+                    usado_em REAL NOT NULL,
+                    segundos_coleta REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_partes_usado_em ON partes (usado_em)")
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key):
+        """
+        Dados da parte, ou None se ausente ou vencida.
+        """
+        if key is None:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT dados, criado_em, segundos_coleta FROM partes WHERE chave = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE partes SET usado_em = ? WHERE chave = ?", (now, key))
+            self.hits += 1
+            self.saved_seconds += row[2]
+        return json.loads(row[0])
+
+    def put(self, key, data, scrape_seconds):
+        if key is None:
+            return
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO partes (chave, dados, criado_em, usado_em, segundos_coleta) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(data, ensure_ascii=False), now, now, scrape_seconds),
+            )
+            self.conn.execute("DELETE FROM partes WHERE criado_em < ?", (now - self.ttl,))
+            excess = self.conn.execute("SELECT COUNT(*) FROM partes").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute(
+                    "DELETE FROM partes WHERE chave IN (SELECT chave FROM partes ORDER BY usado_em LIMIT ?)", (excess,)
+                )
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return (f"Cache de partes: {self.hits} acertos, {self.misses} faltas "
+                f"(taxa de acerto {self.hit_rate():.0%}), {self.saved_seconds:.1f}s de coleta economizados.")
+
+    def close(self):
+        self.conn.close()
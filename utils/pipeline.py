@@ -0,0 +1,215 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.tracing import DEFAULT_METRICS_DIR
+
+# Marca o fim da fila entre dois estágios
+_END = object()
+
+
+class Stage:
+    """
+    Estágio do pipeline: `func(item)` é executada em uma thread por até
+    `concurrency` itens ao mesmo tempo. O retorno segue para o próximo estágio
+    (None descarta o item). Estágios que usam o mesmo `resource` (por exemplo,
+    o lock do navegador) nunca executam ao mesmo tempo.
+    """
+
+    def __init__(self, name, func, concurrency=1, resource=None):
+        self.name = name
+        self.func = func
+        self.concurrency = max(1, concurrency)
+        self.resource = resource
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.idle = 0.0
+
+    def call(self, item):
+        if self.resource is None:
+            return self.func(item)
+        with self.resource:
+            return self.func(item)
+
+    def stats(self):
+        return {
+            "concorrencia": self.concurrency,
+            "processados": self.processed,
+            "descartados": self.dropped,
+            "erros": self.errors,
+            "ocupado_s": round(self.busy, 3),
+            "ocioso_s": round(self.idle, 3),
+        }
+
+
+class StagedPipeline:
+    """
+    Pipeline produtor/consumidor em asyncio: a fonte (um iterável síncrono) e
+    cada estágio são ligados por filas limitadas a `queue_size` itens, de modo
+    que um estágio lento segura os anteriores (backpressure) em vez de acumular
+    itens em memória. A profundidade das filas é amostrada a cada
+    `sample_interval` segundos para indicar qual estágio é o gargalo.
+    """
+
+    def __init__(self, name, stages, queue_size=None, sample_interval=0.5):
+        self.name = name
+        self.stages = stages
+        self.queue_size = int(queue_size or os.getenv("PJE_PIPELINE_QUEUE", "8"))
+        self.sample_interval = sample_interval
+        self.depths = {stage.name: [] for stage in stages}
+        self.produced = 0
+        self.source_busy = 0.0
+        self.source_name = "fonte"
+        self.elapsed = 0.0
+
+    def run(self, source, source_resource=None, source_name="listar"):
+        """
+        Consome `source` até o fim passando cada item pelos estágios e retorna as
+        estatísticas. `source_resource` é o lock mantido a cada item lido da fonte.
+        """
+        self.source_name = source_name
+        start = time.perf_counter()
+        asyncio.run(self._run(iter(source), source_resource or threading.Lock()))
+        self.elapsed = time.perf_counter() - start
+        logging.info(self.summary())
+        return self.stats()
+
+    async def _run(self, iterator, source_resource):
+        # Uma thread por trabalhador de estágio, mais a da fonte
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=sum(stage.concurrency for stage in self.stages) + 1))
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        workers = []
+        for position, stage in enumerate(self.stages):
+            output = queues[position + 1] if position + 1 < len(queues) else None
+            workers.append([asyncio.create_task(self._work(stage, queues[position], output))
+                            for _ in range(stage.concurrency)])
+        sampler = asyncio.create_task(self._sample(queues))
+
+        def next_item():
+            with source_resource:
+                started = time.perf_counter()
+                try:
+                    return next(iterator, _END)
+                finally:
+                    self.source_busy += time.perf_counter() - started
+
+        try:
+            while True:
+                item = await asyncio.to_thread(next_item)
+                if item is _END:
+                    break
+                self.produced += 1
+                await queues[0].put(item)
+        finally:
+            # Encerra os estágios em ordem, esvaziando cada fila antes de fechar a seguinte
+            for position, stage_workers in enumerate(workers):
+                for _ in stage_workers:
+                    await queues[position].put(_END)
+                await asyncio.gather(*stage_workers)
+            sampler.cancel()
+
+    async def _work(self, stage, queue, output):
+        while True:
+            waited = time.perf_counter()
+            item = await queue.get()
+            stage.idle += time.perf_counter() - waited
+            if item is _END:
+                return
+            started = time.perf_counter()
+            try:
+                result = await asyncio.to_thread(stage.call, item)
+            except Exception as e:
+                stage.errors += 1
+                logging.error(f"Estágio '{stage.name}' falhou: {e}")
+                result = None
+            finally:
+                stage.busy += time.perf_counter() - started
+            stage.processed += 1
+            if output is None:
+                continue
+            if result is None:
+                stage.dropped += 1
+            else:
+                await output.put(result)
+
+    async def _sample(self, queues):
+        while True:
+            for stage, queue in zip(self.stages, queues):
+                self.depths[stage.name].append(queue.qsize())
+            await asyncio.sleep(self.sample_interval)
+
+    def stats(self):
+        stages = {}
+        for stage in self.stages:
+            samples = self.depths[stage.name] or [0]
+            stages[stage.name] = {
+                **stage.stats(),
+                "fila_media": round(sum(samples) / len(samples), 2),
+                "fila_max": max(samples),
+            }
+        return {"pipeline": self.name, "itens": self.produced, "segundos": round(self.elapsed, 3),
+                "capacidade_fila": self.queue_size,
+                "fonte": {"nome": self.source_name, "ocupado_s": round(self.source_busy, 3)},
+                "estagios": stages}
+
+    def bottleneck(self):
+        """
+        Estágio (ou a fonte) com maior tempo ocupado por trabalhador: é ele que limita a vazão.
+        """
+        loads = {stage.name: stage.busy / stage.concurrency for stage in self.stages}
+        loads[self.source_name] = self.source_busy
+        return max(loads, key=loads.get)
+
+    def summary(self):
+        stats = self.stats()
+        lines = [f"Pipeline '{self.name}': {self.produced} itens em {self.elapsed:.1f}s "
+                 f"(filas de {self.queue_size}, gargalo: {self.bottleneck()}).",
+                 f"  {'estágio':<16} {'conc':>5} {'n':>6} {'erros':>6} {'ocupado (s)':>12} "
+                 f"{'ocioso (s)':>11} {'fila méd':>9} {'fila máx':>9}",
+                 f"  {self.source_name:<16} {1:>5} {self.produced:>6} {'-':>6} {self.source_busy:>12.1f}"]
+        for name, stage in stats["estagios"].items():
+            lines.append(f"  {name:<16} {stage['concorrencia']:>5} {stage['processados']:>6} {stage['erros']:>6} "
+                         f"{stage['ocupado_s']:>12.1f} {stage['ocioso_s']:>11.1f} "
+                         f"{stage['fila_media']:>9.2f} {stage['fila_max']:>9}")
+        return "\n".join(lines)
+
+    def write_metrics(self, directory=None):
+        """
+        Grava `<pipeline>.pipeline.json` e `<pipeline>.pipeline.prom` com as
+        estatísticas por estágio e a profundidade das filas.
+        """
+        directory = directory or os.getenv("PJE_METRICS_DIR", DEFAULT_METRICS_DIR)
+        os.makedirs(directory, exist_ok=True)
+        stats = self.stats()
+        json_path = os.path.join(directory, f"{self.name}.pipeline.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=4)
+
+        lines = [
+            "# HELP pje_pipeline_queue_depth Profundidade da fila de entrada do estágio.",
+            "# TYPE pje_pipeline_queue_depth gauge",
+        ]
+        for name, stage in stats["estagios"].items():
+            labels = f'pipeline="{self.name}",stage="{name}"'
+            lines.append(f'pje_pipeline_queue_depth{{{labels},stat="mean"}} {stage["fila_media"]}')
+            lines.append(f'pje_pipeline_queue_depth{{{labels},stat="max"}} {stage["fila_max"]}')
+        lines.append("# HELP pje_pipeline_stage_busy_seconds Tempo de trabalho acumulado do estágio.")
+        lines.append("# TYPE pje_pipeline_stage_busy_seconds counter")
+        for name, stage in stats["estagios"].items():
+            lines.append(f'pje_pipeline_stage_busy_seconds{{pipeline="{self.name}",stage="{name}"}} {stage["ocupado_s"]}')
+        prom_path = os.path.join(directory, f"{self.name}.pipeline.prom")
+        with open(prom_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return json_path, prom_path
+
+
+def pipeline_enabled():
+    # Desligado por padrão até o ganho sobre o laço sequencial ser medido
+    return os.getenv("PJE_PIPELINE", "0") == "1"
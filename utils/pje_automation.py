@@ -1,13 +1,19 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from dotenv import load_dotenv
+
+from utils.driver_factory import create_driver
+from utils.session_store import restore_or_login
+from utils.tracing import traced
 from typing import TypedDict,NotRequired,Any, Dict
 
 import os
 import json
 
+load_dotenv()
+PJE_BASE_URL = os.getenv("PJE_BASE_URL", "https://pje.tjba.jus.br/pje").rstrip("/")
+
 
 # Tipos para o config.json
 class OptionSearch(TypedDict):
@@ -26,21 +32,28 @@ class OptionSearch(TypedDict):
 class LoginInfo(TypedDict):
     oc: str
 
+class TagJob(TypedDict):
+    etiqueta: str
+    tipoDocumento: NotRequired[str]
+    saida: NotRequired[str]
+
 class ConfigData(TypedDict):
     optionSearch: OptionSearch
     LoginInfo: LoginInfo
+    jobsEtiquetas: NotRequired[Dict[str, list[TagJob]]]
 
 
 class PjeConsultaAutomator:
     load_dotenv()
     user, password = os.getenv("USER"), os.getenv("PASSWORD")
 
-    def __init__(self):
-        self.driver = webdriver.Chrome()
-        self.wait = WebDriverWait(self.driver, 20)
+    def __init__(self, wait_timeout=20, **driver_options):
+        self.driver = create_driver(**driver_options)
+        self.wait = WebDriverWait(self.driver, wait_timeout)
 
+    @traced("login")
     def login(self, user, password):
-        login_url = 'https://pje.tjba.jus.br/pje/login.seam'
+        login_url = f'{PJE_BASE_URL}/login.seam'
         self.driver.get(login_url)
         self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, 'ssoFrame')))
         self.wait.until(EC.presence_of_element_located((By.ID, 'username'))).send_keys(user)
@@ -48,10 +61,18 @@ class PjeConsultaAutomator:
         self.wait.until(EC.presence_of_element_located((By.ID, 'kc-login'))).click()
         self.driver.switch_to.default_content()
 
+    def ensure_session(self, user, password, profile):
+        """
+        Reaproveita a sessão salva do usuário/perfil ou faz login e seleciona o perfil.
+        """
+        return restore_or_login(self.driver, user, password, profile, f"{PJE_BASE_URL}/",
+                                self.login, self.select_profile)
+
     def skip_token(self):
         self.wait.until(EC.element_to_be_clickable(
             (By.XPATH, "//a[contains(text(),'Prosseguir sem o Token')]"))).click()
 
+    @traced("select_profile")
     def select_profile(self, profile):
         self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'dropdown-toggle'))).click()
         btn = self.wait.until(EC.element_to_be_clickable(
@@ -64,12 +85,14 @@ class PjeConsultaAutomator:
         with open(f"./docs/{filename}.json", "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
 
-    def loadConfig(self) -> ConfigData:
+    @staticmethod
+    def loadConfig() -> ConfigData:
         with open('config.json', 'r', encoding='utf-8') as f:
             config: ConfigData = json.load(f)
         return config
     
-    def update_config(self, updates: Dict[str, Any], file: str = "config.json") -> None:
+    @staticmethod
+    def update_config(updates: Dict[str, Any], file: str = "config.json") -> None:
         with open(file, "r", encoding="utf-8") as f:
             config = json.load(f)
 
@@ -0,0 +1,101 @@
+import logging
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# Dispara no datascroller do RichFaces o mesmo evento dos botões de página, para qualquer página.
+# arguments[0]: seletor CSS do contêiner da paginação ("" para o documento); arguments[1]: página
+DATASCROLLER_JUMP_SCRIPT = """
+var root = arguments[0] ? document.querySelector(arguments[0]) : document;
+var anchor = root ? root.querySelector("td[onclick*='rich:datascroller:onscroll']") : null;
+if (!anchor || typeof Event === 'undefined' || !Event.fire) { return false; }
+Event.fire(anchor, 'rich:datascroller:onscroll', {'page': String(arguments[1])});
+return true;
+"""
+
+CURRENT_PAGE_SCRIPT = """
+var root = arguments[0] ? document.querySelector(arguments[0]) : document;
+var active = root ? root.querySelector(".rich-datascr-act") : null;
+return active ? parseInt(active.innerText, 10) : null;
+"""
+
+# Clica no link da página (arguments[1]) se ele estiver visível no datascroller,
+# ou no botão de passo (arguments[2]: 'next' ou 'previous') em direção a ela
+DATASCROLLER_CLICK_SCRIPT = """
+var root = arguments[0] ? document.querySelector(arguments[0]) : document;
+if (!root) { return false; }
+var page = String(arguments[1]), step = arguments[2];
+var cells = root.querySelectorAll("td[onclick*='rich:datascroller:onscroll']");
+var target = null, stepCell = null;
+for (var i = 0; i < cells.length; i++) {
+    var onclick = cells[i].getAttribute('onclick') || '';
+    if ((cells[i].innerText || '').trim() === page || onclick.indexOf("'page': '" + page + "'") >= 0) {
+        target = cells[i];
+        break;
+    }
+    if (onclick.indexOf("'" + step + "'") >= 0) {
+        stepCell = cells[i];
+    }
+}
+target = target || stepCell;
+if (!target) { return false; }
+target.scrollIntoView(true);
+target.click();
+return true;
+"""
+
+# Salto direto desativado no processo depois da primeira falha (versão do RichFaces sem o evento)
+_jump_supported = True
+
+
+def datascroller_current_page(driver, scope=""):
+    return driver.execute_script(CURRENT_PAGE_SCRIPT, scope) or 1
+
+
+def _wait_page_change(driver, body, body_locator, timeout):
+    WebDriverWait(driver, timeout).until(EC.staleness_of(body))
+    WebDriverWait(driver, timeout).until(lambda d: d.find_elements(*body_locator))
+
+
+def datascroller_go_to_page(driver, page, body_locator, scope="", ready=None, timeout=30, max_steps=None):
+    """
+    Vai para a página `page` da tabela paginada pelo datascroller e espera o
+    corpo da tabela (`body_locator`) ser substituído. Tenta primeiro o salto
+    direto pelo evento do datascroller; se ele não levar à página, passa a
+    clicar nos links do datascroller (o número da página ou próxima/anterior),
+    como um usuário faria. `ready` é a condição esperada antes de cada troca
+    (ex.: o modal de carregamento fechado).
+    """
+    global _jump_supported
+    if datascroller_current_page(driver, scope) == page:
+        return
+    if ready:
+        WebDriverWait(driver, timeout).until(ready)
+    if _jump_supported:
+        body = driver.find_element(*body_locator)
+        try:
+            if not driver.execute_script(DATASCROLLER_JUMP_SCRIPT, scope, page):
+                raise TimeoutException("evento do datascroller indisponível")
+            _wait_page_change(driver, body, body_locator, timeout)
+            landed = datascroller_current_page(driver, scope)
+            if landed == page:
+                return
+            reason = f"a tabela foi para a página {landed}"
+        except TimeoutException as e:
+            reason = getattr(e, "msg", None) or "a tabela não foi atualizada"
+        _jump_supported = False
+        logging.warning(f"Salto direto para a página {page} não funcionou ({reason}); "
+                        f"a paginação seguirá pelos links do datascroller.")
+    for _ in range(max_steps or max(page, 1) * 2 + 10):
+        current = datascroller_current_page(driver, scope)
+        if current == page:
+            return
+        if ready:
+            WebDriverWait(driver, timeout).until(ready)
+        body = driver.find_element(*body_locator)
+        if not driver.execute_script(DATASCROLLER_CLICK_SCRIPT, scope, page, "next" if page > current else "previous"):
+            raise RuntimeError(f"Paginação da tabela não encontrada (página {current}, destino {page}).")
+        _wait_page_change(driver, body, body_locator, timeout)
+    if datascroller_current_page(driver, scope) != page:
+        raise TimeoutException(f"A página {page} da tabela não foi alcançada pelos links do datascroller.")
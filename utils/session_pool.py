@@ -0,0 +1,121 @@
+import logging
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import util
+
+from utils.pje_automation import PjeConsultaAutomator
+from utils.tracing import tracer
+
+# Sessão autenticada do processo trabalhador (cada processo tem a sua)
+_session = None
+
+
+def _init_session(factory, user, password, profile, setup):
+    """
+    Inicializa a sessão do processo trabalhador: abre o navegador, reaproveita
+    a sessão salva (ou faz login e seleciona o perfil) e executa a preparação
+    opcional (ex.: abrir a etiqueta).
+    """
+    global _session
+    _session = factory()
+    util.Finalize(None, _session.close, exitpriority=10)
+    _session.ensure_session(user, password, profile)
+    if setup:
+        setup(_session)
+    logging.info("Sessão do trabalhador autenticada e pronta.")
+
+
+def _run_chunk(func, chunk):
+    results = []
+    for item in chunk:
+        try:
+            results.append(func(_session, item))
+        except Exception as e:
+            logging.error(f"Falha ao processar o item {item!r} na sessão do trabalhador: {e}")
+            results.append(None)
+    return results, tracer.drain()
+
+
+def _run_once(func):
+    return func(_session), tracer.drain()
+
+
+class PjeSessionPool:
+    """
+    Pool de navegadores autenticados no PJe.
+
+    Cada sessão roda em um processo próprio, de modo que os scripts baseados em
+    variáveis globais (`driver`/`wait`) também podem ser paralelizados. As funções
+    e a preparação passadas ao pool precisam ser definidas no nível do módulo
+    (ou via functools.partial) para poderem ser enviadas aos processos.
+    """
+
+    def __init__(self, size, user, password, profile, factory=PjeConsultaAutomator, setup=None):
+        self.size = size
+        self.executor = ProcessPoolExecutor(
+            max_workers=size,
+            initializer=_init_session,
+            initargs=(factory, user, password, profile, setup),
+        )
+        logging.info(f"Pool de sessões iniciado com {size} navegadores.")
+
+    def run(self, func):
+        """
+        Executa `func(session)` em uma das sessões e retorna o resultado.
+        """
+        result, spans = self.executor.submit(_run_once, func).result()
+        tracer.merge(spans)
+        return result
+
+    def submit(self, func, item):
+        """
+        Agenda `func(session, item)` em uma das sessões e retorna um Future com o
+        resultado (None se o item falhar), para filas de trabalho dinâmicas.
+        """
+        result = Future()
+
+        def done(future):
+            try:
+                results, spans = future.result()
+                tracer.merge(spans)
+                result.set_result(results[0])
+            except Exception as e:
+                result.set_exception(e)
+
+        self.executor.submit(_run_chunk, func, [item]).add_done_callback(done)
+        return result
+
+    def imap(self, func, items, chunk_size=None):
+        """
+        Distribui `func(session, item)` entre as sessões e produz os resultados na
+        mesma ordem de `items`, à medida que ficam prontos. Itens que falharem
+        produzem None. Os spans registrados nos trabalhadores são somados ao
+        rastreador deste processo.
+        """
+        items = list(items)
+        if not items:
+            return
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(items) / (self.size * 4)))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        logging.info(f"Distribuindo {len(items)} itens em {len(chunks)} lotes entre {self.size} sessões.")
+        for partial, spans in self.executor.map(_run_chunk, repeat(func), chunks):
+            tracer.merge(spans)
+            yield from partial
+
+    def map(self, func, items, chunk_size=None):
+        """
+        Como `imap`, mas retorna a lista completa de resultados.
+        """
+        return list(self.imap(func, items, chunk_size))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        logging.info("Pool de sessões encerrado.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
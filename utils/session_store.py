@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import hashlib
+import logging
+
+import requests
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+DEFAULT_SESSION_DIR = ".session"
+
+
+class SessionStore:
+    """
+    Guarda os cookies de uma sessão autenticada (usuário + perfil) para que a
+    próxima execução pule o login no SSO e a seleção de perfil.
+    """
+
+    def __init__(self, user, profile, directory=None, max_age_hours=None):
+        self.profile = profile or ""
+        self.directory = directory or os.getenv("PJE_SESSION_DIR", DEFAULT_SESSION_DIR)
+        self.max_age = float(max_age_hours or os.getenv("PJE_SESSION_MAX_AGE_HOURS", "8")) * 3600
+        key = hashlib.sha1(f"{user}|{self.profile}".encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(self.directory, f"{key}.json")
+
+    def save(self, driver):
+        os.makedirs(self.directory, exist_ok=True)
+        data = {"profile": self.profile, "saved_at": time.time(), "cookies": driver.get_cookies()}
+        # Escrita atômica: as sessões de um pool podem salvar e ler o mesmo arquivo ao mesmo tempo
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        logging.info(f"Sessão autenticada salva em {self.path}.")
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("profile") != self.profile or time.time() - data.get("saved_at", 0) > self.max_age:
+            logging.info("Sessão salva expirada ou de outro perfil.")
+            return None
+        return data["cookies"]
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def is_valid(cookies, home_url):
+        """
+        Valida os cookies com uma requisição HTTP simples, sem usar o navegador.
+        """
+        jar = requests.cookies.RequestsCookieJar()
+        for cookie in cookies:
+            jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        try:
+            response = requests.get(home_url, cookies=jar, timeout=15)
+        except requests.RequestException as e:
+            logging.warning(f"Não foi possível validar a sessão salva: {e}")
+            return False
+        return response.ok and "login.seam" not in response.url and "ssoFrame" not in response.text
+
+    def restore(self, driver, home_url):
+        """
+        Injeta os cookies salvos no navegador (via DevTools, sem navegar antes) e
+        abre a página inicial. Retorna False se não houver sessão válida.
+        """
+        cookies = self.load()
+        if not cookies or not self.is_valid(cookies, home_url):
+            return False
+        for cookie in cookies:
+            params = {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie.get("domain"),
+                "path": cookie.get("path", "/"),
+                "secure": cookie.get("secure", False),
+                "httpOnly": cookie.get("httpOnly", False),
+            }
+            if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                params["sameSite"] = cookie["sameSite"]
+            if "expiry" in cookie:
+                params["expires"] = cookie["expiry"]
+            driver.execute_cdp_cmd("Network.setCookie", params)
+        driver.get(home_url)
+        if "login.seam" in driver.current_url:
+            return False
+        logging.info("Sessão salva restaurada; login e seleção de perfil dispensados.")
+        return True
+
+
+def restore_or_login(driver, user, password, profile, home_url, login, select_profile=None):
+    """
+    Restaura a sessão salva para o usuário/perfil ou, se ela tiver expirado,
+    executa `login` (e `select_profile`) e salva a nova sessão. Retorna True
+    quando foi preciso fazer o login completo.
+    """
+    store = SessionStore(user, profile)
+    if store.restore(driver, home_url):
+        return False
+    store.discard()
+    login(user, password)
+    if select_profile and profile:
+        select_profile(profile)
+    try:
+        WebDriverWait(driver, 30).until(lambda d: "login.seam" not in d.current_url)
+        store.save(driver)
+    except TimeoutException:
+        logging.warning("Login não confirmado; a sessão não foi salva.")
+    return True
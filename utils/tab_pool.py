@@ -0,0 +1,164 @@
+import os
+import logging
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, NoSuchWindowException, WebDriverException
+
+# Substitui window.open (uma única vez) para registrar a URL que o clique abriria
+# sem criar a janela. Links com href real são devolvidos sem clicar. O original
+# fica em window.__pjeOriginalOpen, reaproveitado se uma captura anterior não o
+# restaurou; chamadas sem URL (window.open('') seguido de escrita na janela)
+# seguem para o window.open real e a janela nova é tratada por capture_click_url.
+CAPTURE_CLICK_SCRIPT = """
+var element = arguments[0];
+var anchor = element.closest ? element.closest('a') : null;
+var href = anchor ? anchor.getAttribute('href') : null;
+if (href && href !== '#' && href.indexOf('javascript') !== 0 && anchor.target) {
+    return new URL(href, window.location.href).href;
+}
+window.__pjeOpenedUrl = null;
+if (!window.__pjeOriginalOpen) {
+    window.__pjeOriginalOpen = window.open;
+}
+var original = window.__pjeOriginalOpen;
+window.open = function(url) {
+    window.open = original;
+    window.__pjeOriginalOpen = null;
+    if (!url) {
+        return original.apply(window, arguments);
+    }
+    window.__pjeOpenedUrl = new URL(url, window.location.href).href;
+    return {closed: false, focus: function() {}, blur: function() {}, close: function() {}, location: {}, document: {}};
+};
+element.scrollIntoView(true);
+element.click();
+return null;
+"""
+
+CAPTURED_URL_SCRIPT = "return window.__pjeOpenedUrl || null;"
+
+# Desfaz a substituição quando o clique não chamou window.open
+RESTORE_OPEN_SCRIPT = """
+if (window.__pjeOriginalOpen) {
+    window.open = window.__pjeOriginalOpen;
+    window.__pjeOriginalOpen = null;
+}
+"""
+
+
+def capture_click_url(driver, element, timeout=10):
+    """
+    Clica em `element` interceptando a abertura de janela e retorna a URL que
+    seria aberta, ou None. Se mesmo assim uma janela nova surgir, ela é fechada
+    e a URL dela é usada. Sem abertura em `timeout` segundos, o window.open
+    original é restaurado e o retorno é None.
+    """
+    handles_before = set(driver.window_handles)
+    current = driver.current_window_handle
+    url = driver.execute_script(CAPTURE_CLICK_SCRIPT, element)
+    if url:
+        return url
+    try:
+        WebDriverWait(driver, timeout, 0.1).until(
+            lambda d: d.execute_script(CAPTURED_URL_SCRIPT) or len(d.window_handles) > len(handles_before)
+        )
+    except TimeoutException:
+        driver.execute_script(RESTORE_OPEN_SCRIPT)
+        return None
+    url = driver.execute_script(CAPTURED_URL_SCRIPT)
+    new_handles = set(driver.window_handles) - handles_before
+    if new_handles:
+        driver.switch_to.window(new_handles.pop())
+        try:
+            WebDriverWait(driver, timeout, 0.1).until(lambda d: d.current_url != "about:blank")
+            url = url or driver.current_url
+        except TimeoutException:
+            # Janela aberta sem URL e preenchida por script: não há o que reaproveitar
+            pass
+        driver.close()
+        driver.switch_to.window(current)
+    return url or None
+
+
+class TabPool:
+    """
+    Conjunto fixo de abas de trabalho reaproveitadas: em vez de abrir e fechar
+    uma janela por processo e por parte, cada nível (processo, parte) tem a sua
+    aba, que apenas navega até a página de destino. Uma aba é fechada e recriada
+    após `max_uses` navegações para conter o crescimento de memória do Chrome.
+    """
+
+    def __init__(self, driver, size=2, max_uses=None):
+        self.driver = driver
+        self.home = driver.current_window_handle
+        self.size = size
+        self.max_uses = int(max_uses or os.getenv("PJE_TAB_RECYCLE", "300"))
+        self.tabs = [None] * size
+        self.uses = [0] * size
+        self.created = 0
+        self.navigations = 0
+
+    def _create_tab(self, slot):
+        self.driver.switch_to.new_window("tab")
+        self.tabs[slot] = self.driver.current_window_handle
+        self.uses[slot] = 0
+        self.created += 1
+        logging.info(f"Aba de trabalho {slot} criada: {self.tabs[slot]}")
+
+    def _close_tab(self, slot):
+        handle, self.tabs[slot] = self.tabs[slot], None
+        if handle is None:
+            return
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except WebDriverException:
+            pass
+
+    def open(self, url, slot=0):
+        """
+        Navega a aba de trabalho `slot` até `url` e alterna para ela. Retorna o handle da aba.
+        """
+        if self.tabs[slot] is not None and self.uses[slot] >= self.max_uses:
+            self._close_tab(slot)
+        if self.tabs[slot] is None:
+            self._create_tab(slot)
+        else:
+            try:
+                self.driver.switch_to.window(self.tabs[slot])
+            except NoSuchWindowException:
+                self._create_tab(slot)
+        self.driver.get(url)
+        self.uses[slot] += 1
+        self.navigations += 1
+        return self.tabs[slot]
+
+    def switch_to(self, slot):
+        self.driver.switch_to.window(self.tabs[slot])
+
+    def release(self):
+        """
+        Volta para a janela principal; as abas de trabalho permanecem abertas.
+        """
+        self.driver.switch_to.window(self.home)
+
+    def discard(self, slot=0):
+        """
+        Fecha a aba `slot` (por exemplo, após um erro que a deixou em estado
+        desconhecido) e volta para a janela principal. Ela é recriada no próximo uso.
+        """
+        self._close_tab(slot)
+        self.release()
+
+    def close(self):
+        for slot in range(self.size):
+            self._close_tab(slot)
+        self.release()
+
+    def summary(self):
+        return (f"Abas de trabalho: {self.navigations} navegações com {self.created} aba(s) criada(s) "
+                f"({self.navigations - self.created} janelas poupadas).")
+
+
+def tab_reuse_enabled():
+    return os.getenv("PJE_REUSE_TABS", "1") != "0"
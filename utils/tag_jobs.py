@@ -0,0 +1,79 @@
+import os
+import json
+import logging
+import threading
+
+from utils.download_area import process_key
+
+# Chave do config.json com os jobs de cada script: {"<script>": [{"etiqueta": ..., ...}]}
+CONFIG_KEY = "jobsEtiquetas"
+
+
+def load_tag_jobs(script, default, config_file="config.json"):
+    """
+    Lista de jobs do lote (etiqueta, tipo de documento, saída) do script: o
+    arquivo JSON indicado em PJE_TAG_JOBS (uma lista, ou um objeto por script)
+    ou a chave `jobsEtiquetas` do config.json. Sem nenhum deles, `default`.
+    Os campos ausentes de cada job são completados com os de `default[0]`.
+    """
+    path = os.getenv("PJE_TAG_JOBS")
+    spec = None
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    elif os.path.exists(config_file):
+        with open(config_file, "r", encoding="utf-8") as f:
+            spec = json.load(f).get(CONFIG_KEY)
+    if isinstance(spec, dict):
+        spec = spec.get(script)
+    if not spec:
+        return [dict(job) for job in default]
+    jobs = []
+    for job in spec:
+        if not job.get("etiqueta"):
+            raise ValueError(f"Job sem etiqueta em {path or config_file}: {job!r}")
+        defaults = {name: value for name, value in default[0].items() if name not in ("etiqueta", "saida")}
+        jobs.append({**defaults, **job})
+    logging.info(f"Lote de {len(jobs)} etiqueta(s): {', '.join(job['etiqueta'] for job in jobs)}")
+    return jobs
+
+
+class BatchDedup:
+    """
+    Processos já tratados no lote, por número (e variante, ex.: o tipo de
+    documento), para que um processo presente em várias etiquetas seja buscado
+    uma única vez. O resultado guardado é reaproveitado nas saídas das demais
+    etiquetas.
+    """
+
+    def __init__(self, keys=()):
+        self.results = {key: None for key in keys}
+        self.reused = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(process_number, variant=None):
+        key = process_key(process_number)
+        return f"{key}:{variant}" if variant else key
+
+    def seen(self, process_number, variant=None):
+        return bool(process_number) and self.key(process_number, variant) in self.results
+
+    def result(self, process_number, variant=None):
+        with self.lock:
+            self.reused += 1
+            return self.results.get(self.key(process_number, variant))
+
+    def record(self, process_number, result=None, variant=None):
+        if process_number:
+            with self.lock:
+                self.results[self.key(process_number, variant)] = result
+
+    def keys(self):
+        """
+        Chaves conhecidas, para enviar aos trabalhadores do pool de sessões.
+        """
+        return frozenset(self.results)
+
+    def summary(self):
+        return f"Lote: {len(self.results)} processos distintos, {self.reused} reaproveitados entre etiquetas."
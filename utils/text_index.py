@@ -0,0 +1,180 @@
+import os
+import time
+import sqlite3
+import logging
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.document_store import DEFAULT_STORE_PATH
+from utils.download_area import process_key
+
+TEXT_INDEX_FILENAME = "texto.sqlite"
+
+
+def extract_pdf_text(path):
+    """
+    Extrai o texto de todas as páginas do PDF. Executada nos processos do pool,
+    por isso devolve o erro em vez de levantá-lo. O pypdf só é importado aqui,
+    para que os scripts que importam este módulo não dependam dele.
+    """
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(path)
+        pages = [page.extract_text() or "" for page in reader.pages]
+        return {"caminho": path, "texto": "\n".join(pages), "paginas": len(pages), "erro": None}
+    except Exception as e:
+        return {"caminho": path, "texto": "", "paginas": 0, "erro": f"{type(e).__name__}: {e}"}
+
+
+class TextIndex:
+    """
+    Índice de texto completo (SQLite FTS5) dos documentos do acervo, por número
+    do processo e tipo de documento. A extração do texto dos PDFs roda em um
+    pool de processos; cada versão (sha256) do documento de um processo é
+    indexada uma única vez, então novas execuções só processam os arquivos que
+    chegaram depois.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("PJE_TEXT_INDEX", os.path.join(
+            os.getenv("PJE_DOC_STORE", DEFAULT_STORE_PATH), TEXT_INDEX_FILENAME))
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS arquivos (
+                    processo TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    caminho TEXT NOT NULL,
+                    paginas INTEGER NOT NULL,
+                    erro TEXT,
+                    indexado_em TEXT NOT NULL,
+                    texto_id INTEGER,
+                    PRIMARY KEY (processo, tipo)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS textos USING fts5(
+                    processo UNINDEXED,
+                    tipo UNINDEXED,
+                    sha256 UNINDEXED,
+                    conteudo,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                );
+                """
+            )
+        self._migrate()
+
+    def _migrate(self):
+        # Índices criados antes da coluna texto_id: liga cada arquivo ao rowid do texto numa única leitura
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(arquivos)")}
+        if "texto_id" in columns:
+            return
+        with self.conn:
+            self.conn.execute("ALTER TABLE arquivos ADD COLUMN texto_id INTEGER")
+            self.conn.executemany(
+                "UPDATE arquivos SET texto_id = ? WHERE processo = ? AND tipo = ?",
+                self.conn.execute("SELECT rowid, processo, tipo FROM textos").fetchall(),
+            )
+
+    def indexed(self):
+        """
+        Versão indexada de cada documento: {(processo, tipo): sha256}.
+        """
+        return {(row[0], row[1]): row[2] for row in self.conn.execute("SELECT processo, tipo, sha256 FROM arquivos")}
+
+    def add(self, documents, workers=None, batch_size=50):
+        """
+        Indexa `documents` ((processo, tipo, caminho, sha256)) ainda não indexados,
+        extraindo o texto com `workers` processos. Retorna quantos foram indexados.
+        """
+        known = self.indexed()
+        pending = {}
+        for process_number, doc_type, path, sha256 in documents:
+            if known.get((process_number, doc_type)) != sha256 and path.lower().endswith(".pdf"):
+                pending.setdefault(path, []).append((process_number, doc_type, sha256))
+        if not pending:
+            logging.info("Índice de texto: nenhum documento novo.")
+            return 0
+        workers = workers or int(os.getenv("PJE_TEXT_WORKERS", str(os.cpu_count() or 2)))
+        start = time.perf_counter()
+        done, failed, rows = 0, 0, []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(pending) // (workers * 4))
+            for result in executor.map(extract_pdf_text, list(pending), chunksize=chunksize):
+                if result["erro"]:
+                    failed += 1
+                    logging.warning(f"Texto de {result['caminho']} não extraído: {result['erro']}")
+                for process_number, doc_type, sha256 in pending[result["caminho"]]:
+                    rows.append((process_number, doc_type, sha256, result))
+                if len(rows) >= batch_size:
+                    done += self._insert(rows)
+                    rows = []
+        done += self._insert(rows)
+        elapsed = time.perf_counter() - start
+        logging.info(f"Índice de texto: {done} documentos indexados em {elapsed:.1f}s com {workers} processos "
+                     f"({done / max(elapsed, 1e-9):.1f} doc/s, {failed} sem texto extraído).")
+        return done
+
+    def _insert(self, rows):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            for process_number, doc_type, sha256, result in rows:
+                # Versão anterior do mesmo documento, removida pelo rowid (as colunas UNINDEXED não têm índice)
+                previous = self.conn.execute("SELECT texto_id FROM arquivos WHERE processo = ? AND tipo = ?",
+                                             (process_number, doc_type)).fetchone()
+                if previous and previous[0] is not None:
+                    self.conn.execute("DELETE FROM textos WHERE rowid = ?", (previous[0],))
+                cursor = self.conn.execute("INSERT INTO textos (processo, tipo, sha256, conteudo) VALUES (?, ?, ?, ?)",
+                                           (process_number, doc_type, sha256, result["texto"]))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO arquivos (processo, tipo, sha256, caminho, paginas, erro, indexado_em, texto_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (process_number, doc_type, sha256, result["caminho"], result["paginas"], result["erro"], now,
+                     cursor.lastrowid),
+                )
+        return len(rows)
+
+    def add_store(self, store, tag=None, workers=None):
+        """
+        Indexa os documentos do acervo (de uma etiqueta, se informada) que ainda não estão no índice.
+        """
+        return self.add(store.documents(tag), workers)
+
+    def search(self, query, limit=20, doc_type=None, process_number=None):
+        """
+        Busca `query` na sintaxe do FTS5 (termos, "frase exata", OR, NOT, prefixo*)
+        e retorna os documentos mais relevantes com um trecho do texto encontrado.
+        Uma consulta com sintaxe inválida levanta sqlite3.OperationalError.
+        """
+        sql = ("SELECT t.processo, t.tipo, a.caminho, snippet(textos, 3, '[', ']', ' ... ', 16), bm25(textos) "
+               "FROM textos t JOIN arquivos a ON a.texto_id = t.rowid WHERE textos MATCH ?")
+        params = [query]
+        if doc_type:
+            sql += " AND a.tipo = ?"
+            params.append(doc_type)
+        if process_number:
+            sql += " AND a.processo = ?"
+            params.append(process_key(process_number))
+        sql += " ORDER BY bm25(textos) LIMIT ?"
+        params.append(limit)
+        return [
+            {"processo": row[0], "tipo": row[1], "arquivo": row[2], "trecho": row[3], "relevancia": -row[4]}
+            for row in self.conn.execute(sql, params)
+        ]
+
+    def stats(self):
+        documents, pages = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(paginas), 0) FROM arquivos").fetchone()
+        return {"documentos": documents, "paginas": pages}
+
+    def optimize(self):
+        with self.conn:
+            self.conn.execute("INSERT INTO textos (textos) VALUES ('optimize')")
+
+    def close(self):
+        self.conn.close()
+
+
+def text_index_enabled():
+    return os.getenv("PJE_TEXT_INDEX_ENABLED", "1") != "0"
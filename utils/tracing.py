@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+from collections import deque
+from functools import wraps
+from contextlib import contextmanager
+
+DEFAULT_METRICS_DIR = ".metrics"
+# Durações guardadas por etapa para os percentis (amostragem de reservatório)
+STEP_SAMPLE_SIZE = 4096
+
+
+def percentile(sorted_values, fraction):
+    """
+    Percentil pelo método do posto mais próximo sobre uma lista já ordenada.
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Tracer:
+    """
+    Registra um span (etapa, processo, resultado e duração) para cada chamada
+    instrumentada com `traced` e gera, ao final da execução, o histograma de
+    latência por etapa e um arquivo de métricas. Os spans abertos e o processo
+    atual são mantidos por thread, para que estágios concorrentes não se misturem.
+
+    A memória não cresce com a execução: cada etapa guarda contagem, erros,
+    total, máximo e uma amostra de até STEP_SAMPLE_SIZE durações para os
+    percentis, e só os últimos `max_spans` spans (PJE_TRACE_SPANS) são mantidos
+    por inteiro para o arquivo de métricas.
+    """
+
+    def __init__(self, max_spans=None):
+        self.max_spans = int(max_spans or os.getenv("PJE_TRACE_SPANS", "1000"))
+        self.lock = threading.Lock()
+        self.reset()
+
+    @property
+    def open_spans(self):
+        if not hasattr(self.local, "open_spans"):
+            self.local.open_spans = []
+        return self.local.open_spans
+
+    @property
+    def current_process(self):
+        return getattr(self.local, "current_process", None)
+
+    @current_process.setter
+    def current_process(self, process_number):
+        self.local.current_process = process_number
+
+    def set_process(self, process_number):
+        """
+        Associa `process_number` aos spans abertos sem processo (ex.: a etapa que
+        leu o card) e aos próximos spans, até o fim do span atual.
+        """
+        for span in self.open_spans:
+            if span["process"] is None:
+                span["process"] = process_number
+        self.current_process = process_number
+
+    def set_outcome(self, outcome):
+        """
+        Define o resultado do span atual quando a etapa trata o erro sem levantar exceção.
+        """
+        if self.open_spans:
+            self.open_spans[-1]["outcome"] = outcome
+
+    @contextmanager
+    def span(self, step, process_number=None):
+        previous = self.current_process
+        span = {"step": step, "process": process_number or previous, "outcome": "ok", "start": time.time()}
+        started = time.perf_counter()
+        self.open_spans.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span["outcome"] = type(e).__name__
+            raise
+        finally:
+            span["duration"] = time.perf_counter() - started
+            self.open_spans.remove(span)
+            self._record(span)
+            self.current_process = previous
+
+    def _record(self, span):
+        with self.lock:
+            stats = self.step_stats.setdefault(span["step"], {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "sample": []})
+            stats["count"] += 1
+            stats["total"] += span["duration"]
+            stats["max"] = max(stats["max"], span["duration"])
+            if span["outcome"] != "ok":
+                stats["errors"] += 1
+            if len(stats["sample"]) < STEP_SAMPLE_SIZE:
+                stats["sample"].append(span["duration"])
+            else:
+                position = random.randrange(stats["count"])
+                if position < STEP_SAMPLE_SIZE:
+                    stats["sample"][position] = span["duration"]
+            self.spans.append(span)
+
+    def drain(self):
+        """
+        Retorna e descarta as estatísticas e os spans acumulados (usado pelos trabalhadores do pool).
+        """
+        with self.lock:
+            data = {"steps": self.step_stats, "spans": list(self.spans)}
+            self.step_stats, self.spans = {}, deque(maxlen=self.max_spans)
+        return data
+
+    def merge(self, data):
+        """
+        Soma ao rastreador as estatísticas e os spans devolvidos por `drain` em outro processo.
+        """
+        with self.lock:
+            for step, other in data["steps"].items():
+                stats = self.step_stats.setdefault(step, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "sample": []})
+                stats["count"] += other["count"]
+                stats["errors"] += other["errors"]
+                stats["total"] += other["total"]
+                stats["max"] = max(stats["max"], other["max"])
+                sample = stats["sample"] + other["sample"]
+                stats["sample"] = random.sample(sample, STEP_SAMPLE_SIZE) if len(sample) > STEP_SAMPLE_SIZE else sample
+            self.spans.extend(data["spans"])
+
+    def reset(self):
+        self.step_stats = {}
+        self.spans = deque(maxlen=self.max_spans)
+        self.local = threading.local()
+
+    def steps(self):
+        result = {}
+        with self.lock:
+            for step, stats in self.step_stats.items():
+                values = sorted(stats["sample"])
+                result[step] = {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "p50": percentile(values, 0.50),
+                    "p95": percentile(values, 0.95),
+                    "max": stats["max"],
+                    "total": stats["total"],
+                }
+        return result
+
+    def summary(self, pipeline):
+        lines = [f"Latência por etapa do pipeline '{pipeline}':",
+                 f"  {'etapa':<28} {'n':>6} {'erros':>6} {'p50 (s)':>9} {'p95 (s)':>9} {'máx (s)':>9} {'total (s)':>10}"]
+        for step, stats in sorted(self.steps().items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"  {step:<28} {stats['count']:>6} {stats['errors']:>6} {stats['p50']:>9.3f} "
+                f"{stats['p95']:>9.3f} {stats['max']:>9.3f} {stats['total']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def write_metrics(self, pipeline, directory=None):
+        """
+        Grava `<pipeline>.json` (resumo e os últimos spans) e `<pipeline>.prom`
+        (formato texto do Prometheus, para o coletor de arquivos do node_exporter).
+        """
+        directory = directory or os.getenv("PJE_METRICS_DIR", DEFAULT_METRICS_DIR)
+        os.makedirs(directory, exist_ok=True)
+        steps = self.steps()
+
+        json_path = os.path.join(directory, f"{pipeline}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            spans = list(self.spans)
+            json.dump({"pipeline": pipeline, "finished_at": time.time(), "steps": steps,
+                       "spans_omitidos": sum(stats["count"] for stats in steps.values()) - len(spans), "spans": spans},
+                      f, ensure_ascii=False, indent=4)
+
+        lines = [
+            "# HELP pje_step_duration_seconds Duração das etapas instrumentadas.",
+            "# TYPE pje_step_duration_seconds summary",
+        ]
+        for step, stats in steps.items():
+            labels = f'pipeline="{pipeline}",step="{step}"'
+            lines.append(f'pje_step_duration_seconds{{{labels},quantile="0.5"}} {stats["p50"]:.6f}')
+            lines.append(f'pje_step_duration_seconds{{{labels},quantile="0.95"}} {stats["p95"]:.6f}')
+            lines.append(f'pje_step_duration_seconds{{{labels},quantile="1"}} {stats["max"]:.6f}')
+            lines.append(f'pje_step_duration_seconds_sum{{{labels}}} {stats["total"]:.6f}')
+            lines.append(f'pje_step_duration_seconds_count{{{labels}}} {stats["count"]}')
+        lines.append("# HELP pje_step_errors_total Etapas instrumentadas que terminaram em exceção.")
+        lines.append("# TYPE pje_step_errors_total counter")
+        for step, stats in steps.items():
+            lines.append(f'pje_step_errors_total{{pipeline="{pipeline}",step="{step}"}} {stats["errors"]}')
+        prom_path = os.path.join(directory, f"{pipeline}.prom")
+        with open(prom_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return json_path, prom_path
+
+    def finish(self, pipeline, directory=None):
+        """
+        Registra o histograma no log e grava o arquivo de métricas da execução.
+        """
+        logging.info(self.summary(pipeline))
+        json_path, prom_path = self.write_metrics(pipeline, directory)
+        logging.info(f"Métricas de latência gravadas em {json_path} e {prom_path}.")
+
+
+# Rastreador do processo atual (cada trabalhador do pool tem o seu)
+tracer = Tracer()
+
+
+def traced(step=None):
+    """
+    Decorador que registra um span para cada chamada da função (ou método).
+    """
+    def decorator(func):
+        name = step or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,117 @@
+import os
+import time
+import logging
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# Arquivos temporários do Chrome enquanto um download está em andamento
+PARTIAL_DOWNLOAD_SUFFIXES = (".crdownload", ".tmp", ".part")
+
+RICHFACES_IDLE_SCRIPT = """
+var modals = document.querySelectorAll("[id$='modalStatusCDiv'], [id$='modalStatusContainer']");
+for (var i = 0; i < modals.length; i++) {
+    if (modals[i].offsetParent !== null) { return false; }
+}
+if (window.Ajax && Ajax.activeRequestCount > 0) { return false; }
+if (window.jQuery && jQuery.active > 0) { return false; }
+return document.readyState === 'complete';
+"""
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def richfaces_idle(driver):
+    """
+    Verdadeiro quando a página terminou de carregar, o modal de status do RichFaces
+    está oculto e não há requisições AJAX pendentes.
+    """
+    return driver.execute_script(RICHFACES_IDLE_SCRIPT)
+
+
+def new_window_opened(original_handles):
+    def condition(driver):
+        return len(driver.window_handles) > len(original_handles)
+    return condition
+
+
+def list_downloads(directory):
+    return set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
+
+def downloads_in_progress(directory):
+    return [name for name in list_downloads(directory) if name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)]
+
+
+def download_started(directory, files_before):
+    """
+    Verdadeiro quando surge um arquivo novo (parcial ou completo) na pasta de download.
+    """
+    def condition(driver):
+        return bool(list_downloads(directory) - files_before)
+    return condition
+
+
+def downloads_complete(directory):
+    def condition(driver):
+        return not downloads_in_progress(directory)
+    return condition
+
+
+class WaitReport:
+    """
+    Esperas por condições reais que registram, por pipeline, quanto tempo foi
+    economizado em relação aos atrasos fixos (time.sleep) que elas substituem.
+    """
+
+    def __init__(self, pipeline, poll_frequency=0.2):
+        self.pipeline = pipeline
+        self.poll_frequency = poll_frequency
+        self.steps = {}
+
+    def _record(self, label, legacy_delay, elapsed):
+        count, legacy_total, actual_total = self.steps.get(label, (0, 0.0, 0.0))
+        self.steps[label] = (count + 1, legacy_total + legacy_delay, actual_total + elapsed)
+
+    def settle(self, driver, label, condition, legacy_delay, min_delay=0):
+        """
+        Substitui um time.sleep(legacy_delay): espera a condição por no máximo o
+        atraso antigo e segue em frente sem erro caso ela não seja atendida.
+        Retorna se a condição foi atendida.
+        """
+        start = time.monotonic()
+        if min_delay:
+            time.sleep(min_delay)
+        met = True
+        try:
+            WebDriverWait(driver, max(legacy_delay - min_delay, 0), self.poll_frequency).until(condition)
+        except TimeoutException:
+            met = False
+            logging.debug(f"[{self.pipeline}] Condição de '{label}' não atendida em {legacy_delay}s.")
+        self._record(label, legacy_delay, time.monotonic() - start)
+        return met
+
+    def until(self, driver, label, condition, timeout, legacy_delay=0):
+        """
+        Espera a condição até `timeout` segundos, levantando TimeoutException se não for atendida.
+        """
+        start = time.monotonic()
+        try:
+            return WebDriverWait(driver, timeout, self.poll_frequency).until(condition)
+        finally:
+            self._record(label, legacy_delay, time.monotonic() - start)
+
+    def saved_seconds(self):
+        return sum(legacy - actual for _, legacy, actual in self.steps.values())
+
+    def summary(self):
+        lines = [f"Resumo das esperas do pipeline '{self.pipeline}':"]
+        for label, (count, legacy, actual) in self.steps.items():
+            lines.append(
+                f"  {label}: {count}x, atraso fixo {legacy:.1f}s, espera real {actual:.1f}s, "
+                f"economia {legacy - actual:.1f}s"
+            )
+        lines.append(f"  Total economizado: {self.saved_seconds():.1f}s")
+        return "\n".join(lines)